@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from yt_dlp.jsinterp import JSInterpreter
+
+# Resembles the structure of YouTube's n-parameter functions
+SAMPLE_CODE = '''
+function f(a){var b=a.split(""),c=[function(d,e){e=(e%d.length+d.length)%d.length;d.splice(-e).reverse().forEach(function(f){d.unshift(f)})},
+-1034418561,function(d,e){var f=d[0];d[0]=d[e%d.length];d[e%d.length]=f},1812839063,b,function(d){d.reverse()},
+function(d,e){for(e=(e%d.length+d.length)%d.length;e--;)d.unshift(d.pop())},"abcdefghijklmnopqrstuvwxyz"];
+try{c[0](c[4],3),c[2](c[4],c[1]),c[5](c[4],c[3]),c[6](c[4],7),c[2](c[4],12),c[0](c[4],c[3]),c[5](c[4]),
+c[6](c[4],c[1]),c[2](c[4],25),c[0](c[4],5)}catch(d){return "enhanced_except_"+a}return b.join("")}
+'''
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Measure JSInterpreter compile and call times')
+    parser.add_argument(
+        'file', nargs='?', help='JavaScript file to load, e.g. a YouTube player. Defaults to a built-in sample')
+    parser.add_argument('-f', '--function', default='f', help='Name of the function to call (default: %(default)s)')
+    parser.add_argument(
+        '-a', '--argument', default='iO_D6KYgwzhsUq', help='String argument to call it with (default: %(default)s)')
+    parser.add_argument('-n', '--repeat', type=int, default=100, help='Number of repeated calls (default: %(default)s)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    code = SAMPLE_CODE
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            code = f.read()
+
+    start = time.perf_counter()
+    func = JSInterpreter(code).extract_function(args.function)
+    extracted = time.perf_counter()
+    result = func([args.argument])
+    first = time.perf_counter()
+    for _ in range(args.repeat):
+        func([args.argument])
+    repeated = (time.perf_counter() - first) / max(args.repeat, 1)
+
+    print(f'Result: {result!r}')
+    print(f'Extraction:     {(extracted - start) * 1000:9.3f} ms')
+    print(f'First call:     {(first - extracted) * 1000:9.3f} ms')
+    print(f'Repeated calls: {repeated * 1000:9.3f} ms (average of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
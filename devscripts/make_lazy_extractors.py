@@ -17,6 +17,7 @@
     '_WORKING', 'IE_DESC', '_NETRC_MACHINE', 'SEARCH_KEY',  # Used for --extractor-descriptions
     'age_limit',  # Used for --age-limit (evaluated)
     '_RETURN_TYPE',  # Accessed in CLI only with instance (evaluated)
+    '_EMBED_LITERALS',  # Used by GenericIE to skip extractors without embeds in the webpage (evaluated)
 ]
 CLASS_METHODS = [
     'ie_key', 'suitable', '_match_valid_url',  # Used for URL matching
@@ -4,21 +4,27 @@
 import os
 import sys
 import unittest
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+import functools
 import http.server
 import threading
+import time
 
 from test.helper import FakeYDL, expect_dict, expect_value, http_server_port
 from yt_dlp.compat import compat_etree_fromstring
 from yt_dlp.extractor import YoutubeIE, get_info_extractor
 from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.jsinterp import JSInterpreter
 from yt_dlp.utils import (
     ExtractorError,
     RegexNotFoundError,
+    base_url,
     encode_data_uri,
+    js_to_json,
     strip_jsonp,
 )
 
@@ -36,6 +42,33 @@ def do_GET(self):
             self.send_header('Content-Type', 'text/html; charset=utf-8')
             self.end_headers()
             self.wfile.write(TEAPOT_RESPONSE_BODY.encode())
+        elif self.path in ('/valid', '/slow'):
+            if self.path == '/slow':
+                time.sleep(1)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/json':
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', '8')
+            self.end_headers()
+            self.wfile.write(b'{"a": 1}')
+        elif self.path == '/invalid':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path.startswith('/mpd/'):
+            path, _, query = self.path.partition('?')
+            with open(f'./test/testdata{path}', 'rb') as f:
+                content = f.read()
+            if query == 'truncate':
+                content = content[:content.rindex(b'</Period>')]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/dash+xml')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
         else:
             assert False
 
@@ -1393,6 +1426,38 @@ def test_parse_mpd_formats(self):
                 expect_value(self, formats, expected_formats, None)
                 expect_value(self, subtitles, expected_subtitles, None)
 
+    def test_extract_mpd_formats(self):
+        httpd = http.server.HTTPServer(
+            ('127.0.0.1', 0), InfoExtractorTestRequestHandler)
+        port = http_server_port(httpd)
+        server_thread = threading.Thread(target=httpd.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        for mpd_file in ('float_duration', 'periods', 'subtitles', 'unfragmented', 'urls_only'):
+            mpd_url = f'http://127.0.0.1:{port}/mpd/{mpd_file}.mpd'
+            with open(f'./test/testdata/mpd/{mpd_file}.mpd', 'rb') as f:
+                expected = self.ie._parse_mpd_formats_and_subtitles(
+                    compat_etree_fromstring(f.read()), mpd_base_url=base_url(mpd_url), mpd_url=mpd_url)
+            self.assertEqual(self.ie._extract_mpd_formats_and_subtitles(mpd_url, None), expected)
+
+        formats = self.ie._extract_mpd_formats(f'http://127.0.0.1:{port}/mpd/subtitles.mpd', None)
+        fragments = formats[0]['fragments']
+        self.assertEqual(len(fragments), 446)
+        self.assertEqual(fragments[1], {
+            'path': '3144-kZT4LWMQw6Rh7Kpd-audio=128001-0.dash', 'duration': 2.005333333333333})
+        self.assertEqual(fragments[-1], {
+            'path': '3144-kZT4LWMQw6Rh7Kpd-audio=128001-42624000.dash', 'duration': 0.07466666666666667})
+        self.assertEqual(fragments[-3:], list(fragments)[-3:])
+
+        # A manifest that is cut short yields no period, even if some were complete
+        mpd_url = f'http://127.0.0.1:{port}/mpd/periods.mpd?truncate'
+        with self.assertRaisesRegex(ExtractorError, 'Failed to download MPD manifest'):
+            self.ie._extract_mpd_formats_and_subtitles(mpd_url, None)
+        with patch.object(self.ie, 'report_warning') as report_warning:
+            self.assertEqual(self.ie._extract_mpd_formats_and_subtitles(mpd_url, None, fatal=False), ([], {}))
+        report_warning.assert_called_once()
+
     def test_parse_ism_formats(self):
         _TEST_CASES = [
             (
@@ -1918,6 +1983,81 @@ def test_response_with_expected_status_returns_content(self):
             expected_status=TEAPOT_RESPONSE_STATUS)
         self.assertEqual(content, TEAPOT_RESPONSE_BODY)
 
+    def test_check_formats(self):
+        httpd = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), InfoExtractorTestRequestHandler)
+        port = http_server_port(httpd)
+        server_thread = threading.Thread(target=httpd.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        def make_formats(*paths):
+            return [{'format_id': str(i), 'url': f'http://127.0.0.1:{port}{path}'} for i, path in enumerate(paths)]
+
+        formats = make_formats('/valid', '/invalid', '/valid', '/slow')
+        self.ie._check_formats(formats, None)
+        self.assertEqual([f['format_id'] for f in formats], ['0', '2', '3'])
+
+        formats = make_formats('/slow', '/invalid', '/valid')
+        start = time.time()
+        self.ie._check_formats(formats, None, timeout=0.5)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual([f['format_id'] for f in formats], ['2'])
+
+        self.assertEqual(self.ie._are_valid_urls([
+            f'http://127.0.0.1:{port}/invalid', 'rtmp://127.0.0.1/live', f'http://127.0.0.1:{port}/valid',
+        ], None), [False, True, True])
+
+    def test_extraction_profile(self):
+        httpd = http.server.HTTPServer(
+            ('127.0.0.1', 0), InfoExtractorTestRequestHandler)
+        port = http_server_port(httpd)
+        server_thread = threading.Thread(target=httpd.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        class ProfiledIE(DummyIE):
+            _VALID_URL = r'http://127\.0\.0\.1:\d+/?(?P<id>\w*)'
+
+            def _real_extract(self, url):
+                self._download_json(f'{url}/json', 'id', note='Downloading page 1')
+                self._download_xml(f'{url}/mpd/urls_only.mpd', 'id', note=False)
+                self._parse_json("{a: 'b'}", 'id', transform_source=js_to_json)
+                JSInterpreter('function f(a){return a+1}').call_function('f', 1)
+                # The checks are made from a pool of threads
+                self._are_valid_urls([f'{url}/json', f'{url}/mpd/urls_only.mpd'], 'id')
+                return {'id': 'id', 'url': url}
+
+        url = f'http://127.0.0.1:{port}'
+        ydl = FakeYDL()
+        ProfiledIE(ydl).extract(url)
+        self.assertEqual(ydl.extraction_profiler.summary(), {})
+
+        ydl = FakeYDL({'dump_profile': 'profile.json'})
+        ie = ProfiledIE(ydl)
+        ie.extract(url)
+        ie.extract(url)
+        with open('./test/testdata/mpd/urls_only.mpd', 'rb') as f:
+            mpd_size = len(f.read())
+
+        profile = ydl.extraction_profiler.summary()[ie.IE_NAME]
+        self.assertEqual(profile['extractions'], 2)
+        self.assertEqual(profile['errors'], 0)
+        self.assertGreater(profile['wall_time'], 0)
+        self.assertEqual(profile['bytes'], 2 * (8 + mpd_size))
+        self.assertEqual(set(profile['requests']), {'Downloading page #', '(no note)', 'Checking video URL'})
+        self.assertEqual(profile['requests']['Downloading page #']['requests'], 2)
+        self.assertEqual(profile['requests']['Checking video URL']['requests'], 4)
+        self.assertEqual(profile['requests']['Downloading page #']['bytes'], 16)
+        self.assertEqual(profile['requests']['(no note)']['bytes'], 2 * mpd_size)
+        self.assertEqual(set(profile['sections']), {'json_parse', 'xml_parse', 'js_to_json', 'jsinterp'})
+        self.assertEqual(profile['sections']['json_parse']['calls'], 4)
+        self.assertEqual(profile['sections']['xml_parse']['calls'], 2)
+
+        with self.assertRaises(ExtractorError):
+            ie.extract(f'{url}/invalid')
+        self.assertEqual(ydl.extraction_profiler.summary()[ie.IE_NAME]['errors'], 1)
+
     def test_search_nextjs_data(self):
         data = '<script id="__NEXT_DATA__" type="application/json">{"props":{}}</script>'
         self.assertEqual(self.ie._search_nextjs_data(data, None), {'props': {}})
@@ -1927,6 +2067,50 @@ def test_search_nextjs_data(self):
         with self.assertWarns(DeprecationWarning):
             self.assertEqual(self.ie._search_nextjs_data('', None, default='{}'), {})
 
+    def test_search_json(self):
+        _TESTS = [
+            ('var a = {"x": 1, "y": "}"}; var b = {"z": 2};', r'var a\s*=', ';', {}),
+            ('a = {}; b = {"c": 1};', r'a =', '', {}),
+            ('<script id="__NEXT_DATA__" type="application/json">{"props": {"a": [1, 2]}}</script>',
+             r'<script[^>]+id=[\'"]__NEXT_DATA__[\'"][^>]*>', '</script>', {}),
+            ("cfg = {a: 'b}', c: [1, 2,], /* } */ d: \"e\"};", r'cfg =', ';', {'transform_source': js_to_json}),
+            ('cfg = {a: b};', r'cfg =', ';', {'transform_source': functools.partial(js_to_json, vars={'b': '1'})}),
+            ('cfg = {"a": NaN, "b": "\\/"};', r'cfg =', ';', {'transform_source': js_to_json}),
+            ('x = [1, {"a": "]"}] ;', r'x =', ';', {'contains_pattern': r'\[(?s:.+)\]'}),
+            ('a = {"b": 1} c', r'a =', ';', {}),
+            ('a = {"b": 1', r'a =', '', {}),
+            ('a = {"b": 1', r'a =', '', {'close_objects': 1}),
+            ('a = {"b": 1}', r'c =', '', {}),
+            ('a = {"b" 1}; a = {"c": 2};', r'a =', ';', {}),
+        ]
+        for string, start_pattern, end_pattern, kwargs in _TESTS:
+            # Only the first contains_pattern is scanned, the second is an equivalent regex
+            scanned, regex = {
+                r'\[(?s:.+)\]': (r'\[(?s:.+)\]', r'(?s:\[.+\])'),
+            }.get(kwargs.pop('contains_pattern', None), (r'{(?s:.+)}', r'(?s:{.+})'))
+            expected = self.ie._search_json(
+                start_pattern, string, 'test', None, end_pattern=end_pattern,
+                contains_pattern=regex, default=None, **kwargs)
+            self.assertEqual(self.ie._search_json(
+                start_pattern, string, 'test', None, end_pattern=end_pattern,
+                contains_pattern=scanned, default=None, **kwargs), expected, string)
+
+    def test_embed_literals(self):
+        class EmbedIE(InfoExtractor):
+            _EMBED_REGEX = [
+                r'<iframe[^>]+src=["\'](?P<url>https?://(?:www\.)?Example\.com/embed/\w+)',
+                r'(?x)<script[^>]+data-player = (["\'])(?P<url>(?:https?:)?//cdn\.example\.(?:com|org)/p/.+?)\1',
+            ]
+
+        class CustomEmbedIE(EmbedIE):
+            @classmethod
+            def _extract_embed_urls(cls, url, webpage):
+                yield from ()
+
+        self.assertEqual(EmbedIE._EMBED_LITERALS, ('example.com/embed/', '//cdn.example.'))
+        self.assertIsNone(CustomEmbedIE._EMBED_LITERALS)
+        self.assertEqual(DummyIE._EMBED_LITERALS, ())
+
 
 if __name__ == '__main__':
     unittest.main()
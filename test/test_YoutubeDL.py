@@ -11,18 +11,23 @@
 
 import contextlib
 import copy
+import http.server
 import json
+import tempfile
+import threading
 
-from test.helper import FakeYDL, assertRegexpMatches, try_rm
+from test.helper import FakeYDL, assertRegexpMatches, http_server_port, try_rm
 from yt_dlp import YoutubeDL
 from yt_dlp.compat import compat_os_name
 from yt_dlp.extractor import YoutubeIE
 from yt_dlp.extractor.common import InfoExtractor
 from yt_dlp.postprocessor.common import PostProcessor
 from yt_dlp.utils import (
+    DownloadError,
     ExtractorError,
     LazyList,
     OnDemandPagedList,
+    ReExtractInfo,
     int_or_none,
     match_filter_func,
 )
@@ -462,6 +467,49 @@ def test_format_not_available(self):
         ydl = YDL({'format': 'best[height>360]'})
         self.assertRaises(ExtractorError, ydl.process_ie_result, info_dict.copy())
 
+    def test_check_formats_concurrently(self):
+        tested = []
+
+        class CheckingYDL(YDL):
+            def _probe_format(self, f):
+                tested.append(f['format_id'])
+                return 'broken' not in f['url']
+
+            def dl(self, name, info, subtitle=False, test=False):
+                assert test
+                tested.append(info['format_id'])
+                return True, None
+
+        formats = [
+            {'format_id': 'hls', 'ext': 'mp4', 'height': 1080, 'url': 'http://localhost/index.m3u8'},
+            {'format_id': 'broken', 'ext': 'mp4', 'height': 720, 'url': 'http://localhost/broken.mp4'},
+            {'format_id': 'broken-copy', 'ext': 'mp4', 'height': 720, 'url': 'http://localhost/broken.mp4'},
+            {'format_id': 'regular', 'ext': 'mp4', 'height': 360, 'url': TEST_URL},
+            {'format_id': 'worst', 'ext': 'mp4', 'height': 144, 'url': 'http://localhost/worst.mp4'},
+        ]
+        ydl = CheckingYDL({'concurrent_format_checks': 4})
+        self.assertEqual([f['format_id'] for f in ydl._check_formats(formats)], ['hls', 'regular', 'worst'])
+        self.assertEqual(sorted(tested), ['broken', 'hls', 'regular', 'worst'])
+        self.assertEqual([f['__working'] for f in formats], [True, False, False, True, True])
+
+        # Checked formats are not tested again
+        tested.clear()
+        self.assertEqual(len(list(ydl._check_formats(formats))), 3)
+        self.assertEqual(tested, [])
+
+        # Testing stops shortly after the selected format is confirmed
+        tested.clear()
+        info_dict = _make_result([
+            *({k: v for k, v in f.items() if k != '__working'} for f in formats[1:]),
+            {'format_id': 'unseen', 'ext': 'mp4', 'height': 72, 'url': 'http://localhost/unseen.mp4'},
+        ])
+        ydl = CheckingYDL({'check_formats': 'selected', 'concurrent_format_checks': 2, 'format': 'best'})
+        ydl.process_ie_result(info_dict)
+        self.assertEqual(ydl.downloaded_info_dicts[0]['format_id'], 'regular')
+        self.assertIn('regular', tested)
+        self.assertNotIn('unseen', tested)
+        self.assertEqual(len({'broken', 'broken-copy'} & set(tested)), 1)
+
     def test_format_selection_issue_10083(self):
         # See https://github.com/ytdl-org/youtube-dl/issues/10083
         formats = [
@@ -675,6 +723,92 @@ def get_info(params={}):
         self.assertTrue(subs['es']['_auto'])
         self.assertTrue(subs['pt']['_auto'])
 
+    def test_lazy_fields(self):
+        calls = []
+
+        def lazy(field, value):
+            def func():
+                calls.append(field)
+                return value
+            return func
+
+        def get_info(params={}, template=None):
+            calls.clear()
+            ydl = YDL({'simulate': True, **params})
+            info = ydl.process_video_result({
+                'id': 'test',
+                'title': 'Test',
+                'url': TEST_URL,
+                'duration': 30,
+                'extractor': 'TEST',
+                'webpage_url': 'http://example.com/watch?v=shenanigans',
+                '__lazy_fields': {
+                    'chapters': lazy('chapters', [{'start_time': 10, 'title': 'Chapter'}]),
+                    'heatmap': lazy('heatmap', [{'start_time': 0, 'end_time': 30, 'value': 1}]),
+                    'automatic_captions': lazy('automatic_captions', {'en': [{'url': 'http://localhost/en.vtt'}]}),
+                    'missing': lazy('missing', None),
+                },
+            }, download=False)
+            if template:
+                return ydl.evaluate_outtmpl(template, info)
+            return info
+
+        info = get_info()
+        self.assertEqual(calls, [])
+        self.assertNotIn('chapters', info)
+
+        self.assertEqual(get_info(template='%(chapters.1.title)s %(chapters.-1.end_time)s'), 'Chapter 30')
+        self.assertEqual(calls, ['chapters'])
+        self.assertEqual(get_info(template='%(heatmap.0.value)s %(title)s'), '1 Test')
+        self.assertEqual(calls, ['heatmap'])
+
+        info = get_info({'writeautomaticsub': True, 'subtitleslangs': ['en']})
+        self.assertEqual(calls, ['automatic_captions'])
+        self.assertEqual(info['requested_subtitles']['en']['ext'], 'vtt')
+
+        get_info({'match_filter': match_filter_func('heatmap')})
+        self.assertEqual(set(calls), {'chapters', 'heatmap', 'automatic_captions', 'missing'})
+
+        info = YDL.sanitize_info(get_info())
+        self.assertEqual(len(info['chapters']), 2)
+        self.assertEqual(info['automatic_captions']['en'][0]['ext'], 'vtt')
+        self.assertNotIn('missing', info)
+        self.assertNotIn('__lazy_fields', info)
+
+    def test_lazy_fields_api(self):
+        def get_info(**fields):
+            ydl = YDL({'simulate': True})
+            return ydl.process_ie_result({
+                'id': 'test',
+                'title': 'Test',
+                'url': TEST_URL,
+                'duration': 30,
+                'extractor': 'TEST',
+                'webpage_url': 'http://example.com/watch?v=shenanigans',
+                '__lazy_fields': {
+                    'chapters': lambda: [{'start_time': 10, 'title': 'Lazy'}],
+                    'heatmap': lambda: [{'start_time': 0, 'end_time': 30, 'value': 1}],
+                },
+                **fields,
+            }, download=False)
+
+        info = get_info()
+        self.assertEqual(traverse_obj(info, ('chapters', ..., 'title')), ['<Untitled Chapter 1>', 'Lazy'])
+        self.assertEqual(info['heatmap'][0]['value'], 1)
+        self.assertNotIn('__lazy_fields', info)
+
+        info = get_info(chapters=[{'start_time': 0, 'end_time': 30, 'title': 'Existing'}])
+        self.assertEqual(traverse_obj(info, ('chapters', ..., 'title')), ['Existing'])
+
+        info = get_info(_type='playlist', extractor_key='TEST', entries=[{
+            'id': 'entry',
+            'title': 'Entry',
+            'url': TEST_URL,
+            '__lazy_fields': {'heatmap': list},
+        }])
+        self.assertEqual(info['heatmap'][0]['value'], 1)
+        self.assertEqual(info['entries'][0]['heatmap'], [])
+
     def test_add_extra_info(self):
         test_dict = {
             'extractor': 'Foo',
@@ -1202,6 +1336,133 @@ def _real_extract(self, url):
         self.assertEqual(downloaded['extractor'], 'testex')
         self.assertEqual(downloaded['extractor_key'], 'TestEx')
 
+    def test_extraction_cache(self):
+        extracted = []
+
+        class CacheIE(InfoExtractor):
+            _VALID_URL = r'cache:(?P<id>\w+)'
+            _CACHE_FIELD_TTL = {}
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append(video_id)
+                return {
+                    'id': video_id,
+                    'title': f'extraction {len(extracted)}',
+                    'formats': [{'format_id': 'mp4', 'url': TEST_URL}],
+                }
+
+        class FailingYDL(YDL):
+            errors = []
+
+            def process_info(self, info_dict):
+                if self.errors:
+                    raise self.errors.pop(0)
+                super().process_info(info_dict)
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            ydl = FailingYDL({'cachedir': cachedir, 'extraction_cache': 3600})
+            ydl.add_info_extractor(CacheIE(ydl))
+            for video_id in ('a', 'a', 'b'):
+                ydl.extract_info(f'cache:{video_id}')
+            self.assertEqual(extracted, ['a', 'b'])
+            self.assertEqual([i['title'] for i in ydl.downloaded_info_dicts], ['extraction 1'] * 2 + ['extraction 2'])
+            self.assertEqual(ydl.downloaded_info_dicts[1]['extractor_key'], 'Cache')
+
+            # Re-extract cached results that could not be processed
+            extracted.clear()
+            ydl.errors = [ReExtractInfo('Retrying', expected=True)]
+            ydl.extract_info('cache:a')
+            self.assertEqual(extracted, ['a'])
+            ydl.errors = [DownloadError('No space left on device')]
+            self.assertRaises(DownloadError, ydl.extract_info, 'cache:a')
+            self.assertEqual(extracted, ['a'])
+
+            # Fields expire according to the extractor
+            extracted.clear()
+            CacheIE._CACHE_FIELD_TTL = {'formats': 0}
+            ydl.extract_info('cache:c')
+            ydl.extract_info('cache:c')
+            self.assertEqual(extracted, ['c', 'c'])
+
+            extracted.clear()
+            ydl = YDL({'cachedir': cachedir})
+            ydl.add_info_extractor(CacheIE(ydl))
+            ydl.extract_info('cache:b')
+            self.assertEqual(extracted, ['b'])
+
+            # Results extracted with different options are not reused
+            CacheIE._CACHE_FIELD_TTL = {}
+            for params, expected in [
+                ({}, ['d']),
+                ({'extractor_args': {'cache': {'client': ['web']}}}, ['d']),
+                ({'cookiefile': 'cookies.txt', 'geo_bypass_country': 'US'}, ['d']),
+                ({'cookiefile': 'cookies.txt', 'geo_bypass_country': 'US'}, []),
+            ]:
+                extracted.clear()
+                ydl = YDL({'cachedir': cachedir, 'extraction_cache': 3600, **params})
+                ydl.add_info_extractor(CacheIE(ydl))
+                ydl.extract_info('cache:d')
+                self.assertEqual(extracted, expected, params)
+
+    def test_extraction_cache_forbidden_download(self):
+        class MediaHandler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == '/forbidden.mp4':
+                    self.send_response(403)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'video/mp4')
+                self.send_header('Content-Length', '4')
+                self.end_headers()
+                self.wfile.write(b'\x00' * 4)
+
+        httpd = http.server.HTTPServer(('127.0.0.1', 0), MediaHandler)
+        port = http_server_port(httpd)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        extracted = []
+
+        class CacheIE(InfoExtractor):
+            _VALID_URL = r'cache:(?P<id>\w+)'
+            _CACHE_FIELD_TTL = {}
+
+            def _real_extract(self, url):
+                extracted.append(url)
+                return {
+                    'id': self._match_id(url),
+                    'title': 'video',
+                    'ext': 'mp4',
+                    # The URL has expired by the time the first result is downloaded
+                    'url': f'http://127.0.0.1:{port}/{"forbidden" if len(extracted) == 1 else "allowed"}.mp4',
+                }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ydl = YoutubeDL({
+                'cachedir': tmpdir,
+                'extraction_cache': 3600,
+                # The default of the CLI: the 403 is only reported
+                'ignoreerrors': 'only_download',
+                'outtmpl': os.path.join(tmpdir, '%(id)s.%(ext)s'),
+                'quiet': True,
+                'noprogress': True,
+            }, auto_init=False)
+            ydl.add_info_extractor(CacheIE(ydl))
+            ydl.extract_info('cache:a', download=False)
+            info = ydl.extract_info('cache:a')
+            self.assertEqual(len(extracted), 2)
+            self.assertEqual(info['url'], f'http://127.0.0.1:{port}/allowed.mp4')
+            self.assertTrue(os.path.isfile(os.path.join(tmpdir, 'a.mp4')))
+            self.assertEqual(ydl._download_retcode, 0)
+            self.assertEqual(
+                ydl.cache.load('extraction', 'Cache_a')['info']['url'], f'http://127.0.0.1:{port}/allowed.mp4')
+
     # Test case for https://github.com/ytdl-org/youtube-dl/issues/27064
     def test_ignoreerrors_for_playlist_with_url_transparent_iterable_entries(self):
 
@@ -1273,6 +1534,41 @@ def _real_extract(self, url):
         self.assertEqual(downloaded['extractor'], 'Video')
         self.assertEqual(downloaded['extractor_key'], 'Video')
 
+    def test_playlist_complete_callback(self):
+        class _YDL(YDL):
+            trouble = YoutubeDL.trouble
+
+            def process_info(self, info_dict):
+                if info_dict['id'] == 'fail':
+                    self.report_error('unable to download video data')
+                super().process_info(info_dict)
+
+            def to_stderr(self, *args, **kwargs):
+                pass
+
+        def process_playlist(ids):
+            completed = []
+            ydl = _YDL({'ignoreerrors': 'only_download'})
+            ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'playlist',
+                'extractor': 'test',
+                'extractor_key': 'Test',
+                'entries': ({'id': video_id, 'title': video_id, 'url': TEST_URL} for video_id in ids),
+                '__on_playlist_complete': lambda: completed.append(True),
+            })
+            return ydl, completed
+
+        ydl, completed = process_playlist(['1', '2'])
+        self.assertEqual(completed, [True])
+        self.assertEqual(len(ydl.downloaded_info_dicts), 2)
+        self.assertNotIn('__on_playlist_complete', ydl.downloaded_info_dicts[0])
+
+        # A download that failed without raising still counts as an error
+        ydl, completed = process_playlist(['1', 'fail', '2'])
+        self.assertEqual(completed, [])
+        self.assertEqual(len(ydl.downloaded_info_dicts), 3)
+
     def test_header_cookies(self):
         from http.cookiejar import Cookie
 
@@ -206,6 +206,7 @@ def test_switch(self):
         self._test(jsi, 7, args=[1])
         self._test(jsi, 6, args=[3])
         self._test(jsi, 0, args=[5])
+        self._test('function f(x){switch(x){case 1:return "one";default:return "other"}}', 'one', args=[1])
 
     def test_switch_default(self):
         jsi = JSInterpreter('''
@@ -431,6 +432,20 @@ def test_slice(self):
         self._test('function f(){return "012345678".slice(-1, 1)}', '')
         self._test('function f(){return "012345678".slice(-3, -1)}', '67')
 
+    def test_compiled_once(self):
+        jsi = JSInterpreter('function f(a){var b=a.split("");for(var i=0;i<b.length;i++){b[i]=b[i]+"-"}return b.join("")}')
+        func = jsi.extract_function('f')
+        self.assertEqual(func(['abc']), 'a-b-c-')
+        compiled = dict(jsi._compiled_statements)
+        separate, calls = JSInterpreter._separate, []
+        JSInterpreter._separate = staticmethod(lambda *args: calls.append(args) or separate(*args))
+        try:
+            self.assertEqual(func(['xyz']), 'x-y-z-')
+        finally:
+            JSInterpreter._separate = staticmethod(separate)
+        self.assertEqual(calls, [])
+        self.assertEqual(jsi._compiled_statements, compiled)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,6 +15,7 @@
 import http.cookiejar
 import http.server
 import io
+import json
 import logging
 import pathlib
 import random
@@ -36,7 +37,7 @@
     verify_address_availability,
 )
 from yt_dlp.cookies import YoutubeDLCookieJar
-from yt_dlp.dependencies import brotli, curl_cffi, requests, urllib3
+from yt_dlp.dependencies import brotli, curl_cffi, requests, urllib3, zstandard
 from yt_dlp.networking import (
     HEADRequest,
     PUTRequest,
@@ -45,7 +46,11 @@
     RequestHandler,
     Response,
 )
-from yt_dlp.networking._urllib import UrllibRH
+from yt_dlp.networking._urllib import (
+    ContentDecodingReader,
+    HTTPHandler,
+    UrllibRH,
+)
 from yt_dlp.networking.exceptions import (
     CertificateVerifyError,
     HTTPError,
@@ -57,10 +62,13 @@
     TransportError,
     UnsupportedRequest,
 )
+from yt_dlp.networking.cache import HTTPCache, parse_cache_control
 from yt_dlp.networking.impersonate import (
     ImpersonateRequestHandler,
     ImpersonateTarget,
 )
+from yt_dlp.networking.metrics import NetworkMetrics
+from yt_dlp.networking.ratelimit import RateLimiter, TokenBucket
 from yt_dlp.utils import YoutubeDLError
 from yt_dlp.utils._utils import _YDLLogger as FakeLogger
 from yt_dlp.utils.networking import HTTPHeaderDict, std_headers
@@ -228,12 +236,16 @@ def do_GET(self):
                     payload = buf.getvalue()
                 elif encoding == 'deflate':
                     payload = zlib.compress(payload)
+                elif encoding == 'zstd' and zstandard:
+                    payload = zstandard.ZstdCompressor().compress(payload)
                 elif encoding == 'unsupported':
                     payload = b'raw'
                     break
                 else:
                     self._status(415)
                     return
+            if self.headers.get('ytdl-truncate'):
+                payload = payload[:len(payload) // 2]
             self.send_response(200)
             self.send_header('Content-Encoding', encodings)
             self.send_header('Content-Length', str(len(payload)))
@@ -632,6 +644,17 @@ def test_brotli(self, handler):
             assert res.headers.get('Content-Encoding') == 'br'
             assert res.read() == b'<html><video src="/vid.mp4" /></html>'
 
+    @pytest.mark.skip_handler('CurlCFFI', 'not applicable to curl-cffi')
+    @pytest.mark.skipif(not zstandard, reason='zstandard support is not installed')
+    def test_zstd(self, handler):
+        with handler() as rh:
+            res = validate_and_send(
+                rh, Request(
+                    f'http://127.0.0.1:{self.http_port}/content-encoding',
+                    headers={'ytdl-encoding': 'zstd'}))
+            assert res.headers.get('Content-Encoding') == 'zstd'
+            assert res.read() == b'<html><video src="/vid.mp4" /></html>'
+
     def test_deflate(self, handler):
         with handler() as rh:
             res = validate_and_send(
@@ -864,6 +887,75 @@ def test_file_urls(self, handler):
 
         os.unlink(tf.name)
 
+    @pytest.mark.parametrize('encodings', [['gzip'], ['deflate'], ['zlib'], ['gzip', 'deflate']])
+    def test_incremental_decoding(self, handler, encodings):
+        payload = random.randbytes(64 * 1024).hex().encode()
+        data = payload
+        for encoding in encodings:
+            if encoding == 'gzip':
+                data = gzip.compress(data)
+            elif encoding == 'deflate':
+                compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+                data = compressor.compress(data) + compressor.flush()
+            else:
+                data = zlib.compress(data)
+
+        fp = io.BytesIO(data)
+        reader = ContentDecodingReader(fp, [
+            HTTPHandler.CONTENT_DECODERS['gzip' if encoding == 'gzip' else 'deflate']()
+            for encoding in reversed(encodings)])
+        assert reader.read(10) == payload[:10]
+        # Only the data needed for the first chunk should have been consumed
+        assert fp.tell() < len(data)
+        assert reader.read() == payload[10:]
+        assert reader.read() == b''
+
+    def test_incremental_decoding_errors(self, handler):
+        reader = ContentDecodingReader(io.BytesIO(b'not gzip'), [HTTPHandler.CONTENT_DECODERS['gzip']()])
+        with pytest.raises(zlib.error):
+            reader.read()
+
+        # Trailing garbage after a gzip payload and empty bodies are ignored
+        reader = ContentDecodingReader(io.BytesIO(gzip.compress(b'data') + b'junk'), [HTTPHandler.CONTENT_DECODERS['gzip']()])
+        assert reader.read() == b'data'
+        reader = ContentDecodingReader(io.BytesIO(b''), [HTTPHandler.CONTENT_DECODERS['deflate']()])
+        assert reader.read() == b''
+
+        # Truncated bodies should raise instead of returning partial data
+        payload = random.randbytes(64 * 1024).hex().encode()
+        for encoding, data in (('gzip', gzip.compress(payload)), ('deflate', zlib.compress(payload))):
+            reader = ContentDecodingReader(
+                io.BytesIO(data[:len(data) // 2]), [HTTPHandler.CONTENT_DECODERS[encoding]()])
+            with pytest.raises(zlib.error, match='truncated'):
+                reader.read()
+
+    def test_truncated_content_encoding(self, handler):
+        with handler() as rh:
+            with pytest.raises(TransportError):
+                validate_and_send(rh, Request(
+                    f'http://127.0.0.1:{self.http_port}/content-encoding',
+                    headers={'ytdl-encoding': 'gzip', 'ytdl-truncate': '1'})).read()
+
+    def test_timings(self, handler):
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(handler())
+        director.metrics = NetworkMetrics()
+        res = director.send(Request(f'http://localhost:{self.http_port}/headers', extensions={'extractor': 'test'}))
+        timings = res.extensions['timings']
+        assert {'dns', 'connect', 'ttfb'} <= set(timings)
+        assert 'tls' not in timings
+        assert timings['dns'] + timings['connect'] <= timings['ttfb']
+        assert 'total' not in timings
+        data = res.read()
+        assert timings['total'] >= timings['ttfb']
+
+        summary = director.metrics.summary()
+        assert summary['hosts']['localhost']['requests'] == 1
+        assert summary['hosts']['localhost']['bytes'] == len(data)
+        assert summary['handlers'][handler.RH_NAME]['requests'] == 1
+        assert summary['extractors']['test']['requests'] == 1
+        director.close()
+
     def test_http_error_returns_content(self, handler):
         # urllib HTTPError will try close the underlying response if reference to the HTTPError object is lost
         def get_response():
@@ -1556,6 +1648,243 @@ def mock_close(*args, **kwargs):
         assert called
 
 
+    def test_rate_limiter(self):
+        clock = FakeClock()
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(FakeRH(logger=FakeLogger()))
+        director.rate_limiter = RateLimiter(request_rate=2, clock=clock, sleep=clock.sleep)
+
+        queue_times = [
+            director.send(Request(url)).extensions['queue_time']
+            for url in ('http://a/1', 'http://a/2', 'http://a/3', 'http://b/1')]
+        assert queue_times == [0, 0, 0.5, 0]
+        assert director.rate_limiter.stats['a'] == {'requests': 3, 'bytes': 0, 'queue_time': 0.5}
+
+    def test_rate_limiter_retry_after(self):
+        clock = FakeClock()
+
+        class TooManyRequestsRH(FakeRH):
+            def _send(self, request):
+                raise HTTPError(Response(
+                    fp=io.BytesIO(b''), url=request.url, headers={'Retry-After': '30'}, status=429))
+
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(TooManyRequestsRH(logger=FakeLogger()))
+        director.rate_limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+        with pytest.raises(HTTPError):
+            director.send(Request('http://a/'))
+
+        director.handlers.clear()
+        director.add_handler(FakeRH(logger=FakeLogger()))
+        assert director.send(Request('http://b/')).extensions['queue_time'] == 0
+        assert director.send(Request('http://a/')).extensions['queue_time'] == 30
+
+    def test_rate_limiter_bytes(self):
+        clock = FakeClock()
+
+        class DataRH(FakeRH):
+            def _send(self, request):
+                return Response(fp=io.BytesIO(b'x' * 300), url=request.url, headers={})
+
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(DataRH(logger=FakeLogger()))
+        director.rate_limiter = RateLimiter(byte_rate=100, clock=clock, sleep=clock.sleep)
+        res = director.send(Request('http://a/'))
+        assert res.read(100) == b'x' * 100
+        assert clock.time == 0
+        assert res.read() == b'x' * 200
+        assert clock.time == 2
+        assert director.rate_limiter.stats['a']['bytes'] == 300
+
+
+    def test_metrics(self):
+        records = []
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(FakeRH(logger=FakeLogger()))
+        director.metrics = NetworkMetrics(hooks=[records.append])
+
+        res = director.send(Request('http://a/1'))
+        assert set(res.extensions['timings']) == {'ttfb'}
+        assert not records
+        res.close()
+        assert 'total' in res.extensions['timings']
+        assert len(records) == 1
+        assert records[0]['host'] == 'a'
+        assert records[0]['handler'] == 'Fake'
+        assert records[0]['extractor'] is None
+        assert records[0]['status'] == 200
+        assert records[0]['dns'] is None
+
+        res = director.send(Request('http://b/', extensions={'extractor': 'test'}))
+        assert res.read() == b''
+        assert len(records) == 2
+        assert 'extractor' not in res.request.extensions
+
+        with pytest.raises(SSLError):
+            director.send(Request('ssl://something'))
+        assert records[-1]['error'] == 'something'
+
+        summary = director.metrics.summary()
+        assert set(summary['hosts']) == {'a', 'b', 'something'}
+        assert summary['hosts']['something']['errors'] == 1
+        assert summary['handlers']['Fake']['requests'] == 3
+        assert list(summary['extractors']) == ['test']
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.time += seconds
+
+
+class TestRateLimiter:
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(4, burst=2, clock=clock)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.25
+        assert bucket.reserve() == 0.5
+        clock.sleep(10)
+        assert bucket.reserve(2) == 0
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    @pytest.mark.parametrize('value,expected', [
+        ('120', 120),
+        ('1.5', 1.5),
+        ('-5', 0),
+        ('Wed, 21 Oct 2015 07:28:00 GMT', 0),
+        ('', None),
+        (None, None),
+        ('soon', None),
+    ])
+    def test_parse_retry_after(self, value, expected):
+        assert RateLimiter.parse_retry_after(value) == expected
+
+    def test_custom_key(self):
+        clock = FakeClock()
+
+        class GlobalRateLimiter(RateLimiter):
+            def key(self, request):
+                return 'all'
+
+        limiter = GlobalRateLimiter(request_rate=1, clock=clock, sleep=clock.sleep)
+        assert limiter.acquire(Request('http://a/')) == 0
+        assert limiter.acquire(Request('http://b/')) == 1
+        assert list(limiter.stats) == ['all']
+
+
+class CachingTestRH(FakeRH):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+        self.responses = {}
+
+    def _send(self, request):
+        self.requests.append(request)
+        status, headers, body = self.responses[request.url]
+        if callable(headers):
+            status, headers, body = headers(request)
+        response = Response(fp=io.BytesIO(body), url=request.url, headers=headers, status=status)
+        if status >= 300:
+            raise HTTPError(response)
+        return response
+
+
+class TestHTTPCache:
+    @pytest.fixture
+    def director(self, tmp_path):
+        clock = FakeClock()
+        clock.time = 1_000_000
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(CachingTestRH(logger=FakeLogger()))
+        director.http_cache = HTTPCache(str(tmp_path), max_size=500, max_entry_size=200, clock=clock)
+        director.clock = clock
+        return director
+
+    def _send(self, director, url, **kwargs):
+        response = director.send(Request(url, extensions={'cacheable': True}, **kwargs))
+        return response.extensions.get('cache_status'), response.read()
+
+    def test_parse_cache_control(self):
+        assert parse_cache_control('public, max-age=60, no-cache="Set-Cookie"') == {
+            'public': None, 'max-age': '60', 'no-cache': 'Set-Cookie'}
+        assert parse_cache_control(None) == {}
+
+    def test_fresh_hit(self, director):
+        rh = director.handlers[CachingTestRH.RH_KEY]
+        rh.responses['http://a/js'] = (200, {'Cache-Control': 'max-age=60'}, b'code')
+
+        assert self._send(director, 'http://a/js') == ('miss', b'code')
+        assert self._send(director, 'http://a/js') == ('hit', b'code')
+        assert len(rh.requests) == 1
+
+        director.clock.sleep(61)
+        assert self._send(director, 'http://a/js') == ('miss', b'code')
+        assert len(rh.requests) == 2
+
+    def test_not_cacheable(self, director):
+        rh = director.handlers[CachingTestRH.RH_KEY]
+        rh.responses['http://a/js'] = (200, {'Cache-Control': 'max-age=60'}, b'code')
+
+        # Requests need to opt in; the extension is never passed on to the handler
+        assert director.send(Request('http://a/js')).read() == b'code'
+        assert director.send(Request('http://a/js', extensions={'cacheable': False})).read() == b'code'
+        assert all('cacheable' not in request.extensions for request in rh.requests)
+        assert self._send(director, 'http://a/js', data=b'a') == (None, b'code')
+        assert self._send(director, 'http://a/js', headers={'Cache-Control': 'no-store'}) == (None, b'code')
+        assert len(rh.requests) == 4
+
+        rh.responses['http://a/nostore'] = (200, {'Cache-Control': 'no-store, max-age=60'}, b'data')
+        assert self._send(director, 'http://a/nostore') == ('miss', b'data')
+        assert self._send(director, 'http://a/nostore') == ('miss', b'data')
+
+        rh.responses['http://a/novalidator'] = (200, {}, b'data')
+        assert self._send(director, 'http://a/novalidator') == ('miss', b'data')
+        assert self._send(director, 'http://a/novalidator') == ('miss', b'data')
+
+    def test_revalidate(self, director):
+        rh = director.handlers[CachingTestRH.RH_KEY]
+
+        def respond(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return 304, {'ETag': '"v1"'}, b''
+            return 200, {'ETag': '"v1"', 'Cache-Control': 'no-cache', 'Content-Type': 'text/plain'}, b'body'
+
+        rh.responses['http://a/api'] = (None, respond, None)
+        assert self._send(director, 'http://a/api') == ('miss', b'body')
+        status, body = self._send(director, 'http://a/api')
+        assert (status, body) == ('revalidated', b'body')
+        assert rh.requests[-1].headers['If-None-Match'] == '"v1"'
+        assert len(rh.requests) == 2
+
+        rh.responses['http://a/api'] = (200, {'ETag': '"v2"', 'Cache-Control': 'no-cache'}, b'new body')
+        assert self._send(director, 'http://a/api') == ('miss', b'new body')
+
+    def test_lru_eviction(self, director):
+        rh = director.handlers[CachingTestRH.RH_KEY]
+        for name in 'abc':
+            rh.responses[f'http://a/{name}'] = (200, {'Cache-Control': 'max-age=600'}, name.encode() * 50)
+
+        assert self._send(director, 'http://a/a')[0] == 'miss'
+        director.clock.sleep(1)
+        assert self._send(director, 'http://a/b')[0] == 'miss'
+        director.clock.sleep(1)
+        assert self._send(director, 'http://a/a')[0] == 'hit'
+        director.clock.sleep(1)
+        # Each entry takes up about 200 bytes; "b" is the least recently used
+        assert self._send(director, 'http://a/c')[0] == 'miss'
+        assert self._send(director, 'http://a/a')[0] == 'hit'
+        assert self._send(director, 'http://a/c')[0] == 'hit'
+        assert self._send(director, 'http://a/b')[0] == 'miss'
+
+
 # XXX: do we want to move this to test_YoutubeDL.py?
 class TestYoutubeDLNetworking:
 
@@ -1788,6 +2117,41 @@ def test_build_handler_params(self):
             assert rh.verify is False
             assert rh.legacy_ssl_support is True
 
+    def test_rate_limiter_params(self):
+        with FakeRHYDL() as ydl:
+            assert ydl._request_director.rate_limiter is None
+
+        with FakeRHYDL({'request_ratelimit': 2, 'host_ratelimit': 1024}) as ydl:
+            limiter = ydl._request_director.rate_limiter
+            assert limiter.request_rate == 2
+            assert limiter.byte_rate == 1024
+
+        limiter = RateLimiter()
+        with FakeRHYDL({'rate_limiter': limiter}) as ydl:
+            assert ydl._request_director.rate_limiter is limiter
+
+    def test_network_metrics_params(self, tmp_path):
+        records = []
+        filename = tmp_path / 'metrics.json'
+        with FakeRHYDL({'network_metrics_hooks': [records.append], 'dump_network_metrics': str(filename)}) as ydl:
+            assert ydl._request_director.metrics is ydl.network_metrics
+            ydl.urlopen('http://example.com/').close()
+            assert len(records) == 1
+        with open(filename) as f:
+            assert json.load(f)['hosts']['example.com']['requests'] == 1
+
+    def test_http_cache_params(self, tmp_path):
+        with FakeRHYDL({'cachedir': str(tmp_path)}) as ydl:
+            assert ydl._request_director.http_cache is None
+
+        with FakeRHYDL({'cachedir': False, 'http_cache': True}) as ydl:
+            assert ydl._request_director.http_cache is None
+
+        with FakeRHYDL({'cachedir': str(tmp_path), 'http_cache': True, 'http_cache_size': 1024}) as ydl:
+            cache = ydl._request_director.http_cache
+            assert cache.path == str(tmp_path / 'http')
+            assert cache.max_size == 1024
+
     @pytest.mark.parametrize('ydl_params', [
         {'client_certificate': 'fakecert.crt'},
         {'client_certificate': 'fakecert.crt', 'client_certificate_key': 'fakekey.key'},
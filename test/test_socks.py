@@ -10,6 +10,7 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import abc
+import asyncio
 import contextlib
 import enum
 import functools
@@ -34,8 +35,13 @@
     SOCKS5_USER_AUTH_SUCCESS,
     SOCKS5_USER_AUTH_VERSION,
     SOCKS5_VERSION,
+    Proxy,
+    ProxyType,
+    Socks4Error,
     Socks5AddressType,
     Socks5Auth,
+    Socks5Error,
+    open_socks_connection,
 )
 
 SOCKS5_USER_AUTH_FAILURE = 0x1
@@ -83,6 +89,9 @@ def handle(self):
         sleep = self.socks_kwargs.get('sleep')
         if sleep:
             time.sleep(sleep)
+        barrier = self.socks_kwargs.get('barrier')
+        if barrier:
+            barrier.wait()
         version, nmethods = self.connection.recv(2)
         assert version == SOCKS5_VERSION
         methods = list(self.connection.recv(nmethods))
@@ -156,6 +165,9 @@ def handle(self):
         sleep = self.socks_kwargs.get('sleep')
         if sleep:
             time.sleep(sleep)
+        barrier = self.socks_kwargs.get('barrier')
+        if barrier:
+            barrier.wait()
         socks_info = {
             'version': SOCKS4_VERSION,
             'command': None,
@@ -210,6 +222,10 @@ def do_GET(self):
             self.wfile.write(payload.encode())
 
 
+class SocksKeepAliveHTTPTestRequestHandler(SocksHTTPTestRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+
 class SocksWebSocketTestRequestHandler(SocksTestRequestHandler):
     def handle(self):
         import websockets.sync.server
@@ -468,5 +484,119 @@ def test_timeout(self, handler, ctx):
                     ctx.socks_info_request(rh)
 
 
+@pytest.mark.parametrize('handler', ['Requests'], indirect=True)
+class TestSocksKeepAlive:
+    @pytest.mark.parametrize('proxy_scheme,socks_server_class', [
+        ('socks4', Socks4ProxyHandler),
+        ('socks5', Socks5ProxyHandler),
+    ])
+    def test_tunnel_reuse(self, handler, proxy_scheme, socks_server_class):
+        with socks_server(socks_server_class, SocksKeepAliveHTTPTestRequestHandler) as server_address:
+            with handler(proxies={'all': f'{proxy_scheme}://{server_address}'}) as rh:
+                # the client address seen by the proxy identifies the tunnel
+                client_addresses = set()
+                for _ in range(3):
+                    client_addresses.add(tuple(HTTPSocksTestProxyContext().socks_info_request(rh)['client_address']))
+                assert len(client_addresses) == 1
+
+
+def _make_proxy(proxy_type, server_address, username=None, password=None, remote_dns=True):
+    host, _, port = server_address.rpartition(':')
+    return Proxy(proxy_type, host.strip('[]'), int(port), username, password, remote_dns)
+
+
+async def _async_socks_info(proxy, target_domain='127.0.0.1', target_port=40000):
+    reader, writer = await open_socks_connection(proxy, (target_domain, target_port))
+    try:
+        writer.write(b'GET /socks_info HTTP/1.0\r\n\r\n')
+        await writer.drain()
+        _, _, body = (await reader.read()).partition(b'\r\n\r\n')
+        return json.loads(body.decode())
+    finally:
+        writer.close()
+
+
+class TestAsyncSocks:
+    def test_socks4(self):
+        with socks_server(Socks4ProxyHandler, SocksHTTPTestRequestHandler, user_id='user') as server_address:
+            response = asyncio.run(_async_socks_info(_make_proxy(ProxyType.SOCKS4, server_address, 'user')))
+            assert response['version'] == 4
+            assert response['ipv4_address'] == '127.0.0.1'
+
+    def test_socks4a_domain_target(self):
+        with socks_server(Socks4ProxyHandler, SocksHTTPTestRequestHandler) as server_address:
+            response = asyncio.run(_async_socks_info(
+                _make_proxy(ProxyType.SOCKS4A, server_address), target_domain='localhost'))
+            assert response['ipv4_address'] is None
+            assert response['domain_address'] == 'localhost'
+
+    def test_socks4_local_dns(self):
+        with socks_server(Socks4ProxyHandler, SocksHTTPTestRequestHandler) as server_address:
+            response = asyncio.run(_async_socks_info(
+                _make_proxy(ProxyType.SOCKS4, server_address), target_domain='localhost'))
+            assert response['ipv4_address'] == '127.0.0.1'
+            assert response['domain_address'] is None
+
+    def test_socks4_errors(self):
+        with socks_server(
+                Socks4ProxyHandler, SocksHTTPTestRequestHandler,
+                cd_reply=Socks4CD.REQUEST_REJECTED_OR_FAILED) as server_address:
+            with pytest.raises(Socks4Error):
+                asyncio.run(_async_socks_info(_make_proxy(ProxyType.SOCKS4, server_address)))
+
+    def test_socks5_user_pass(self):
+        with socks_server(Socks5ProxyHandler, SocksHTTPTestRequestHandler, auth=('test', 'testpass')) as server_address:
+            with pytest.raises(Socks5Error):
+                asyncio.run(_async_socks_info(_make_proxy(ProxyType.SOCKS5, server_address)))
+            response = asyncio.run(_async_socks_info(
+                _make_proxy(ProxyType.SOCKS5, server_address, 'test', 'testpass')))
+            assert response['auth_methods'] == [Socks5Auth.AUTH_NONE, Socks5Auth.AUTH_USER_PASS]
+            assert response['version'] == 5
+
+    def test_socks5h_domain_target(self):
+        with socks_server(Socks5ProxyHandler, SocksHTTPTestRequestHandler) as server_address:
+            response = asyncio.run(_async_socks_info(
+                _make_proxy(ProxyType.SOCKS5, server_address), target_domain='localhost'))
+            assert response['domain_address'] == 'localhost'
+
+    def test_socks5_ipv6_destination(self):
+        with socks_server(Socks5ProxyHandler, SocksHTTPTestRequestHandler) as server_address:
+            response = asyncio.run(_async_socks_info(
+                _make_proxy(ProxyType.SOCKS5, server_address), target_domain='::1'))
+            assert response['ipv6_address'] == '::1'
+
+    @pytest.mark.parametrize('reply_code', [
+        Socks5Reply.GENERAL_FAILURE,
+        Socks5Reply.CONNECTION_REFUSED,
+    ])
+    def test_socks5_errors(self, reply_code):
+        with socks_server(Socks5ProxyHandler, SocksHTTPTestRequestHandler, reply=reply_code) as server_address:
+            with pytest.raises(Socks5Error) as exc_info:
+                asyncio.run(_async_socks_info(_make_proxy(ProxyType.SOCKS5, server_address)))
+            assert exc_info.value.errno == reply_code
+
+
+class TestSocksConcurrency:
+    # Stay within the listen backlog of the test server (5)
+    CONNECTIONS = 5
+
+    async def _async_handshakes(self, proxy):
+        async def handshake():
+            _, writer = await open_socks_connection(proxy, ('127.0.0.1', 40000))
+            writer.close()
+        await asyncio.gather(*(handshake() for _ in range(self.CONNECTIONS)))
+
+    @pytest.mark.parametrize('proxy_type,socks_server_class', [
+        (ProxyType.SOCKS4, Socks4ProxyHandler),
+        (ProxyType.SOCKS5, Socks5ProxyHandler),
+    ])
+    def test_concurrent_handshakes(self, proxy_type, socks_server_class):
+        # The server only answers once all handshakes are in progress at the same time
+        barrier = threading.Barrier(self.CONNECTIONS, timeout=5)
+        with socks_server(socks_server_class, SocksHTTPTestRequestHandler, barrier=barrier) as server_address:
+            asyncio.run(self._async_handshakes(_make_proxy(proxy_type, server_address)))
+        assert not barrier.broken
+
+
 if __name__ == '__main__':
     unittest.main()
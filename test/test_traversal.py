@@ -1,4 +1,5 @@
 import http.cookies
+import concurrent.futures
 import re
 import xml.etree.ElementTree
 
@@ -11,7 +12,10 @@
     int_or_none,
     str_or_none,
 )
+from yt_dlp.utils import traversal
 from yt_dlp.utils.traversal import (
+    CompiledPath,
+    compile_path,
     require,
     subs_list_to_dict,
     traverse_obj,
@@ -438,6 +442,50 @@ def test_traversal_filter(self):
             '`filter` should filter falsy values'
 
 
+class TestCompiledTraversal(TestTraversal):
+    @pytest.fixture(autouse=True)
+    def compile_paths(self, monkeypatch):
+        traverse = traverse_obj
+        monkeypatch.setitem(globals(), 'traverse_obj', lambda obj, *paths, **kwargs: traverse(
+            obj, *[compile_path(path) for path in paths], **kwargs))
+
+    def test_compile_path(self):
+        path = ('urls', ..., 'url')
+        compiled = compile_path(path)
+        assert isinstance(compiled, CompiledPath)
+        assert compile_path(path) is compiled, 'literal paths should be cached'
+        assert compile_path(compiled) is compiled, 'compiled paths should be returned as is'
+        assert compile_path(('urls', 0, {str})) is not compile_path(('urls', 0, {str})), \
+            'paths that are not literal should not be cached'
+        compiled_paths = set(traversal._COMPILED_PATHS)
+        for index in range(traversal._RECENT_PATHS_MAX_SIZE * 2):
+            compile_path(('urls', index, f'{index}'))
+        assert set(traversal._COMPILED_PATHS) == compiled_paths, \
+            'paths built at runtime should not be cached'
+        assert compile_path(path) is compiled, 'paths built at runtime should not evict cached paths'
+
+        assert compiled(_TEST_DATA) == ['https://www.example.com/0', 'https://www.example.com/1']
+        assert compiled(_TEST_DATA, get_all=False) == 'https://www.example.com/0', \
+            'calling a compiled path should accept `traverse_obj` arguments'
+        assert traverse_obj(_TEST_DATA, ('urls', (compile_path((0, 'url')), (1, 'index')))) == [
+            'https://www.example.com/0', 1], 'compiled paths should be usable as branches'
+        assert traverse_obj(_TEST_DATA, {'url': compile_path(('urls', 1, 'url'))}) == {
+            'url': 'https://www.example.com/1'}, 'compiled paths should be usable in dicts'
+
+    def test_compile_path_threads(self):
+        constants = [('urls', index, 'url') for index in range(traversal._COMPILED_PATHS_MAX_SIZE * 2)]
+
+        def compile_paths(thread):
+            for index, path in enumerate(constants):
+                assert compile_path(path).path is path
+                compile_path(('urls', thread, f'{index}'))
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            for result in [executor.submit(compile_paths, thread) for thread in range(8)]:
+                result.result()
+        assert len(traversal._COMPILED_PATHS) <= traversal._COMPILED_PATHS_MAX_SIZE
+
+
 class TestTraversalHelpers:
     def test_traversal_require(self):
         with pytest.raises(ExtractorError):
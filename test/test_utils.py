@@ -11,6 +11,7 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+import concurrent.futures
 import contextlib
 import io
 import itertools
@@ -27,6 +28,8 @@
     Config,
     DateRange,
     ExtractorError,
+    FragmentList,
+    HTMLIndex,
     InAdvancePagedList,
     LazyList,
     NO_DEFAULT,
@@ -92,6 +95,7 @@
     parse_duration,
     parse_filesize,
     parse_iso8601,
+    parse_js_object,
     parse_qs,
     parse_resolution,
     pkcs1pad,
@@ -1265,6 +1269,23 @@ def test_js_to_json_common_constructors(self):
         self.assertEqual(json.loads(js_to_json('new Date("123")')), '123')
         self.assertEqual(json.loads(js_to_json('new Date(\'2023-10-19\')')), '2023-10-19')
 
+    def test_js_to_json_numbers(self):
+        self.assertEqual(js_to_json('[0.05, 10.0701, 1e05, -0.5e-07]'), '[0.05, 10.0701, 1e05, -0.5e-07]')
+        self.assertEqual(js_to_json('{1.5: 077, 0: 0x10}'), '{"1.5": 63, "0": 16}')
+
+    def test_js_to_json_streaming(self):
+        inp = '''{
+            a: [1, 2.5, 'x\\'y', "z\\"w", /* c, ] */ undefined,],
+            'b': {c: !0, 0x1f: `t ${d}`},
+            e: new Map([["k", Array(1, 2)]]), f: "g, h", // i
+        }''' * 10
+        expected = js_to_json(inp, {'d': '"D"'})
+        for size in (1, 7, 64, 1000):
+            chunks = [inp[i:i + size] for i in range(0, len(inp), size)]
+            self.assertEqual(js_to_json(iter(chunks), {'d': '"D"'}), expected)
+        self.assertEqual(js_to_json(io.StringIO(inp), {'d': '"D"'}), expected)
+        self.assertEqual(parse_js_object(io.StringIO('{a: [1, "b",]}')), {'a': [1, 'b']})
+
     def test_extract_attributes(self):
         self.assertEqual(extract_attributes('<e x="y">'), {'x': 'y'})
         self.assertEqual(extract_attributes("<e x='y'>"), {'x': 'y'})
@@ -1871,6 +1892,59 @@ def test_get_element_text_and_html_by_tag(self):
             (self.GET_ELEMENT_BY_TAG_RES_INNERSPAN_TEXT, self.GET_ELEMENT_BY_TAG_RES_INNERSPAN_HTML))
         self.assertRaises(compat_HTMLParseError, get_element_text_and_html_by_tag, 'article', html)
 
+    def test_html_index(self):
+        html = '''
+            <div class="a b" data-x='span class="a"'>one <span class="a">two</span></div>
+            <p id=unquoted class="a">three</p><p class="a">four</p>
+            <section data-id="x" class = "b a">five</section><video src="x">
+            <a class="a">six</a>
+        '''
+        queries = [
+            (get_elements_text_and_html_by_attribute, 'class', 'a'),
+            (get_elements_text_and_html_by_attribute, 'id', 'unquoted'),
+            (get_elements_text_and_html_by_attribute, 'data-x', 'span class="a"'),
+            (get_elements_by_class, 'a'),
+            (get_elements_html_by_class, 'b'),
+            (get_element_by_class, 'a'),
+            (get_element_by_attribute, 'data-id', 'x'),
+            (get_element_text_and_html_by_tag, 'span'),
+            (get_element_text_and_html_by_tag, 'video'),
+            (get_element_text_and_html_by_tag, 'article'),
+        ]
+
+        def run_all():
+            results = []
+            for func, *args in queries:
+                try:
+                    results.append(list(func(*args, html)) if func is get_elements_text_and_html_by_attribute
+                                   else func(*args, html))
+                except compat_HTMLParseError as e:
+                    results.append(str(e))
+            return results
+
+        expected = run_all()
+        index = HTMLIndex.of(html)
+        self.assertIs(HTMLIndex.of(html), index)
+        self.assertIs(HTMLIndex.lookup(html), index)
+        self.assertEqual(run_all(), expected)
+        self.assertEqual(run_all(), expected)
+        self.assertEqual(get_elements_by_class('a', html), ['one <span class="a">two</span>', 'two', 'three', 'four', 'five', 'six'])
+        self.assertIsNone(HTMLIndex.lookup(html.strip()))
+
+    def test_html_index_threads(self):
+        documents = [f'<div class="a" id="{i}">{i}</div>' for i in range(16)]
+
+        def index_all(documents):
+            for html in documents:
+                index = HTMLIndex.of(html)
+                self.assertIs(index.html, html)
+                self.assertEqual(get_element_by_class('a', html), html[html.index('>') + 1:-6])
+            return len(HTMLIndex._INDEXES)
+
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            sizes = list(pool.map(index_all, [documents[i::4] * 50 for i in range(4)]))
+        self.assertLessEqual(max(sizes), HTMLIndex._MAX_DOCUMENTS)
+
     def test_iri_to_uri(self):
         self.assertEqual(
             iri_to_uri('https://www.google.com/search?q=foo&ie=utf-8&oe=utf-8&client=firefox-b'),
@@ -1948,6 +2022,43 @@ def test(ll, idx, val, cache):
         ll = reversed(ll)
         test(ll, -15, 14, range(15))
 
+    def test_FragmentList(self):
+        built = []
+
+        def build(index):
+            built.append(index)
+            return {'path': f'{index}.ts'}
+
+        fl = FragmentList([{'path': 'init.mp4'}], (5, build))
+        self.assertEqual(built, [])
+        self.assertEqual(len(fl), 6)
+        self.assertEqual(fl[0], {'path': 'init.mp4'})
+        self.assertEqual(fl[2], {'path': '1.ts'})
+        self.assertEqual(fl[-1], {'path': '4.ts'})
+        self.assertEqual(built, [1, 4])
+        self.assertRaises(IndexError, lambda: fl[6])
+        self.assertRaises(TypeError, lambda: fl['a'])
+
+        expected = [{'path': 'init.mp4'}, *({'path': f'{i}.ts'} for i in range(5))]
+        self.assertEqual(list(fl), expected)
+        self.assertEqual(fl[1:4], expected[1:4])
+        self.assertEqual(fl[::-2], expected[::-2])
+        self.assertEqual(fl, expected)
+        self.assertEqual(built, [1, 4, 0, 2, 3])
+        self.assertTrue(fl)
+        self.assertFalse(FragmentList([], (0, build)))
+        self.assertRaises(TypeError, hash, fl)
+
+        fl.extend(FragmentList([{'path': 'last.ts'}]))
+        self.assertEqual(len(fl), 7)
+        self.assertEqual(fl[-1], {'path': 'last.ts'})
+        self.assertEqual(repr(fl), repr([*expected, {'path': 'last.ts'}]))
+
+        # Fragments are built once, so that they can be modified in place
+        fl[1]['duration'] = 2.0
+        self.assertEqual(fl[1], {'path': '0.ts', 'duration': 2.0})
+        self.assertEqual(list(fl)[1], {'path': '0.ts', 'duration': 2.0})
+
     def test_format_bytes(self):
         self.assertEqual(format_bytes(0), '0.00B')
         self.assertEqual(format_bytes(1000), '1000.00B')
@@ -7,8 +7,15 @@
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import json
+import shutil
+import tempfile
+import threading
+import time
 
-from yt_dlp.extractor import YoutubeIE
+from test.helper import FakeYDL
+from yt_dlp.extractor import YoutubeBatchIE, YoutubeIE, YoutubeTabIE
+from yt_dlp.utils import ExtractorError
 
 
 class TestYoutubeMisc(unittest.TestCase):
@@ -22,5 +29,332 @@ def test_youtube_extract(self):
         assertExtractId('BaW_jenozKc', 'BaW_jenozKc')
 
 
+class YoutubeTestCase(unittest.TestCase):
+    """Provides extractors with a temporary cache directory, whose request methods can be replaced"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+    def make_ie(self, ie_class=YoutubeIE, *, cachedir=None, extractor_args=None, **methods):
+        ie = ie_class(FakeYDL({
+            'cachedir': self.cache_dir if cachedir is None else cachedir,
+            'extractor_args': extractor_args or {},
+        }))
+        for name, method in methods.items():
+            setattr(ie, name, method)
+        return ie
+
+
+class TestYoutubePlayerResponses(YoutubeTestCase):
+    CLIENTS = ['ios', 'android_vr', 'mediaconnect']
+
+    def _make_ie(self, delays, errors=(), before_response=None):
+        self.started = []
+        self.responded = {client: threading.Event() for client in self.CLIENTS}
+
+        def extract_player_response(client, video_id, **kwargs):
+            self.started.append(client)
+            if before_response:
+                before_response(client)
+            time.sleep(delays.get(client, 0))
+            if client in errors:
+                raise ExtractorError(f'{client} failed')
+            self.responded[client].set()
+            return {'videoDetails': {'videoId': video_id}, 'streamingData': {'formats': [{'itag': client}]}}
+
+        return self.make_ie(
+            _download_player_url=lambda *args, **kwargs: None, _extract_player_response=extract_player_response)
+
+    def test_priority_order(self):
+        # All the clients are requested at once and respond in the reverse order of their priority
+        barrier = threading.Barrier(len(self.CLIENTS), timeout=5)
+
+        def before_response(client):
+            barrier.wait()
+            next_clients = self.CLIENTS[self.CLIENTS.index(client) + 1:]
+            if next_clients:
+                self.assertTrue(self.responded[next_clients[0]].wait(5))
+
+        ie = self._make_ie({}, before_response=before_response)
+        prs, _ = ie._extract_player_responses(self.CLIENTS, 'id', None, {}, {})
+        self.assertFalse(barrier.broken)
+        self.assertEqual([pr['streamingData']['formats'][0]['itag'] for pr in prs], self.CLIENTS)
+
+    def test_failed_client(self):
+        ie = self._make_ie({}, errors=('android_vr',))
+        prs, _ = ie._extract_player_responses(['ios', 'android_vr', 'mediaconnect'], 'id', None, {}, {})
+        self.assertEqual([pr['streamingData']['formats'][0]['itag'] for pr in prs], ['ios', 'mediaconnect'])
+
+    def test_cancel_on_interrupt(self):
+        ie = self._make_ie({'ios': 0.2, 'android_vr': 0.2})
+        ie._PLAYER_RESPONSE_WORKERS = 1
+        ie._invalid_player_response = lambda pr, video_id: _raise(KeyboardInterrupt)
+        self.assertRaises(
+            KeyboardInterrupt, ie._extract_player_responses, ['ios', 'android_vr', 'mediaconnect'], 'id', None, {}, {})
+        self.assertNotIn('mediaconnect', self.started)
+
+
+class TestYoutubeComments(YoutubeTestCase):
+    def _make_ie(self, max_comments=(), barrier=None):
+        def replies(parent, count):
+            if barrier:
+                barrier.wait()
+            for i in range(count):
+                yield {'id': f'{parent}.{i}', 'parent': parent}
+
+        def comment_entries(root_continuation_data, ytcfg, video_id, fetch_replies):
+            for parent in 'abc':
+                yield {'id': parent, 'parent': 'root'}
+                yield fetch_replies(replies(parent, 2))
+
+        return self.make_ie(
+            extractor_args={'youtube': {'max_comments': list(max_comments)}}, _comment_entries=comment_entries)
+
+    def test_concurrent_reply_threads(self):
+        # Each reply thread only proceeds once all three are being fetched
+        barrier = threading.Barrier(3, timeout=5)
+        comments = list(self._make_ie(barrier=barrier)._comment_entries_concurrently(None, {}, 'id', workers=3))
+        self.assertFalse(barrier.broken)
+        self.assertEqual(
+            [comment['id'] for comment in comments], ['a', 'a.0', 'a.1', 'b', 'b.0', 'b.1', 'c', 'c.0', 'c.1'])
+
+    def test_max_replies(self):
+        comments = list(self._make_ie(['all', 'all', '3'])._comment_entries_concurrently(None, {}, 'id', workers=3))
+        self.assertEqual([comment['id'] for comment in comments], ['a', 'a.0', 'a.1', 'b', 'b.0', 'c'])
+
+
+class TestYoutubeTabPrefetch(YoutubeTestCase):
+    PAGES = 4
+
+    @staticmethod
+    def _page_contents(num, last=False):
+        contents = [{'playlistVideoRenderer': {'videoId': f'{num}{i}'.zfill(11)}} for i in range(2)]
+        if not last:
+            contents.append({'continuationItemRenderer': {
+                'continuationEndpoint': {'continuationCommand': {'token': f'page{num + 1}'}}}})
+        return contents
+
+    def _entries(self, prefetch_pages, sync_key=None):
+        self.requested, self.pending_watermarks = [], {}
+
+        def extract_response(item_id, query, **kwargs):
+            self.requested.append(query['continuation'])
+            time.sleep(0.05)
+            num = int(query['continuation'][4:])
+            return {'onResponseReceivedActions': [{'appendContinuationItemsAction': {
+                'continuationItems': self._page_contents(num, last=num == self.PAGES - 1)}}]}
+
+        ie = self.ie = self.make_ie(YoutubeTabIE, extractor_args={'youtubetab': {
+            'prefetch_pages': [str(prefetch_pages)],
+            'incremental': [''] if sync_key else [],
+        }}, _extract_response=extract_response)
+        tab = {'content': {'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [
+            {'playlistVideoListRenderer': {'contents': self._page_contents(0)}}]}}]}}}
+        return ie._entries(tab, 'id', {}, None, None, sync_key=sync_key, pending_watermarks=self.pending_watermarks)
+
+    def test_entries(self):
+        for prefetch_pages in (0, 1, 3):
+            self.assertEqual(
+                [entry['id'] for entry in self._entries(prefetch_pages)],
+                [f'{num}{i}'.zfill(11) for num in range(self.PAGES) for i in range(2)])
+            self.assertEqual(self.requested, [f'page{num}' for num in range(1, self.PAGES)])
+
+    def test_prefetch_is_bounded(self):
+        for prefetch_pages in (0, 1, 2):
+            entries = self._entries(prefetch_pages)
+            next(entries)
+            time.sleep(0.3)
+            entries.close()
+            self.assertEqual(len(self.requested), prefetch_pages)
+
+    def test_incremental(self):
+        all_ids = [f'{num}{i}'.zfill(11) for num in range(self.PAGES) for i in range(2)]
+
+        # A walk that is abandoned early does not move the watermark
+        entries = self._entries(0, 'sync')
+        next(entries)
+        entries.close()
+        self.assertEqual(self.pending_watermarks, {})
+        self.assertEqual([entry['id'] for entry in self._entries(0, 'sync')], all_ids)
+        # Neither does a complete walk whose entries were not all processed
+        self.assertEqual([entry['id'] for entry in self._entries(0, 'sync')], all_ids)
+
+        # Pretend the first page is new since the last sync
+        ie = self.make_ie(YoutubeTabIE)
+        for prefetch_pages in (0, 2):
+            ie.cache.store('youtubetab-watermark', 'sync', all_ids[2:])
+            self.assertEqual([entry['id'] for entry in self._entries(prefetch_pages, 'sync')], all_ids[:2])
+            self.assertEqual(self.requested[:1], ['page1'])
+            self.assertLessEqual(len(self.requested), 1 + prefetch_pages)
+            self.assertEqual(ie.cache.load('youtubetab-watermark', 'sync'), all_ids[2:])
+            self.ie._store_watermarks(self.pending_watermarks)
+            self.assertEqual(self.pending_watermarks, {})
+        self.assertEqual(ie.cache.load('youtubetab-watermark', 'sync'), all_ids)
+
+        # Nothing new
+        self.assertEqual(list(self._entries(0, 'sync')), [])
+        self.assertEqual(self.requested, [])
+
+    def test_incremental_without_ids(self):
+        def sync(*pages):
+            ie = self.make_ie(
+                YoutubeTabIE, extractor_args={'youtubetab': {'incremental': [''], 'prefetch_pages': ['0']}},
+                _entry_pages=lambda *args: (page for page in pages))
+            pending_watermarks = {}
+            entries = list(ie._entries({}, 'id', {}, None, None, sync_key='sync', pending_watermarks=pending_watermarks))
+            ie._store_watermarks(pending_watermarks)
+            return [entry.get('id') for entry in entries]
+
+        self.assertEqual(sync([{'id': 'b'}, {'url': 'x'}], [{'id': 'a'}]), ['b', None, 'a'])
+        self.assertEqual(self.make_ie(YoutubeTabIE).cache.load('youtubetab-watermark', 'sync'), ['b', 'a'])
+        # An entry without an ID does not match the watermark
+        self.assertEqual(sync([{'url': 'y'}, {'id': 'c'}, {'url': 'x'}, {'id': 'b'}]), [None, 'c', None])
+
+
+class TestYoutubeYtcfgCache(YoutubeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.downloads = []
+
+    def _make_ie(self, **extractor_args):
+        def download_webpage(url, video_id, *args, **kwargs):
+            self.downloads.append(url)
+            return f'ytcfg.set({{"INNERTUBE_CLIENT_VERSION": "1.0", "VISITOR_DATA": "{len(self.downloads)}"}});'
+
+        return self.make_ie(extractor_args={'youtube': extractor_args}, _download_webpage=download_webpage)
+
+    def test_session_cache(self):
+        ie = self._make_ie()
+        ytcfg = ie._download_ytcfg('web_music', 'a')
+        self.assertEqual(ytcfg['VISITOR_DATA'], '1')
+        ytcfg['VISITOR_DATA'] = 'modified'
+        self.assertEqual(ie._download_ytcfg('web_music', 'b')['VISITOR_DATA'], '1')
+        self.assertEqual(len(self.downloads), 1)
+        self.assertEqual(ie._download_ytcfg('web', 'b')['VISITOR_DATA'], '2')
+
+        # Persisting is opt-in
+        ie = self._make_ie()
+        ie._download_ytcfg('web_music', 'c')
+        self.assertEqual(len(self.downloads), 3)
+
+    def test_ttl(self):
+        ie = self._make_ie(ytcfg_ttl=['0'])
+        ie._download_ytcfg('web_music', 'a')
+        ie._download_ytcfg('web_music', 'a')
+        self.assertEqual(len(self.downloads), 2)
+
+        ie = self._make_ie(ytcfg_ttl=['60'])
+        ie._ytcfg_cache[('web_music', False)] = {'timestamp': time.time() - 120, 'ytcfg': {'VISITOR_DATA': 'old'}}
+        self.assertEqual(ie._download_ytcfg('web_music', 'a')['VISITOR_DATA'], '3')
+
+    def test_persisted(self):
+        self._make_ie(persist_ytcfg=[''])._download_ytcfg('web_music', 'a')
+        self.assertEqual(self._make_ie(persist_ytcfg=[''])._download_ytcfg('web_music', 'b')['VISITOR_DATA'], '1')
+        self.assertEqual(len(self.downloads), 1)
+
+
+class TestYoutubeBatch(YoutubeTestCase):
+    def test_batches(self):
+        requested = []
+
+        def download_webpage(url, video_id, *args, query, **kwargs):
+            video_ids = query['video_ids'].split(',')
+            requested.append(video_ids)
+            playlist = {'contents': [{'playlistPanelVideoRenderer': {
+                'videoId': video_id,
+                'title': {'simpleText': f'Title {video_id}'},
+                'lengthText': {'simpleText': '1:00'},
+            }} for video_id in reversed(video_ids) if video_id != 'unavailable']}
+            data = {'contents': {'twoColumnWatchNextResults': {'playlist': {'playlist': playlist}}}}
+            return f'var ytInitialData = {json.dumps(data)};</script>'
+
+        ie = self.make_ie(YoutubeBatchIE, _download_webpage=download_webpage)
+        ie._BATCH_SIZE = 2
+        video_ids = ['aaaaaaaaaaa', 'unavailable', 'bbbbbbbbbbb', 'ccccccccccc', 'ddddddddddd']
+        entries = ie.extract(f'ytbatch:{",".join(video_ids)},')['entries']
+        self.assertEqual(requested, [])
+        self.assertEqual([entry['id'] for entry in entries.getslice(2, 4)], video_ids[2:4])
+        self.assertEqual(requested, [video_ids[2:4]])
+
+        entries = list(entries)
+        self.assertEqual([entry['id'] for entry in entries], video_ids)
+        self.assertEqual(len(requested), 3)
+        self.assertEqual(entries[0]['title'], 'Title aaaaaaaaaaa')
+        self.assertEqual(entries[0]['duration'], 60)
+        self.assertEqual(entries[1]['url'], 'https://www.youtube.com/watch?v=unavailable')
+        self.assertNotIn('title', entries[1])
+
+        with self.assertRaisesRegex(ExtractorError, 'Invalid video IDs: short'):
+            ie.extract('ytbatch:aaaaaaaaaaa,short')
+
+    def test_suitable(self):
+        self.assertTrue(YoutubeBatchIE.suitable('ytbatch:aaaaaaaaaaa,bbbbbbbbbbb'))
+        self.assertFalse(YoutubeBatchIE.suitable('ytbatch:aaaaaaaaaaa bbbbbbbbbbb'))
+        self.assertFalse(YoutubeBatchIE.suitable('ytbatch:aaaaaaaaaaa;bbbbbbbbbbb'))
+
+
+def _raise(exc):
+    raise exc
+
+
+class TestYoutubePlayerStore(YoutubeTestCase):
+    PLAYER_URL = 'https://www.youtube.com/s/player/00000000/player_ias.vflset/en_US/base.js'
+    PLAYER_CODE = 'var a = "player";'
+
+    def setUp(self):
+        super().setUp()
+        self.downloads = 0
+
+    def _make_ie(self, delay=0, cachedir=None):
+        def download_webpage(*args, **kwargs):
+            time.sleep(delay)
+            self.downloads += 1
+            return self.PLAYER_CODE
+
+        return self.make_ie(cachedir=cachedir, _download_webpage=download_webpage)
+
+    def test_player_store(self):
+        self.assertEqual(self._make_ie()._load_player('id', self.PLAYER_URL), self.PLAYER_CODE)
+        self.assertEqual(self._make_ie()._load_player('id', self.PLAYER_URL), self.PLAYER_CODE)
+        self.assertEqual(self.downloads, 1)
+
+        store = os.path.join(self.cache_dir, 'youtube-players')
+        blob, = (fn for fn in os.listdir(store) if fn.endswith('.js'))
+        with open(os.path.join(store, blob), 'w') as f:
+            f.write('corrupted')
+        self.assertEqual(self._make_ie()._load_player('id', self.PLAYER_URL), self.PLAYER_CODE)
+        self.assertEqual(self.downloads, 2)
+
+    def test_player_store_eviction(self):
+        for index in range(3):
+            self.PLAYER_CODE = f'var a = {index};'
+            ie = self._make_ie()
+            ie._PLAYER_STORE_SIZE = 2
+            ie._load_player('id', self.PLAYER_URL.replace('00000000', f'0000000{index}'))
+
+        store = os.path.join(self.cache_dir, 'youtube-players')
+        self.assertEqual(len([fn for fn in os.listdir(store) if fn.endswith('.js')]), 2)
+        self.assertEqual(sorted(fn for fn in os.listdir(store) if not fn.endswith('.js')), [
+            '00000001.json', '00000001.lock', '00000002.json', '00000002.lock'])
+
+    def test_player_store_single_flight(self):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self._make_ie(0.2)._load_player('id', self.PLAYER_URL)))
+            for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [self.PLAYER_CODE] * 3)
+        self.assertEqual(self.downloads, 1)
+
+    def test_player_store_disabled(self):
+        self._make_ie(cachedir=False)._load_player('id', self.PLAYER_URL)
+        self._make_ie(cachedir=False)._load_player('id', self.PLAYER_URL)
+        self.assertEqual(self.downloads, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,13 +9,17 @@
 
 
 import contextlib
+import json
 import re
+import shutil
 import string
+import tempfile
 import urllib.request
 
 from test.helper import FakeYDL, is_download_test
 from yt_dlp.extractor import YoutubeIE
 from yt_dlp.jsinterp import JSInterpreter
+from yt_dlp.utils import ExtractorError
 
 _SIG_TESTS = [
     (
@@ -224,6 +228,55 @@ def tearDown(self):
                 os.remove(f)
 
 
+class TestNsigCache(unittest.TestCase):
+    PLAYER_URL = 'https://www.youtube.com/s/player/00000000/player_ias.vflset/en_US/base.js'
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _make_ie(self, func_code=None):
+        ie = YoutubeIE(FakeYDL({'cachedir': self.cache_dir}))
+
+        def extract_n_function_code(video_id, player_url):
+            if not func_code:
+                raise ExtractorError('Player should not be loaded')
+            return JSInterpreter(''), '00000000', func_code
+
+        ie._extract_n_function_code = extract_n_function_code
+        return ie
+
+    def test_nsig_results_cache(self):
+        ie = self._make_ie((['a'], 'return a.split("").reverse().join("")'))
+        self.assertEqual(ie._decrypt_nsig('abcdef', None, self.PLAYER_URL), 'fedcba')
+        self.assertEqual(ie.cache.load('youtube-nsig-results', '00000000'), {'abcdef': 'fedcba'})
+
+        ie = self._make_ie()
+        self.assertEqual(ie._decrypt_nsig('abcdef', None, self.PLAYER_URL), 'fedcba')
+        self.assertRaises(ExtractorError, ie._decrypt_nsig, 'ghijkl', None, self.PLAYER_URL)
+
+    def test_nsig_results_cache_size(self):
+        ie = self._make_ie((['a'], 'return a.split("").reverse().join("")'))
+        ie._NSIG_RESULTS_CACHE_SIZE = 2
+        for n in ('abc', 'def', 'ghi'):
+            ie._decrypt_nsig(n, None, self.PLAYER_URL)
+        self.assertEqual(ie.cache.load('youtube-nsig-results', '00000000'), {'def': 'fed', 'ghi': 'ihg'})
+
+        # A cache hit makes its result the most recently used one
+        for n in ('def', 'jkl'):
+            ie._decrypt_nsig(n, None, self.PLAYER_URL)
+        self.assertEqual(ie.cache.load('youtube-nsig-results', '00000000'), {'def': 'fed', 'jkl': 'lkj'})
+
+    def test_nsig_results_cache_version(self):
+        ie = self._make_ie()
+        ie.cache.store('youtube-nsig-results', '00000000', {'abcdef': 'fedcba'})
+        with open(ie.cache._get_cache_fn('youtube-nsig-results', '00000000', 'json'), 'w') as f:
+            json.dump({'yt-dlp_version': '2000.01.01', 'data': {'abcdef': 'fedcba'}}, f)
+        self.assertRaises(ExtractorError, ie._decrypt_nsig, 'abcdef', None, self.PLAYER_URL)
+
+
 def t_factory(name, sig_func, url_pattern):
     def make_tfunc(url, sig_input, expected_sig):
         m = url_pattern.match(url)
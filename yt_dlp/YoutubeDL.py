@@ -1,10 +1,12 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
 import errno
 import fileinput
 import functools
+import hashlib
 import http.cookiejar
 import io
 import itertools
@@ -43,7 +45,10 @@
     SSLError,
     network_exceptions,
 )
+from .networking.cache import HTTPCache
 from .networking.impersonate import ImpersonateRequestHandler
+from .networking.metrics import NetworkMetrics
+from .networking.ratelimit import RateLimiter
 from .plugins import directories as plugin_directories
 from .postprocessor import _PLUGIN_CLASSES as plugin_pps
 from .postprocessor import (
@@ -87,6 +92,7 @@
     ExistingVideoReached,
     ExtractorError,
     FormatSorter,
+    FragmentList,
     GeoRestrictedError,
     ISO3166Utils,
     LazyList,
@@ -165,6 +171,7 @@
     clean_proxies,
     std_headers,
 )
+from .utils.profiling import ExtractionProfiler
 from .version import CHANNEL, ORIGIN, RELEASE_GIT_HEAD, VARIANT, __version__
 
 if compat_os_name == 'nt':
@@ -259,6 +266,9 @@ class YoutubeDL:
                        Can be True (check all), False (check none),
                        'selected' (check selected formats),
                        or None (check only if requested by extractor)
+    concurrent_format_checks: Number of formats that are tested concurrently.
+                       If more than 1, direct HTTP formats are tested with a
+                       single ranged request instead of a test download
     paths:             Dictionary of output paths. The allowed keys are 'home'
                        'temp' and the keys of OUTTMPL_TYPES (in utils/_utils.py)
     outtmpl:           Dictionary of templates for output names. Allowed keys
@@ -313,6 +323,13 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    http_cache:        Cache responses to requests that extractors mark as cacheable
+                       in the cache directory, honouring HTTP caching headers
+    http_cache_size:   Maximum size of the HTTP cache in bytes (default: 100MiB)
+    extraction_cache:  Reuse the results of extracting a video for this many seconds,
+                       storing them in the cache directory. Fields in the extractor's
+                       _CACHE_FIELD_TTL expire sooner. Results are only reused with
+                       the same extraction options (extractor_args, cookies, etc). None/0 to disable
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -399,6 +416,15 @@ class YoutubeDL:
 
                        Progress hooks are guaranteed to be called at least once
                        (with status "finished") if the download is successful.
+    network_metrics_hooks: A list of functions that get called with the metrics of
+                       each finished HTTP request. See networking.metrics.NetworkMetrics
+                       for the keys of the dictionary passed to them
+    dump_network_metrics: Write a JSON summary of request timings and byte counts
+                       per host, request handler and extractor to this file on close
+    dump_profile:      Write a JSON summary of the time spent by each extractor,
+                       its requests per note, bytes downloaded, and the time spent
+                       parsing JSON/XML and in js_to_json/jsinterp to this file on close.
+                       See utils.profiling.ExtractionProfiler
     postprocessor_hooks:  A list of functions that get called on postprocessing
                        progress, with a dictionary with the entries
                        * status: One of "started", "processing", or "finished".
@@ -433,6 +459,11 @@ class YoutubeDL:
                        Actual sleep time will be a random float from range
                        [sleep_interval; max_sleep_interval].
     sleep_interval_subtitles: Number of seconds to sleep before each subtitle download
+    request_ratelimit: Maximum number of HTTP requests per second sent to each host
+    host_ratelimit:    Maximum number of response bytes per second read from each host.
+                       Shared by all requests, including extraction and concurrent downloads
+    rate_limiter:      A networking.ratelimit.RateLimiter instance to use instead of
+                       the one built from request_ratelimit and host_ratelimit
     listformats:       Print an overview of available video formats and exit.
     list_thumbnails:   Print a table of all thumbnails and exit.
     match_filter:      A function that gets called for every video with the signature
@@ -613,6 +644,15 @@ class YoutubeDL:
         'video': {*MEDIA_EXTENSIONS.common_video, '3gp'},
         'storyboards': set(MEDIA_EXTENSIONS.storyboards),
     }
+    # Options that can change the result of an extraction
+    _extraction_cache_params = (
+        'extractor_args', 'compat_opts', 'http_headers', 'proxy', 'source_address', 'impersonate',
+        'cookiefile', 'cookiesfrombrowser', 'username', 'password', 'usenetrc', 'netrc_location', 'netrc_cmd',
+        'videopassword', 'ap_mso', 'ap_username', 'ap_password', 'client_certificate',
+        'geo_bypass', 'geo_bypass_country', 'geo_bypass_ip_block', 'geo_verification_proxy',
+        'age_limit', 'noplaylist', 'allow_unplayable_formats', 'live_from_start',
+        'youtube_include_dash_manifest', 'youtube_include_hls_manifest',
+    )
 
     def __init__(self, params=None, auto_init=True):
         """Create a FileDownloader object with the given options.
@@ -630,11 +670,15 @@ def __init__(self, params=None, auto_init=True):
         self._post_hooks = []
         self._progress_hooks = []
         self._postprocessor_hooks = []
+        self.network_metrics = NetworkMetrics()
+        self.extraction_profiler = ExtractionProfiler()
         self._download_retcode = 0
+        self._num_errors = 0
         self._num_downloads = 0
         self._num_videos = 0
         self._playlist_level = 0
         self._playlist_urls = set()
+        self._internal_call_level = 0
         self.cache = Cache(self)
         self.__header_cookies = []
 
@@ -796,10 +840,13 @@ def check_deprecated(param, option, suggestion):
             'post_hooks': self.add_post_hook,
             'progress_hooks': self.add_progress_hook,
             'postprocessor_hooks': self.add_postprocessor_hook,
+            'network_metrics_hooks': self.add_network_metrics_hook,
         }
         for opt, fn in hooks.items():
             for ph in self.params.get(opt, []):
                 fn(ph)
+        if self.params.get('dump_profile'):
+            self.add_network_metrics_hook(self.extraction_profiler.record_request)
 
         for pp_def_raw in self.params.get('postprocessors', []):
             pp_def = dict(pp_def_raw)
@@ -895,6 +942,10 @@ def add_progress_hook(self, ph):
         """Add the download progress hook"""
         self._progress_hooks.append(ph)
 
+    def add_network_metrics_hook(self, hook):
+        """Add a hook that is called with the metrics of each finished request"""
+        self.network_metrics.hooks.append(hook)
+
     def add_postprocessor_hook(self, ph):
         """Add the postprocessing progress hook"""
         self._postprocessor_hooks.append(ph)
@@ -992,10 +1043,34 @@ def __exit__(self, *args):
 
     def close(self):
         self.save_cookies()
+        self.dump_network_metrics()
+        self.dump_extraction_profile()
         if '_request_director' in self.__dict__:
             self._request_director.close()
             del self._request_director
 
+    def dump_network_metrics(self):
+        filename = self.params.get('dump_network_metrics')
+        if not filename:
+            return
+        try:
+            write_json_file(self.network_metrics.summary(), filename)
+        except OSError as err:
+            self.report_warning(f'Unable to write network metrics to {filename!r}: {err}')
+        else:
+            self.write_debug(f'Network metrics written to {filename!r}')
+
+    def dump_extraction_profile(self):
+        filename = self.params.get('dump_profile')
+        if not filename:
+            return
+        try:
+            write_json_file(self.extraction_profiler.summary(), filename)
+        except OSError as err:
+            self.report_warning(f'Unable to write extraction profile to {filename!r}: {err}')
+        else:
+            self.write_debug(f'Extraction profile written to {filename!r}')
+
     def trouble(self, message=None, tb=None, is_error=True):
         """Determine action to take when a download problem appears.
 
@@ -1022,6 +1097,7 @@ def trouble(self, message=None, tb=None, is_error=True):
                 self.to_stderr(tb)
         if not is_error:
             return
+        self._num_errors += 1
         if not self.params.get('ignoreerrors'):
             if sys.exc_info()[0] and hasattr(sys.exc_info()[1], 'exc_info') and sys.exc_info()[1].exc_info[0]:
                 exc_info = sys.exc_info()[1].exc_info
@@ -1198,6 +1274,9 @@ def prepare_outtmpl(self, outtmpl, info_dict, sanitize=False):
         """
 
         info_dict.setdefault('epoch', int(time.time()))  # keep epoch consistent once set
+        # The whole info_dict is used by an empty field name, e.g. "%()j"
+        self._resolve_lazy_fields(info_dict, None if re.search(r'%\(\W', outtmpl) else [
+            field for field in info_dict.get('__lazy_fields') or () if re.search(rf'\b{field}\b', outtmpl)])
 
         info_dict = self._copy_infodict(info_dict)
         info_dict['duration_string'] = (  # %(duration>%H-%M-%S)s is wrong if duration > 24hrs
@@ -1320,7 +1399,7 @@ def filename_sanitizer(key, value, restricted=self.params.get('restrictfilenames
         sanitize = bool(sanitize)
 
         def _dumpjson_default(obj):
-            if isinstance(obj, (set, LazyList)):
+            if isinstance(obj, (set, LazyList, FragmentList)):
                 return list(obj)
             return repr(obj)
 
@@ -1515,6 +1594,7 @@ def check_filter():
             match_filter = self.params.get('match_filter')
             if match_filter is None:
                 return None
+            self._resolve_lazy_fields(info_dict)
 
             cancelled = None
             try:
@@ -1567,6 +1647,21 @@ def add_extra_info(info_dict, extra_info):
         for key, value in extra_info.items():
             info_dict.setdefault(key, value)
 
+    def _resolve_lazy_results(func):
+        """Resolve the lazy fields of the returned result, unless it is only used internally"""
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self._internal_call_level += 1
+            try:
+                ie_result = func(self, *args, **kwargs)
+            finally:
+                self._internal_call_level -= 1
+            if not self._internal_call_level:
+                self._resolve_all_lazy_fields(ie_result)
+            return ie_result
+        return wrapper
+
+    @_resolve_lazy_results
     def extract_info(self, url, download=True, ie_key=None, extra_info=None,
                      process=True, force_generic_extractor=False):
         """
@@ -1756,31 +1851,84 @@ def _apply_header_cookies(self, url, cookies=None):
     def __extract_info(self, url, ie, download, extra_info, process):
         self._apply_header_cookies(url)
 
-        try:
-            ie_result = ie.extract(url)
-        except UserNotLive as e:
-            if process:
-                if self.params.get('wait_for_video'):
-                    self.report_warning(e)
-                self._wait_for_video()
-            raise
-        if ie_result is None:  # Finished already (backwards compatibility; listformats and friends should be moved here)
-            self.report_warning(f'Extractor {ie.IE_NAME} returned nothing{bug_reports_message()}')
-            return
-        if isinstance(ie_result, list):
-            # Backwards compatibility: old IE result format
-            ie_result = {
-                '_type': 'compat_list',
-                'entries': ie_result,
-            }
+        cache_key, ie_result = self._load_extraction_cache(ie, url)
+        from_cache = ie_result is not None
+        if not from_cache:
+            try:
+                ie_result = ie.extract(url)
+            except UserNotLive as e:
+                if process:
+                    if self.params.get('wait_for_video'):
+                        self.report_warning(e)
+                    self._wait_for_video()
+                raise
+            if ie_result is None:  # Finished already (backwards compatibility; listformats and friends should be moved here)
+                self.report_warning(f'Extractor {ie.IE_NAME} returned nothing{bug_reports_message()}')
+                return
+            if isinstance(ie_result, list):
+                # Backwards compatibility: old IE result format
+                ie_result = {
+                    '_type': 'compat_list',
+                    'entries': ie_result,
+                }
+            if cache_key:
+                self._store_extraction_cache(cache_key, ie, ie_result)
+        else:
+            ie_result['__from_extraction_cache'] = cache_key
         if extra_info.get('original_url'):
             ie_result.setdefault('original_url', extra_info['original_url'])
         self.add_default_extra_info(ie_result, ie, url)
-        if process:
+        if not process:
+            return ie_result
+        try:
             self._wait_for_video(ie_result)
             return self.process_ie_result(ie_result, download, extra_info)
-        else:
-            return ie_result
+        except ReExtractInfo:
+            if from_cache:
+                self.cache.store('extraction', cache_key, None)
+            raise
+
+    def _load_extraction_cache(self, ie, url):
+        """
+        Look up a video in the extraction cache
+        @returns    (cache key, cached result); the key is None if the video cannot be cached
+        """
+        ttl = self.params.get('extraction_cache')
+        video_id = ttl and self.cache.enabled and ie.get_temp_id(url)
+        if not video_id:
+            return None, None
+        cache_key = f'{ie.ie_key()}_{video_id}'
+        entry = self.cache.load('extraction', cache_key)
+        age = time.time() - traverse_obj(entry, ('timestamp', {float_or_none}), default=float('inf'))
+        max_age = min(ttl, traverse_obj(entry, ('max_age', {float_or_none}), default=float('inf')))
+        if (not (0 <= age < max_age) or entry.get('extractor_key') != ie.ie_key()
+                or entry.get('params') != self._extraction_cache_digest()):
+            return cache_key, None
+        ie.to_screen(f'{video_id}: Using the extraction result cached {round(age)} seconds ago')
+        return cache_key, entry['info']
+
+    def _extraction_cache_digest(self):
+        """Digest of the options that the cached results depend on; credentials are not stored in plain text"""
+        params = {key: self.params.get(key) for key in self._extraction_cache_params}
+        return hashlib.sha256(json.dumps(
+            params, sort_keys=True, default=lambda x: sorted(x) if isinstance(x, (set, frozenset)) else repr(x),
+        ).encode()).hexdigest()
+
+    def _store_extraction_cache(self, cache_key, ie, ie_result):
+        if (ie_result.get('_type', 'video') != 'video' or ie_result.get('__post_extractor')
+                or ie_result.get('live_status') in ('is_live', 'is_upcoming', 'post_live') or ie_result.get('is_live')):
+            return
+        # Compute the lazy fields only once, since they are needed for the cache anyway
+        self._resolve_lazy_fields(ie_result)
+        info = self.sanitize_info(ie_result, remove_private_keys=True)
+        self.cache.store('extraction', cache_key, {
+            'extractor_key': ie.ie_key(),
+            'params': self._extraction_cache_digest(),
+            'timestamp': time.time(),
+            # Fields such as media URLs expire earlier than the rest of the result
+            'max_age': min((ttl for field, ttl in ie._CACHE_FIELD_TTL.items() if info.get(field)), default=None),
+            'info': info,
+        })
 
     def add_default_extra_info(self, ie_result, ie, url):
         if url is not None:
@@ -1800,6 +1948,7 @@ def add_default_extra_info(self, ie_result, ie, url):
                 'extractor_key': ie.ie_key(),
             })
 
+    @_resolve_lazy_results
     def process_ie_result(self, ie_result, download=True, extra_info=None):
         """
         Take the result of the ie(may be modified) and resolve all unresolved
@@ -2026,7 +2175,7 @@ def __process_playlist(self, ie_result, download):
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
-        failures = 0
+        failures, num_errors = 0, self._num_errors
         max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
         for i, (playlist_index, entry) in enumerate(entries):
             if lazy:
@@ -2067,6 +2216,11 @@ def __process_playlist(self, ie_result, download):
             if keep_resolved_entries:
                 resolved_entries[i] = (playlist_index, entry_result)
 
+        on_complete = ie_result.pop('__on_playlist_complete', None)
+        # A failed download is not counted in failures when ignoring errors, but it is reported
+        if on_complete and not failures and self._num_errors == num_errors:
+            on_complete()
+
         # Update with processed data
         ie_result['entries'] = [e for _, e in resolved_entries if e is not NO_DEFAULT]
         ie_result['requested_entries'] = [i for i, e in resolved_entries if e is not NO_DEFAULT]
@@ -2157,16 +2311,79 @@ def _filter(f):
         return _filter
 
     def _check_formats(self, formats):
+        workers = self.params.get('concurrent_format_checks') or 1
+        if workers > 1:
+            yield from self._check_formats_concurrently(formats, workers)
+            return
         for f in formats:
             working = f.get('__working')
-            if working is not None:
+            if working is None:
+                working = self._test_format(f)
+            if working:
+                yield f
+
+    def _check_formats_concurrently(self, formats, workers):
+        """
+        Test formats with a pool of workers, keeping up to `workers` formats ahead of the consumer.
+        The working formats are yielded in the original order, so that the selector can stop
+        as soon as its first choice is confirmed. Formats with the same direct URL are probed only once
+        """
+        pool = concurrent.futures.ThreadPoolExecutor(workers)
+        probes, pending = {}, collections.deque()
+
+        def submit(f):
+            if f.get('__working') is not None:
+                return None
+            key = f['url'] if self._can_probe_format(f) else id(f)
+            if key not in probes:
+                probes[key] = pool.submit(self._test_format, f, probe=True)
+            return probes[key]
+
+        formats = iter(formats)
+        try:
+            while True:
+                pending.extend((f, submit(f)) for f in itertools.islice(formats, workers - len(pending)))
+                if not pending:
+                    return
+                f, future = pending.popleft()
+                working = future.result() if future else f['__working']
+                if working is not None:
+                    f['__working'] = working
                 if working:
                     yield f
-                continue
-            self.to_screen('[info] Testing format {}'.format(f['format_id']))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _can_probe_format(f):
+        return (determine_protocol(f) in ('http', 'https')
+                and not f.get('request_data') and not f.get('requested_formats'))
+
+    def _probe_format(self, f):
+        """Check with a single ranged request that a direct HTTP format is downloadable"""
+        headers = HTTPHeaderDict(
+            f['http_headers'] if f.get('http_headers') is not None else self._calc_headers(f),
+            {'Accept-Encoding': 'identity', 'Range': 'bytes=0-0'})
+        with self.urlopen(Request(f['url'], headers=headers)) as response:
+            return bool(response.read(1))
+
+    def _test_format(self, f, probe=False):
+        """
+        Test whether a format is downloadable and store the result in f['__working']
+        @param probe    Probe formats with a single ranged request instead of
+                        test-downloading them, if their protocol allows it
+        @returns        Whether the format is working, or None if it could not be tested
+        """
+        self.to_screen('[info] Testing format {}'.format(f['format_id']))
+        if probe and self._can_probe_format(f):
+            try:
+                success = self._probe_format(f)
+            except network_exceptions:
+                success = False
+        else:
             path = self.get_output_path('temp')
             if not self._ensure_dir_exists(f'{path}/'):
-                continue
+                return None
             temp_file = tempfile.NamedTemporaryFile(suffix='.tmp', delete=False, dir=path or None)
             temp_file.close()
             try:
@@ -2179,11 +2396,10 @@ def _check_formats(self, formats):
                         os.remove(temp_file.name)
                     except OSError:
                         self.report_warning(f'Unable to delete temporary file "{temp_file.name}"')
-            f['__working'] = success
-            if success:
-                yield f
-            else:
-                self.to_screen('[info] Unable to download format {}. Skipping...'.format(f['format_id']))
+        f['__working'] = success
+        if not success:
+            self.to_screen('[info] Unable to download format {}. Skipping...'.format(f['format_id']))
+        return success
 
     def _select_formats(self, formats, selector):
         return list(selector({
@@ -2611,6 +2827,69 @@ def _sort_thumbnails(self, thumbnails):
             t.get('id') if t.get('id') is not None else '',
             t.get('url')))
 
+    @staticmethod
+    def _sanitize_chapters(info_dict):
+        chapters = info_dict.get('chapters') or []
+        if chapters and chapters[0].get('start_time'):
+            chapters.insert(0, {'start_time': 0})
+
+        dummy_chapter = {'end_time': 0, 'start_time': info_dict.get('duration')}
+        for idx, (prev, current, next_) in enumerate(zip(
+                (dummy_chapter, *chapters), chapters, (*chapters[1:], dummy_chapter)), 1):
+            if current.get('start_time') is None:
+                current['start_time'] = prev.get('end_time')
+            if not current.get('end_time'):
+                current['end_time'] = next_.get('start_time')
+            if not current.get('title'):
+                current['title'] = f'<Untitled Chapter {idx}>'
+
+    @staticmethod
+    def _sanitize_captions(info_dict, cc_kind):
+        for subtitle in (info_dict.get(cc_kind) or {}).values():
+            for subtitle_format in subtitle:
+                if subtitle_format.get('url'):
+                    subtitle_format['url'] = sanitize_url(subtitle_format['url'])
+                if subtitle_format.get('ext') is None:
+                    subtitle_format['ext'] = determine_ext(subtitle_format['url']).lower()
+
+    @staticmethod
+    def _resolve_lazy_fields(info_dict, fields=None):
+        """Compute the given fields (default: all) of info_dict['__lazy_fields'] and add them to the info_dict"""
+        lazy_fields = info_dict.get('__lazy_fields')
+        if not lazy_fields:
+            return
+        remaining = {}
+        for field, func in lazy_fields.items():
+            if field in info_dict:
+                continue
+            if fields is not None and field not in fields:
+                remaining[field] = func
+                continue
+            value = func()
+            if value is None:
+                continue
+            info_dict[field] = value
+            if field == 'chapters':
+                YoutubeDL._sanitize_chapters(info_dict)
+            elif field in ('subtitles', 'automatic_captions'):
+                YoutubeDL._sanitize_captions(info_dict, field)
+        # Copies of the info_dict share the old mapping, so it must not be modified in place
+        info_dict['__lazy_fields'] = remaining
+        if not remaining:
+            info_dict.pop('__lazy_fields')
+
+    @staticmethod
+    def _resolve_all_lazy_fields(ie_result):
+        """Resolve the lazy fields of ie_result and of its already processed entries"""
+        if not isinstance(ie_result, dict):
+            return
+        YoutubeDL._resolve_lazy_fields(ie_result)
+        for key in ('entries', 'additional_entries', 'requested_downloads'):
+            # Generators and lazy lists of entries must not be consumed here
+            if isinstance(ie_result.get(key), list):
+                for entry in ie_result[key]:
+                    YoutubeDL._resolve_all_lazy_fields(entry)
+
     def _sanitize_thumbnails(self, info_dict):
         thumbnails = info_dict.get('thumbnails')
         if thumbnails is None:
@@ -2752,19 +3031,7 @@ def sanitize_numeric_fields(info):
         if (info_dict.get('duration') or 0) <= 0 and info_dict.pop('duration', None):
             self.report_warning('"duration" field is negative, there is an error in extractor')
 
-        chapters = info_dict.get('chapters') or []
-        if chapters and chapters[0].get('start_time'):
-            chapters.insert(0, {'start_time': 0})
-
-        dummy_chapter = {'end_time': 0, 'start_time': info_dict.get('duration')}
-        for idx, (prev, current, next_) in enumerate(zip(
-                (dummy_chapter, *chapters), chapters, (*chapters[1:], dummy_chapter)), 1):
-            if current.get('start_time') is None:
-                current['start_time'] = prev.get('end_time')
-            if not current.get('end_time'):
-                current['end_time'] = next_.get('start_time')
-            if not current.get('title'):
-                current['title'] = f'<Untitled Chapter {idx}>'
+        self._sanitize_chapters(info_dict)
 
         if 'playlist' not in info_dict:
             # It isn't part of a playlist
@@ -2786,15 +3053,11 @@ def sanitize_numeric_fields(info):
         self._fill_common_fields(info_dict)
 
         for cc_kind in ('subtitles', 'automatic_captions'):
-            cc = info_dict.get(cc_kind)
-            if cc:
-                for _, subtitle in cc.items():
-                    for subtitle_format in subtitle:
-                        if subtitle_format.get('url'):
-                            subtitle_format['url'] = sanitize_url(subtitle_format['url'])
-                        if subtitle_format.get('ext') is None:
-                            subtitle_format['ext'] = determine_ext(subtitle_format['url']).lower()
+            self._sanitize_captions(info_dict, cc_kind)
 
+        self._resolve_lazy_fields(info_dict, ['subtitles'])
+        if self.params.get('writeautomaticsub') or self.params.get('listsubtitles'):
+            self._resolve_lazy_fields(info_dict, ['automatic_captions'])
         automatic_captions = info_dict.get('automatic_captions')
         subtitles = info_dict.get('subtitles')
 
@@ -2977,6 +3240,8 @@ def is_wellformed(f):
             # Process what we can, even without any available formats.
             formats_to_download = [{}]
 
+        if self.params.get('download_ranges'):
+            self._resolve_lazy_fields(info_dict, ['chapters'])
         requested_ranges = tuple(self.params.get('download_ranges', lambda *_: [{}])(info_dict, self))
         best_format, downloaded_formats = formats_to_download[-1], []
         if download:
@@ -3096,6 +3361,8 @@ def process_subtitles(self, video_id, normal_subtitles, automatic_captions):
     def _forceprint(self, key, info_dict):
         if info_dict is None:
             return
+        if self.params['forceprint'].get(key) or self.params['print_to_file'].get(key):
+            self._resolve_lazy_fields(info_dict)
         info_copy = info_dict.copy()
         info_copy.setdefault('filename', self.prepare_filename(info_dict))
         if info_dict.get('requested_formats') is not None:
@@ -3485,6 +3752,12 @@ def correct_ext(filename, ext=new_ext):
                 info_dict['__finaldir'] = os.path.dirname(os.path.abspath(encodeFilename(full_filename)))
 
             except network_exceptions as err:
+                cache_key = info_dict.get('__from_extraction_cache')
+                if cache_key and isinstance(err, HTTPError) and err.status == 403:
+                    # The cached media URLs may have expired before the extractor's policy predicted.
+                    # Raised regardless of ignoreerrors, so that the video is extracted again
+                    self.cache.store('extraction', cache_key, None)
+                    raise ReExtractInfo('[cache] Cached media URLs are forbidden', expected=True)
                 self.report_error(f'unable to download video data: {err}')
                 return
             except OSError as err:
@@ -3574,6 +3847,8 @@ def ffmpeg_fixup(cndn, msg, cls):
     def __download_wrapper(self, func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            # The result is not returned, so its lazy fields are only resolved when needed
+            self._internal_call_level += 1
             try:
                 res = func(*args, **kwargs)
             except CookieLoadError:
@@ -3589,6 +3864,8 @@ def wrapper(*args, **kwargs):
                 if self.params.get('dump_single_json', False):
                     self.post_extract(res)
                     self.to_stdout(json.dumps(self.sanitize_info(res)))
+            finally:
+                self._internal_call_level -= 1
         return wrapper
 
     def download(self, url_list):
@@ -3654,8 +3931,9 @@ def sanitize_info(info_dict, remove_private_keys=False):
 
         def filter_fn(obj):
             if isinstance(obj, dict):
+                YoutubeDL._resolve_lazy_fields(obj)
                 return {k: filter_fn(v) for k, v in obj.items() if not reject(k, v)}
-            elif isinstance(obj, (list, tuple, set, LazyList)):
+            elif isinstance(obj, (list, tuple, set, LazyList, FragmentList)):
                 return list(map(filter_fn, obj))
             elif obj is None or isinstance(obj, (str, int, float, bool)):
                 return obj
@@ -3719,6 +3997,8 @@ def run_pp(self, pp, infodict):
     def run_all_pps(self, key, info, *, additional_pps=None):
         if key != 'video':
             self._forceprint(key, info)
+        if additional_pps or self._pps[key]:
+            self._resolve_lazy_fields(info)
         for pp in (additional_pps or []) + self._pps[key]:
             info = self.run_pp(pp, info)
         return info
@@ -4233,10 +4513,28 @@ def build_request_director(self, handlers, preferences=None):
                 }),
             ))
         director.preferences.update(preferences or [])
+        director.rate_limiter = self._rate_limiter
+        director.http_cache = self._http_cache
+        director.metrics = self.network_metrics
         if 'prefer-legacy-http-handler' in self.params['compat_opts']:
             director.preferences.add(lambda rh, _: 500 if rh.RH_KEY == 'Urllib' else 0)
         return director
 
+    @functools.cached_property
+    def _rate_limiter(self):
+        if self.params.get('rate_limiter'):
+            return self.params['rate_limiter']
+        request_rate, byte_rate = self.params.get('request_ratelimit'), self.params.get('host_ratelimit')
+        if request_rate or byte_rate:
+            return RateLimiter(request_rate, byte_rate)
+
+    @functools.cached_property
+    def _http_cache(self):
+        if self.params.get('http_cache') and self.cache.enabled:
+            return HTTPCache(self.cache.get_dir('http'), **filter_dict({
+                'max_size': self.params.get('http_cache_size'),
+            }))
+
     @functools.cached_property
     def _request_director(self):
         return self.build_request_director(_REQUEST_HANDLERS.values(), _RH_PREFERENCES)
@@ -206,6 +206,8 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('concurrent format checks', opts.concurrent_format_checks, True)
+    validate_positive('extraction cache duration', opts.extraction_cache)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -213,6 +215,7 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     # Time ranges
     validate_positive('subtitles sleep interval', opts.sleep_interval_subtitles)
     validate_positive('requests sleep interval', opts.sleep_interval_requests)
+    validate_positive('request rate limit', opts.request_ratelimit, True)
     validate_positive('sleep interval', opts.sleep_interval)
     validate_positive('max sleep interval', opts.max_sleep_interval)
     if opts.sleep_interval is None:
@@ -301,10 +304,12 @@ def validate_bytes(name, value):
 
     opts.ratelimit = validate_bytes('rate limit', opts.ratelimit)
     opts.throttledratelimit = validate_bytes('throttled rate limit', opts.throttledratelimit)
+    opts.host_ratelimit = validate_bytes('host rate limit', opts.host_ratelimit)
     opts.min_filesize = validate_bytes('min filesize', opts.min_filesize)
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.http_cache_size = validate_bytes('http cache size', opts.http_cache_size)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -821,6 +826,7 @@ def parse_options(argv=None):
         'allow_multiple_video_streams': opts.allow_multiple_video_streams,
         'allow_multiple_audio_streams': opts.allow_multiple_audio_streams,
         'check_formats': opts.check_formats,
+        'concurrent_format_checks': opts.concurrent_format_checks,
         'listformats': opts.listformats,
         'listformats_table': opts.listformats_table,
         'outtmpl': opts.outtmpl,
@@ -835,6 +841,8 @@ def parse_options(argv=None):
         'allowed_extractors': opts.allowed_extractors or ['default'],
         'ratelimit': opts.ratelimit,
         'throttledratelimit': opts.throttledratelimit,
+        'request_ratelimit': opts.request_ratelimit,
+        'host_ratelimit': opts.host_ratelimit,
         'overwrites': opts.overwrites,
         'retries': opts.retries,
         'file_access_retries': opts.file_access_retries,
@@ -897,6 +905,9 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'http_cache': opts.http_cache,
+        'http_cache_size': opts.http_cache_size,
+        'extraction_cache': opts.extraction_cache,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
@@ -915,6 +926,8 @@ def parse_options(argv=None):
         'socket_timeout': opts.socket_timeout,
         'bidi_workaround': opts.bidi_workaround,
         'debug_printtraffic': opts.debug_printtraffic,
+        'dump_network_metrics': opts.dump_network_metrics,
+        'dump_profile': opts.dump_profile,
         'prefer_ffmpeg': opts.prefer_ffmpeg,
         'include_ads': opts.include_ads,
         'default_search': opts.default_search,
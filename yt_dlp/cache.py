@@ -21,10 +21,14 @@ def _get_root_dir(self):
             res = os.path.join(cache_root, 'yt-dlp')
         return expand_path(res)
 
-    def _get_cache_fn(self, section, key, dtype):
+    def get_dir(self, section):
+        """Directory for a cache section that manages its own files"""
         assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
+        return os.path.join(self._get_root_dir(), section)
+
+    def _get_cache_fn(self, section, key, dtype):
         key = urllib.parse.quote(key, safe='').replace('%', ',')  # encode non-ascii characters
-        return os.path.join(self._get_root_dir(), section, f'{key}.{dtype}')
+        return os.path.join(self.get_dir(section), f'{key}.{dtype}')
 
     @property
     def enabled(self):
@@ -11,6 +11,12 @@
         brotli = None
 
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
 try:
     import certifi
 except ImportError:
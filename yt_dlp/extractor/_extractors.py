@@ -3,6 +3,7 @@
 
 from .youtube import (  # Youtube is moved to the top to improve performance
     YoutubeIE,
+    YoutubeBatchIE,
     YoutubeClipIE,
     YoutubeFavouritesIE,
     YoutubeNotificationsIE,
@@ -1,5 +1,10 @@
 import base64
+import bisect
+import codecs
 import collections
+import concurrent.futures
+import contextlib
+import contextvars
 import functools
 import getpass
 import hashlib
@@ -45,8 +50,10 @@
     NO_DEFAULT,
     ExtractorError,
     FormatSorter,
+    FragmentList,
     GeoRestrictedError,
     GeoUtils,
+    HTMLIndex,
     ISO639Utils,
     LenientJSONDecoder,
     Popen,
@@ -101,6 +108,67 @@
     xpath_text,
     xpath_with_ns,
 )
+from ..utils.profiling import current_profile, profile_section
+
+if sys.version_info >= (3, 11):
+    sre_parse = re._parser
+else:
+    import sre_parse
+
+
+def _required_literal(regex):
+    """Longest lowercase ASCII string contained in every match of the regex, or None"""
+    try:
+        pattern = sre_parse.parse(regex)
+    except re.error:
+        return None
+
+    runs, run = [], []
+
+    def flush():
+        if run:
+            runs.append(''.join(run))
+            run.clear()
+
+    def scan(items):
+        for op, arg in items:
+            name = op.name
+            if name == 'LITERAL' and arg < 128:
+                run.append(chr(arg).lower())
+            elif name == 'SUBPATTERN':
+                scan(arg[-1])
+            elif name == 'ATOMIC_GROUP':
+                scan(arg)
+            elif name == 'AT':  # Zero-width anchors do not interrupt a literal
+                continue
+            elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') and arg[0] >= 1:
+                flush()
+                scan(arg[2])
+                flush()
+            else:
+                flush()
+
+    scan(pattern)
+    flush()
+    return max(runs, key=len, default=None)
+
+
+_JSON_VALUE_BRACKETS_RE = re.compile(r'''(?sx)
+    (?:[^\[\]{}"'`/]+|"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*'|`[^`\\]*(?:\\.[^`\\]*)*`|/\*.*?\*/|//[^\n]*|/)*
+    (?P<bracket>[\[\]{}])''')
+
+
+def _json_value_end(string, start):
+    """End of the JSON object or array (or JavaScript object literal) at string[start], or None if it is not closed"""
+    depth = 0
+    for mobj in _JSON_VALUE_BRACKETS_RE.finditer(string, start):
+        if mobj.group('bracket') in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if not depth:
+                return mobj.end()
+    return None
 
 
 class InfoExtractor:
@@ -405,6 +473,11 @@ class InfoExtractor:
                     extracted will not be available to output template and
                     match_filter. So, only "comments" and "comment_count" are
                     currently allowed to be extracted via this method.
+    __lazy_fields:  A dictionary mapping field names to functions that compute them.
+                    The functions are only called (with no arguments) once the fields are
+                    needed, e.g. by match_filter, the output template, postprocessors
+                    or when the info_dict is written as JSON. The function may return None
+                    if the field is unavailable. Note that "formats" cannot be lazy.
 
     The following fields should only be used when the video belongs to some logical
     chapter or section:
@@ -482,6 +555,8 @@ class InfoExtractor:
 
     playlist_count: The total number of videos in a playlist. If not given,
                     YoutubeDL tries to calculate it from "entries"
+    __on_playlist_complete: A function to be called (with no arguments) once all
+                    the entries of the playlist have been processed without errors
 
 
     _type "multi_video" indicates that there are multiple videos that
@@ -556,6 +631,14 @@ class InfoExtractor:
 
     The _WORKING attribute should be set to False for broken IEs
     in order to warn the users and skip the tests.
+
+    The _URL_CHECK_WORKERS attribute sets how many URLs _are_valid_urls
+    and _check_formats check at the same time.
+
+    The _CACHE_FIELD_TTL attribute maps fields of the info dict to the number of
+    seconds after which they expire in the extraction cache (see the
+    extraction_cache option of YoutubeDL). Results that contain any of these fields
+    are extracted again once the earliest of them expires.
     """
 
     _ready = False
@@ -567,6 +650,8 @@ class InfoExtractor:
     _WORKING = True
     _ENABLED = True
     _NETRC_MACHINE = None
+    _URL_CHECK_WORKERS = 8
+    _CACHE_FIELD_TTL = dict.fromkeys(('url', 'formats', 'subtitles', 'automatic_captions'), 1800)
     IE_DESC = None
     SEARCH_KEY = None
     _VALID_URL = None
@@ -733,6 +818,12 @@ def _initialize_geo_bypass(self, geo_bypass_context):
 
     def extract(self, url):
         """Extracts URL information and returns it in list of dicts."""
+        if self.get_param('dump_profile'):
+            with self._downloader.extraction_profiler.profile(self.IE_NAME):
+                return self.__extract(url)
+        return self.__extract(url)
+
+    def __extract(self, url):
         try:
             for _ in range(2):
                 try:
@@ -840,7 +931,8 @@ def _create_request(self, url_or_request, data=None, headers=None, query=None, e
         return url_or_request
 
     def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fatal=True, data=None,
-                         headers=None, query=None, expected_status=None, impersonate=None, require_impersonation=False):
+                         headers=None, query=None, expected_status=None, impersonate=None, require_impersonation=False,
+                         cacheable=False):
         """
         Return the response handle.
 
@@ -871,7 +963,9 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
             headers = (headers or {}).copy()
             headers.setdefault('X-Forwarded-For', self._x_forwarded_for_ip)
 
-        extensions = {}
+        extensions = {'extractor': self.IE_NAME}
+        if cacheable:
+            extensions['cacheable'] = True
 
         if impersonate in (True, ''):
             impersonate = ImpersonateTarget()
@@ -895,7 +989,10 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
             self.report_warning(f'{message}; if you encounter errors, then {info_msg}', only_once=True)
 
         try:
-            return self._downloader.urlopen(self._create_request(url_or_request, data, headers, query, extensions))
+            request = self._create_request(url_or_request, data, headers, query, extensions)
+            profile = current_profile()
+            with profile.request(request.url, note) if profile else contextlib.nullcontext():
+                return self._downloader.urlopen(request)
         except network_exceptions as err:
             if isinstance(err, HTTPError):
                 if self.__can_accept_status_code(err, expected_status):
@@ -915,7 +1012,7 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
 
     def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=None, fatal=True,
                                  encoding=None, data=None, headers={}, query={}, expected_status=None,
-                                 impersonate=None, require_impersonation=False):
+                                 impersonate=None, require_impersonation=False, cacheable=False):
         """
         Return a tuple (page content as string, URL handle).
 
@@ -953,6 +1050,8 @@ def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=
                 - a boolean value; True means any impersonate target is sufficient
         require_impersonation -- flag to toggle whether the request should raise an error
             if impersonation is not possible (bool, default: False)
+        cacheable -- flag to allow the response to be served from and stored in the
+            HTTP cache, if enabled (bool, default: False). Only honoured for GET requests
         """
 
         # Strip hashes from the URL (#1038)
@@ -961,7 +1060,8 @@ def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=
 
         urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data,
                                      headers=headers, query=query, expected_status=expected_status,
-                                     impersonate=impersonate, require_impersonation=require_impersonation)
+                                     impersonate=impersonate, require_impersonation=require_impersonation,
+                                     cacheable=cacheable)
         if urlh is False:
             assert not fatal
             return False
@@ -1034,6 +1134,14 @@ def _request_dump_filename(self, url, video_id, data=None):
                 filename = fR'\\?\{absfilepath}'
         return filename
 
+    def __incremental_decoder(self, first_bytes, headers):
+        """Incremental counterpart of __decode_webpage, guessing the encoding from the first bytes"""
+        encoding = self._guess_encoding_from_content(headers.get('Content-Type', ''), first_bytes)
+        try:
+            return codecs.getincrementaldecoder(encoding)('replace')
+        except LookupError:
+            return codecs.getincrementaldecoder('utf-8')('replace')
+
     def __decode_webpage(self, webpage_bytes, encoding, headers):
         if not encoding:
             encoding = self._guess_encoding_from_content(headers.get('Content-Type', ''), webpage_bytes)
@@ -1082,14 +1190,17 @@ def _parse_xml(self, xml_string, video_id, transform_source=None, fatal=True, er
         if transform_source:
             xml_string = transform_source(xml_string)
         try:
-            return compat_etree_fromstring(xml_string.encode())
+            with profile_section('xml_parse'):
+                return compat_etree_fromstring(xml_string.encode())
         except xml.etree.ElementTree.ParseError as ve:
             self.__print_error('Failed to parse XML' if errnote is None else errnote, fatal, video_id, ve)
 
     def _parse_json(self, json_string, video_id, transform_source=None, fatal=True, errnote=None, **parser_kwargs):
         try:
-            return json.loads(
-                json_string, cls=LenientJSONDecoder, strict=False, transform_source=transform_source, **parser_kwargs)
+            with profile_section('json_parse'):
+                return json.loads(
+                    json_string, cls=LenientJSONDecoder, strict=False, transform_source=transform_source,
+                    **parser_kwargs)
         except ValueError as ve:
             self.__print_error('Failed to parse JSON' if errnote is None else errnote, fatal, video_id, ve)
 
@@ -1108,11 +1219,11 @@ def parse(ie, content, *args, errnote=errnote, **kwargs):
 
         def download_handle(self, url_or_request, video_id, note=note, errnote=errnote, transform_source=None,
                             fatal=True, encoding=None, data=None, headers={}, query={}, expected_status=None,
-                            impersonate=None, require_impersonation=False):
+                            impersonate=None, require_impersonation=False, cacheable=False):
             res = self._download_webpage_handle(
                 url_or_request, video_id, note=note, errnote=errnote, fatal=fatal, encoding=encoding,
                 data=data, headers=headers, query=query, expected_status=expected_status,
-                impersonate=impersonate, require_impersonation=require_impersonation)
+                impersonate=impersonate, require_impersonation=require_impersonation, cacheable=cacheable)
             if res is False:
                 return res
             content, urlh = res
@@ -1120,7 +1231,7 @@ def download_handle(self, url_or_request, video_id, note=note, errnote=errnote,
 
         def download_content(self, url_or_request, video_id, note=note, errnote=errnote, transform_source=None,
                              fatal=True, encoding=None, data=None, headers={}, query={}, expected_status=None,
-                             impersonate=None, require_impersonation=False):
+                             impersonate=None, require_impersonation=False, cacheable=False):
             if self.get_param('load_pages'):
                 url_or_request = self._create_request(url_or_request, data, headers, query)
                 filename = self._request_dump_filename(url_or_request.url, video_id, url_or_request.data)
@@ -1145,6 +1256,7 @@ def download_content(self, url_or_request, video_id, note=note, errnote=errnote,
                 'expected_status': expected_status,
                 'impersonate': impersonate,
                 'require_impersonation': require_impersonation,
+                'cacheable': cacheable,
             }
             if parser is None:
                 kwargs.pop('transform_source')
@@ -1357,6 +1469,11 @@ def _search_json(self, start_pattern, string, name, video_id, *, end_pattern='',
         else:
             fatal, has_default = False, True
 
+        if contains_pattern in self._JSON_VALUE_DELIMITERS:
+            result = self.__scan_json(start_pattern, string, contains_pattern, end_pattern, **kwargs)
+            if result is not None:
+                return result
+
         json_string = self._search_regex(
             rf'(?:{start_pattern})\s*(?P<json>{contains_pattern})\s*(?:{end_pattern})',
             string, name, group='json', fatal=fatal, default=None if has_default else NO_DEFAULT)
@@ -1375,6 +1492,51 @@ def _search_json(self, start_pattern, string, name, video_id, *, end_pattern='',
                     f'Unable to extract {_name} - Failed to parse JSON: {e}', video_id=video_id)
         return default
 
+    _JSON_VALUE_DELIMITERS = {
+        r'{(?s:.+)}': ('{', '}'),
+        r'\[(?s:.+)\]': (r'\[', r'\]'),
+    }
+
+    def __scan_json(self, start_pattern, string, contains_pattern, end_pattern, transform_source=None, **kwargs):
+        """
+        Parse the JSON value that _search_json would match, without matching the rest of the string.
+        The value is decoded in place, or found by a brace and quote aware scan for js_to_json.
+        Returns None if this does not succeed, in which case _search_json falls back to its regex
+        """
+        if kwargs.keys() - {'close_objects', 'errnote'}:
+            return None
+        elif transform_source is not None and js_to_json not in (transform_source, getattr(transform_source, 'func', None)):
+            return None
+        open_re, close_re = self._JSON_VALUE_DELIMITERS[contains_pattern]
+        mobj = re.search(rf'(?:{start_pattern})\s*(?={open_re})', string)
+        if not mobj:
+            return None
+        start = mobj.end()
+
+        def reject_constant(constant):
+            raise ValueError(f'{constant} is a string for js_to_json')
+
+        try:
+            try:
+                # Valid JSON is left unchanged by js_to_json, so it can be decoded in place as well
+                result, end = LenientJSONDecoder(
+                    strict=False, parse_constant=transform_source and reject_constant).raw_decode(string, start)
+            except ValueError:
+                if transform_source is None:
+                    raise
+                end = _json_value_end(string, start)
+                if end is None:
+                    return None
+                result = json.loads(
+                    string[start:end], cls=LenientJSONDecoder, strict=False,
+                    transform_source=transform_source, ignore_extra=True)
+            # The regex match ends with the last closing bracket that is followed by end_pattern
+            if not re.compile(rf'{close_re}\s*(?:{end_pattern})').search(string, max(end - 1, start + 2)):
+                return None
+        except (ValueError, re.error):
+            return None
+        return result
+
     def _html_search_regex(self, pattern, string, name, default=NO_DEFAULT, fatal=True, flags=0, group=None):
         """
         Like _search_regex, but strips HTML tags and unescapes entities.
@@ -1798,6 +1960,14 @@ def _search_nuxt_data(self, webpage, video_id, context_name='__NUXT__', *, fatal
         ret = self._parse_json(js, video_id, transform_source=functools.partial(js_to_json, vars=args), fatal=fatal)
         return traverse_obj(ret, traverse) or {}
 
+    @staticmethod
+    def _parse_html_index(html):
+        """
+        Index the elements of html in a single pass.
+        Further get_element(s)_*/find_element(s) calls on the same html use the index
+        """
+        return HTMLIndex.of(html)
+
     @staticmethod
     def _hidden_inputs(html):
         html = re.sub(r'<!--(?:(?!<!--).)*-->', '', html)
@@ -1842,13 +2012,12 @@ def _sort_formats(self, formats, field_preference=[]):
         if formats:
             formats[0]['__sort_fields'] = field_preference
 
-    def _check_formats(self, formats, video_id):
+    def _check_formats(self, formats, video_id, timeout=None):
         if formats:
-            formats[:] = filter(
-                lambda f: self._is_valid_url(
-                    f['url'], video_id,
-                    item='{} video format'.format(f.get('format_id')) if f.get('format_id') else 'video'),
-                formats)
+            valid = self._are_valid_urls(
+                [f['url'] for f in formats], video_id, timeout=timeout,
+                items=['{} video format'.format(f.get('format_id')) if f.get('format_id') else 'video' for f in formats])
+            formats[:] = itertools.compress(formats, valid)
 
     @staticmethod
     def _remove_duplicate_formats(formats):
@@ -1873,6 +2042,39 @@ def _is_valid_url(self, url, video_id, item='video', headers={}):
                 f'{video_id}: {item} URL is invalid, skipping: {e.cause!s}')
             return False
 
+    def _are_valid_urls(self, urls, video_id, items=None, headers={}, timeout=None):
+        """
+        Check several URLs concurrently with _is_valid_url
+
+        @param items    Names of the checked items, one per URL (default: 'video')
+        @param timeout  Seconds all the checks may take together. URLs that
+                        have not been checked by then are considered invalid
+        @returns        Whether each URL is valid, in the order of urls
+        """
+        urls = list(urls)
+        items = ['video'] * len(urls) if items is None else list(items)
+        if len(urls) < 2 and timeout is None:
+            return [self._is_valid_url(url, video_id, item, headers) for url, item in zip(urls, items)]
+
+        pool = concurrent.futures.ThreadPoolExecutor(self._URL_CHECK_WORKERS)
+        try:
+            checks = {}
+            for url, item in zip(urls, items):
+                if url not in checks:
+                    checks[url] = pool.submit(
+                        contextvars.copy_context().run, self._is_valid_url, url, video_id, item, headers)
+            concurrent.futures.wait(checks.values(), timeout)
+            results = []
+            for url, item in zip(urls, items):
+                if checks[url].done():
+                    results.append(checks[url].result())
+                else:
+                    self.to_screen(f'{video_id}: {item} URL could not be checked in time, skipping')
+                    results.append(False)
+            return results
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def http_scheme(self):
         """ Either "http:" or "https:", depending on the user's preferences """
         return (
@@ -2638,23 +2840,77 @@ def _extract_mpd_periods(
 
         if self.get_param('ignore_no_formats_error'):
             fatal = False
+        note = 'Downloading MPD manifest' if note is None else note
+        errnote = 'Failed to download MPD manifest' if errnote is None else errnote
 
-        res = self._download_xml_handle(
-            mpd_url, video_id,
-            note='Downloading MPD manifest' if note is None else note,
-            errnote='Failed to download MPD manifest' if errnote is None else errnote,
+        if any(self.get_param(param) for param in ('write_pages', 'dump_intermediate_pages', 'load_pages')):
+            res = self._download_xml_handle(
+                mpd_url, video_id, note=note, errnote=errnote,
+                fatal=fatal, data=data, headers=headers, query=query)
+            if res is False:
+                return []
+            mpd_doc, urlh = res
+            if mpd_doc is None:
+                return []
+            # We could have been redirected to a new url when we retrieved our mpd file.
+            return self._parse_mpd_periods(mpd_doc, mpd_id, base_url(urlh.url), urlh.url)
+
+        urlh = self._request_webpage(
+            mpd_url, video_id, note=note, errnote=errnote,
             fatal=fatal, data=data, headers=headers, query=query)
-        if res is False:
+        if urlh is False:
             return []
-        mpd_doc, urlh = res
+        return self.__stream_mpd_periods(urlh, video_id, mpd_id, errnote, fatal)
+
+    def __stream_mpd_periods(self, urlh, video_id, mpd_id, errnote, fatal):
+        """
+        Parse the periods of an MPD manifest while it is being downloaded.
+        As with a downloaded manifest, the response is decoded like a webpage
+        and no period is returned unless the whole manifest could be parsed
+        """
+        parser = xml.etree.ElementTree.XMLPullParser(events=('start', 'end'))
+        failed = False
+
+        def read_events():
+            nonlocal failed
+            decoder = None
+            try:
+                for chunk in iter(functools.partial(urlh.read, 1 << 16), b''):
+                    if decoder is None:
+                        decoder = self.__incremental_decoder(chunk, urlh.headers)
+                    with profile_section('xml_parse'):
+                        parser.feed(decoder.decode(chunk))
+                    yield from parser.read_events()
+                with profile_section('xml_parse'):
+                    if decoder is not None:
+                        parser.feed(decoder.decode(b'', final=True))
+                    parser.close()
+                yield from parser.read_events()
+            except (xml.etree.ElementTree.ParseError, *network_exceptions) as err:
+                failed = True
+                self.__print_error(errnote, fatal, video_id, err)
+            finally:
+                urlh.close()
+
+        events = read_events()
+        mpd_doc = next((elem for event, elem in events if event == 'start'), None)
         if mpd_doc is None:
             return []
 
-        # We could have been redirected to a new url when we retrieved our mpd file.
-        mpd_url = urlh.url
-        mpd_base_url = base_url(mpd_url)
+        def read_periods():
+            period_tag = self._xpath_ns('Period', self._search_regex(
+                r'(?i)^{([^}]+)?}MPD$', mpd_doc.tag, 'namespace', default=None))
+            depth = 0
+            for event, elem in events:
+                depth += 1 if event == 'start' else -1
+                if depth == 0 and elem.tag == period_tag:
+                    yield elem
+                    # Drop each period once it has been parsed
+                    mpd_doc.remove(elem)
 
-        return self._parse_mpd_periods(mpd_doc, mpd_id, mpd_base_url, mpd_url)
+        # We could have been redirected to a new url when we retrieved our mpd file.
+        periods = list(self._parse_mpd_periods(mpd_doc, mpd_id, base_url(urlh.url), urlh.url, read_periods()))
+        return [] if failed else periods
 
     def _parse_mpd_formats(self, *args, **kwargs):
         fmts, subs = self._parse_mpd_formats_and_subtitles(*args, **kwargs)
@@ -2694,9 +2950,10 @@ def _merge_mpd_periods(self, periods):
 
         return list(formats.values()), subtitles
 
-    def _parse_mpd_periods(self, mpd_doc, mpd_id=None, mpd_base_url='', mpd_url=None):
+    def _parse_mpd_periods(self, mpd_doc, mpd_id=None, mpd_base_url='', mpd_url=None, periods=None):
         """
         Parse formats from MPD manifest.
+        @param periods  Period elements to parse, if not all those in mpd_doc
         References:
          1. MPEG-DASH Standard, ISO/IEC 23009-1:2014(E),
             http://standards.iso.org/ittf/PubliclyAvailableStandards/c065274_ISO_IEC_23009-1_2014.zip
@@ -2772,9 +3029,31 @@ def extract_Initialization(source):
                         extract_Initialization(segment_template)
             return ms_info
 
+        def number_fragment(location_key, media_template, bandwidth, start_number, duration, index):
+            return {
+                location_key: media_template % {
+                    'Number': start_number + index,
+                    'Bandwidth': bandwidth,
+                },
+                'duration': duration,
+            }
+
+        def timeline_fragment(location_key, media_template, bandwidth, start_number, timescale, timeline, index):
+            s_index, s_time, s_d = timeline[bisect.bisect_right(timeline, (index, math.inf)) - 1]
+            return {
+                location_key: media_template % {
+                    'Time': s_time + (index - s_index) * s_d,
+                    'Bandwidth': bandwidth,
+                    'Number': start_number + index,
+                },
+                'duration': float_or_none(s_d, timescale),
+            }
+
         mpd_duration = parse_duration(mpd_doc.get('mediaPresentationDuration'))
         stream_numbers = collections.defaultdict(int)
-        for period_idx, period in enumerate(mpd_doc.findall(_add_ns('Period'))):
+        if periods is None:
+            periods = mpd_doc.findall(_add_ns('Period'))
+        for period_idx, period in enumerate(periods):
             period_entry = {
                 'id': period.get('id', f'period-{period_idx}'),
                 'formats': [],
@@ -2929,45 +3208,28 @@ def location_key(location):
                                 segment_duration = float_or_none(representation_ms_info['segment_duration'], representation_ms_info['timescale'])
                                 representation_ms_info['total_number'] = int(math.ceil(
                                     float_or_none(period_duration, segment_duration, default=0)))
-                            representation_ms_info['fragments'] = [{
-                                media_location_key: media_template % {
-                                    'Number': segment_number,
-                                    'Bandwidth': bandwidth,
-                                },
-                                'duration': segment_duration,
-                            } for segment_number in range(
-                                representation_ms_info['start_number'],
-                                representation_ms_info['total_number'] + representation_ms_info['start_number'])]
+                            # The fragments are only built when they are accessed
+                            representation_ms_info['fragments'] = (
+                                max(representation_ms_info['total_number'], 0), functools.partial(
+                                    number_fragment, media_location_key, media_template, bandwidth,
+                                    representation_ms_info['start_number'], segment_duration))
                         else:
                             # $Number*$ or $Time$ in media template with S list available
                             # Example $Number*$: http://www.svtplay.se/klipp/9023742/stopptid-om-bjorn-borg
                             # Example $Time$: https://play.arkena.com/embed/avp/v2/player/media/b41dda37-d8e7-4d3f-b1b5-9a9db578bdfe/1/129411
-                            representation_ms_info['fragments'] = []
+                            # Only the first fragment index and time of each S entry are kept
+                            timeline = []
                             segment_time = 0
-                            segment_d = None
-                            segment_number = representation_ms_info['start_number']
-
-                            def add_segment_url():
-                                segment_url = media_template % {
-                                    'Time': segment_time,
-                                    'Bandwidth': bandwidth,
-                                    'Number': segment_number,
-                                }
-                                representation_ms_info['fragments'].append({
-                                    media_location_key: segment_url,
-                                    'duration': float_or_none(segment_d, representation_ms_info['timescale']),
-                                })
-
+                            segment_index = 0
                             for s in representation_ms_info['s']:
                                 segment_time = s.get('t') or segment_time
-                                segment_d = s['d']
-                                add_segment_url()
-                                segment_number += 1
-                                for _ in range(s.get('r', 0)):
-                                    segment_time += segment_d
-                                    add_segment_url()
-                                    segment_number += 1
-                                segment_time += segment_d
+                                timeline.append((segment_index, segment_time, s['d']))
+                                repeat = max(s.get('r', 0), 0) + 1
+                                segment_index += repeat
+                                segment_time += repeat * s['d']
+                            representation_ms_info['fragments'] = (segment_index, functools.partial(
+                                timeline_fragment, media_location_key, media_template, bandwidth,
+                                representation_ms_info['start_number'], representation_ms_info['timescale'], timeline))
                     elif 'segment_urls' in representation_ms_info and 's' in representation_ms_info:
                         # No media template,
                         # e.g. https://www.youtube.com/watch?v=iXZV5uAYMJI
@@ -3010,19 +3272,19 @@ def add_segment_url():
                             # NB: mpd_url may be empty when MPD manifest is parsed from a string
                             'url': mpd_url or base_url,
                             'fragment_base_url': base_url,
-                            'fragments': [],
+                            'fragments': FragmentList(),
                             'protocol': 'http_dash_segments' if mime_type != 'image/jpeg' else 'mhtml',
                         })
                         if 'initialization_url' in representation_ms_info:
                             initialization_url = representation_ms_info['initialization_url']
                             if not f.get('url'):
                                 f['url'] = initialization_url
-                            f['fragments'].append({location_key(initialization_url): initialization_url})
+                            f['fragments'].extend([{location_key(initialization_url): initialization_url}])
                         f['fragments'].extend(representation_ms_info['fragments'])
                         if not period_duration:
                             period_duration = try_get(
                                 representation_ms_info,
-                                lambda r: sum(frag['duration'] for frag in r['fragments']), float)
+                                lambda r: sum(frag['duration'] for frag in FragmentList(r['fragments'])), float)
                     else:
                         # Assuming direct URL to unfragmented media.
                         f['url'] = base_url
@@ -3935,6 +4197,20 @@ def _extract_embed_urls(cls, url, webpage):
                 if cls._VALID_URL is False or cls.suitable(embed_url):
                     yield embed_url
 
+    @classproperty(cache=True)
+    def _EMBED_LITERALS(cls):
+        """
+        Lowercase strings of which one must be in the lowercased webpage for the extractor to find embeds in it.
+        None if this cannot be determined, e.g. since the extractor overrides _extract_from_webpage
+        """
+        for klass in cls.__mro__:
+            if klass is InfoExtractor:
+                break
+            if {'extract_from_webpage', '_extract_from_webpage', '_extract_embed_urls'} & vars(klass).keys():
+                return None
+        literals = tuple(map(_required_literal, cls._EMBED_REGEX))
+        return None if None in literals else tuple(dict.fromkeys(literals))
+
     class StopExtraction(Exception):
         pass
 
@@ -2566,9 +2566,24 @@ def _extract_embeds(self, url, webpage, *, urlh=None, info_dict={}):
         # There probably should be a second run of generic extractor on unescaped webpage.
         # webpage = urllib.parse.unquote(webpage)
 
+        # Extractors whose literals are not in the webpage cannot find embeds in it.
+        # This avoids loading most (lazy) extractors and running their _EMBED_REGEX
+        lowercase_webpage, found_literals = webpage.lower(), {}
+
+        def may_have_embeds(ie):
+            literals = ie._EMBED_LITERALS
+            if literals is None:
+                return True
+            for literal in literals:
+                if literal not in found_literals:
+                    found_literals[literal] = literal in lowercase_webpage
+                if found_literals[literal]:
+                    return True
+            return False
+
         embeds = []
         for ie in self._downloader._ies.values():
-            if ie.ie_key() in smuggled_data.get('block_ies', []):
+            if ie.ie_key() in smuggled_data.get('block_ies', []) or not may_have_embeds(ie):
                 continue
             gen = ie.extract_from_webpage(self._downloader, url, webpage)
             current_embeds = []
@@ -1,6 +1,9 @@
 import base64
 import calendar
 import collections
+import concurrent.futures
+import contextlib
+import contextvars
 import copy
 import datetime as dt
 import enum
@@ -10,6 +13,7 @@
 import json
 import math
 import os.path
+import queue
 import random
 import re
 import shlex
@@ -26,6 +30,7 @@
 from ..utils import (
     NO_DEFAULT,
     ExtractorError,
+    InAdvancePagedList,
     LazyList,
     UserNotLive,
     bug_reports_message,
@@ -42,6 +47,7 @@
     is_html,
     join_nonempty,
     js_to_json,
+    locked_file,
     mimetype2ext,
     orderedSet,
     parse_codecs,
@@ -64,10 +70,12 @@
     unified_timestamp,
     unsmuggle_url,
     update_url_query,
+    url_basename,
     url_or_none,
     urljoin,
     variadic,
 )
+from ..version import __version__
 
 STREAMING_DATA_CLIENT_NAME = '__yt_dlp_client'
 STREAMING_DATA_PO_TOKEN = '__yt_dlp_po_token'
@@ -517,6 +525,7 @@ class YoutubeBaseInfoExtractor(InfoExtractor):
     _YT_CHANNEL_UCID_RE = r'UC[\w-]{22}'
 
     _NETRC_MACHINE = 'youtube'
+    _YTCFG_TTL = 3600
 
     def ucid_or_none(self, ucid):
         return self._search_regex(rf'^({self._YT_CHANNEL_UCID_RE})$', ucid, 'UC-id', default=None)
@@ -985,7 +994,37 @@ def generate_api_headers(
     def _generate_webpage_headers(self):
         return self._generate_oauth_headers()
 
+    @functools.cached_property
+    def _ytcfg_cache(self):
+        return {}
+
+    def _cached_ytcfg(self, client):
+        """Client config downloaded earlier in this session (or a previous one, if persisted)"""
+        ttl = int_or_none(self._configuration_arg('ytcfg_ttl', [''], ie_key=YoutubeIE)[0], default=self._YTCFG_TTL)
+        if ttl <= 0:
+            return None
+        key = (client, self.is_authenticated)
+        cached = self._ytcfg_cache.get(key)
+        if not cached and not self.is_authenticated and self._configuration_arg('persist_ytcfg', ie_key=YoutubeIE):
+            cached = self.cache.load('youtube-ytcfg', client, min_ver=__version__)
+        if not isinstance(cached, dict) or time.time() - (float_or_none(cached.get('timestamp')) or 0) > ttl:
+            return None
+        self._ytcfg_cache[key] = cached
+        return copy.deepcopy(traverse_obj(cached, ('ytcfg', {dict})))
+
+    def _store_ytcfg(self, client, ytcfg):
+        if not ytcfg:
+            return
+        cached = {'timestamp': time.time(), 'ytcfg': copy.deepcopy(ytcfg)}
+        self._ytcfg_cache[(client, self.is_authenticated)] = cached
+        # Configs obtained with cookies contain account details and are never written to disk
+        if not self.is_authenticated and self._configuration_arg('persist_ytcfg', ie_key=YoutubeIE):
+            self.cache.store('youtube-ytcfg', client, cached)
+
     def _download_ytcfg(self, client, video_id):
+        ytcfg = self._cached_ytcfg(client)
+        if ytcfg:
+            return ytcfg
         url = {
             'web': 'https://www.youtube.com',
             'web_music': 'https://music.youtube.com',
@@ -996,7 +1035,9 @@ def _download_ytcfg(self, client, video_id):
         webpage = self._download_webpage(
             url, video_id, fatal=False, note=f'Downloading {client.replace("_", " ").strip()} client config',
             headers=self._generate_webpage_headers())
-        return self.extract_ytcfg(video_id, webpage) or {}
+        ytcfg = self.extract_ytcfg(video_id, webpage) or {}
+        self._store_ytcfg(client, ytcfg)
+        return ytcfg
 
     @staticmethod
     def _build_api_continuation_query(continuation, ctp=None):
@@ -1450,6 +1491,11 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
     ]
     _RETURN_TYPE = 'video'  # XXX: How to handle multifeed?
 
+    _NSIG_RESULTS_CACHE_SIZE = 500
+    _PLAYER_STORE_SIZE = 10
+    _PLAYER_RESPONSE_WORKERS = 4
+    # Format and caption URLs are signed to expire after 6 hours
+    _CACHE_FIELD_TTL = dict.fromkeys(('formats', 'subtitles', 'automatic_captions'), 5 * 3600)
     _PLAYER_INFO_RE = (
         r'/s/player/(?P<id>[a-zA-Z0-9_-]{8,})/player',
         r'/(?P<id>[a-zA-Z0-9_-]{8,})/player(?:_ias\.vflset(?:/[a-zA-Z]{2,3}_[a-zA-Z]{2,3})?|-plasma-ias-(?:phone|tablet)-[a-z]{2}_[A-Z]{2}\.vflset)/base\.js$',
@@ -3062,6 +3108,7 @@ def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._code_cache = {}
         self._player_cache = {}
+        self._player_lock = threading.Lock()
 
     def _prepare_live_from_start_formats(self, formats, video_id, live_start_time, url, webpage_url, smuggled_data, is_live):
         lock = threading.Lock()
@@ -3256,16 +3303,107 @@ def _extract_player_info(cls, player_url):
 
     def _load_player(self, video_id, player_url, fatal=True):
         player_id = self._extract_player_info(player_url)
-        if player_id not in self._code_cache:
-            code = self._download_webpage(
-                player_url, video_id, fatal=fatal,
-                note='Downloading player ' + player_id,
-                errnote=f'Download of {player_url} failed',
-                headers=self._generate_webpage_headers())
-            if code:
-                self._code_cache[player_id] = code
+        with self._player_lock:
+            if player_id not in self._code_cache:
+                code = self._read_stored_player(player_id)
+                if code is None:
+                    code = self._download_player(video_id, player_url, player_id, fatal)
+                if code:
+                    self._code_cache[player_id] = code
         return self._code_cache.get(player_id)
 
+    def _download_player(self, video_id, player_url, player_id, fatal):
+        """Download the player, letting only one process at a time fetch a given player"""
+        download = functools.partial(
+            self._download_webpage, player_url, video_id, fatal=fatal,
+            note='Downloading player ' + player_id,
+            errnote=f'Download of {player_url} failed',
+            headers=self._generate_webpage_headers())
+        if not self.cache.enabled:
+            return download()
+
+        lock_fn = os.path.join(self.cache.get_dir('youtube-players'), f'{player_id}.lock')
+        with contextlib.ExitStack() as stack:
+            try:
+                os.makedirs(os.path.dirname(lock_fn), exist_ok=True)
+                try:
+                    stack.enter_context(locked_file(lock_fn, 'a', block=False))
+                except BlockingIOError:
+                    self.to_screen(f'Waiting for another process to download player {player_id}')
+                    stack.enter_context(locked_file(lock_fn, 'a'))
+            except OSError as e:
+                self.write_debug(f'Unable to lock player store: {e}')
+            else:
+                # The player may have been stored while waiting for the lock
+                code = self._read_stored_player(player_id)
+                if code is not None:
+                    return code
+
+            code = download()
+            if code:
+                self._store_player(player_id, code)
+            return code
+
+    def _read_stored_player(self, player_id):
+        if not self.cache.enabled:
+            return None
+        digest = traverse_obj(self.cache.load('youtube-players', player_id), ('sha256', {str}))
+        if not digest or not re.fullmatch(r'[0-9a-f]{64}', digest):
+            return None
+        fn = os.path.join(self.cache.get_dir('youtube-players'), f'{digest}.js')
+        try:
+            with open(fn, 'rb') as f:
+                data = f.read()
+            os.utime(fn)
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            self.write_debug(f'Discarding corrupted player {player_id} from cache')
+            return None
+        return data.decode()
+
+    def _store_player(self, player_id, code):
+        """Store the player code by its hash, keeping the most recently used players"""
+        store = self.cache.get_dir('youtube-players')
+        data = code.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        fn = os.path.join(store, f'{digest}.js')
+        tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.part'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, fn)
+        except OSError as e:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            self.report_warning(f'Unable to store player {player_id} in cache: {e}')
+            return
+        self.cache.store('youtube-players', player_id, {'sha256': digest})
+
+        players = []
+        with contextlib.suppress(OSError), os.scandir(store) as it:
+            players = sorted(
+                (entry for entry in it if entry.name.endswith('.js')),
+                key=lambda entry: entry.stat().st_mtime, reverse=True)
+        if len(players) <= self._PLAYER_STORE_SIZE:
+            return
+        for entry in players[self._PLAYER_STORE_SIZE:]:
+            with contextlib.suppress(OSError):
+                os.remove(entry.path)
+
+        # Drop the pointers to the evicted players along with their lock files
+        kept = {entry.name[:-3] for entry in players[:self._PLAYER_STORE_SIZE]}
+        pointers = []
+        with contextlib.suppress(OSError), os.scandir(store) as it:
+            pointers = [entry.name[:-5] for entry in it if entry.name.endswith('.json')]
+        for pointer_id in pointers:
+            if pointer_id == player_id or traverse_obj(
+                    self.cache.load('youtube-players', pointer_id), ('sha256', {str})) in kept:
+                continue
+            for ext in ('json', 'lock'):
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(store, f'{pointer_id}.{ext}'))
+
     def _extract_signature_function(self, video_id, player_url, example_sig):
         player_id = self._extract_player_info(player_url)
 
@@ -3378,6 +3516,14 @@ def _decrypt_nsig(self, s, video_id, player_url):
             raise ExtractorError('Cannot decrypt nsig without player_url')
         player_url = urljoin('https://www.youtube.com', player_url)
 
+        nsig_results = self._load_nsig_results(player_url)
+        if s in nsig_results:
+            # Move the hit to the end, so that the least recently used results are evicted first.
+            # The new order is persisted along with the next result that is stored
+            ret = nsig_results[s] = nsig_results.pop(s)
+            self.write_debug(f'Decrypted nsig {s} => {ret} (cached)')
+            return ret
+
         try:
             jsi, player_id, func_code = self._extract_n_function_code(video_id, player_url)
         except ExtractorError as e:
@@ -3404,8 +3550,27 @@ def _decrypt_nsig(self, s, video_id, player_url):
                 video_id=video_id, note='Executing signature code').strip()
 
         self.write_debug(f'Decrypted nsig {s} => {ret}')
+        self._store_nsig_result(player_url, s, ret)
         return ret
 
+    def _load_nsig_results(self, player_url):
+        """Previously decrypted n values of the player, shared between runs"""
+        player_id = self._extract_player_info(player_url)
+        cache_id = ('nsig results', player_id)
+        if cache_id not in self._player_cache:
+            # The results depend on the JS interpreter, so they are not reused across yt-dlp versions
+            results = self.cache.load('youtube-nsig-results', player_id, min_ver=__version__)
+            self._player_cache[cache_id] = results if isinstance(results, dict) else {}
+        return self._player_cache[cache_id]
+
+    def _store_nsig_result(self, player_url, s, ret):
+        results = self._load_nsig_results(player_url)
+        results.pop(s, None)
+        results[s] = ret
+        while len(results) > self._NSIG_RESULTS_CACHE_SIZE:
+            results.pop(next(iter(results)))
+        self.cache.store('youtube-nsig-results', self._extract_player_info(player_url), results)
+
     def _extract_n_function_name(self, jscode, player_url=None):
         # Examples (with placeholders nfunc, narray, idx):
         # *  .get("n"))&&(b=nfunc(b)
@@ -3694,7 +3859,7 @@ def _extract_comment_old(self, comment_renderer, parent=None):
 
         return info
 
-    def _comment_entries(self, root_continuation_data, ytcfg, video_id, parent=None, tracker=None):
+    def _comment_entries(self, root_continuation_data, ytcfg, video_id, parent=None, tracker=None, fetch_replies=None):
 
         get_single_config_arg = lambda c: self._configuration_arg(c, [''])[0]
 
@@ -3759,24 +3924,28 @@ def extract_thread(contents, entity_payloads):
                     continue
                 comment_id = comment['id']
 
-                if comment.get('is_pinned'):
-                    tracker['pinned_comment_ids'].add(comment_id)
-                # Sometimes YouTube may break and give us infinite looping comments.
-                # See: https://github.com/yt-dlp/yt-dlp/issues/6290
-                if comment_id in tracker['seen_comment_ids']:
-                    if comment_id in tracker['pinned_comment_ids'] and not comment.get('is_pinned'):
-                        # Pinned comments may appear a second time in newest first sort
-                        # See: https://github.com/yt-dlp/yt-dlp/issues/6712
-                        continue
+                # The tracker is shared with the reply threads of _comment_entries_concurrently
+                with tracker['lock']:
+                    if comment.get('is_pinned'):
+                        tracker['pinned_comment_ids'].add(comment_id)
+                    # Sometimes YouTube may break and give us infinite looping comments.
+                    # See: https://github.com/yt-dlp/yt-dlp/issues/6290
+                    is_seen = comment_id in tracker['seen_comment_ids']
+                    # Pinned comments may appear a second time in newest first sort
+                    # See: https://github.com/yt-dlp/yt-dlp/issues/6712
+                    is_pinned_again = (
+                        is_seen and comment_id in tracker['pinned_comment_ids'] and not comment.get('is_pinned'))
+                    if not is_seen:
+                        tracker['seen_comment_ids'].add(comment_id)
+                        tracker['running_total'] += 1
+                        tracker['total_reply_comments' if parent else 'total_parent_comments'] += 1
+                if is_pinned_again:
+                    continue
+                if is_seen:
                     self.report_warning(
                         'Detected YouTube comments looping. Stopping comment extraction '
                         f'{"for this thread" if parent else ""} as we probably cannot get any more.')
                     yield
-                else:
-                    tracker['seen_comment_ids'].add(comment['id'])
-
-                tracker['running_total'] += 1
-                tracker['total_reply_comments' if parent else 'total_parent_comments'] += 1
                 yield comment
 
                 # Attempt to get the replies
@@ -3784,12 +3953,18 @@ def extract_thread(contents, entity_payloads):
                     comment_thread_renderer, lambda x: x['replies']['commentRepliesRenderer'], dict)
 
                 if comment_replies_renderer:
-                    tracker['current_page_thread'] += 1
+                    with tracker['lock']:
+                        tracker['current_page_thread'] += 1
                     comment_entries_iter = self._comment_entries(
                         comment_replies_renderer, ytcfg, video_id,
                         parent=comment.get('id'), tracker=tracker)
-                    yield from itertools.islice(comment_entries_iter, min(
-                        max_replies_per_thread, max(0, max_replies - tracker['total_reply_comments'])))
+                    if fetch_replies:
+                        # The total reply limit is applied by _comment_entries_concurrently
+                        yield fetch_replies(itertools.islice(
+                            comment_entries_iter, min(max_replies_per_thread, max_replies)))
+                    else:
+                        yield from itertools.islice(comment_entries_iter, min(
+                            max_replies_per_thread, max(0, max_replies - tracker['total_reply_comments'])))
 
         # Keeps track of counts across recursive calls
         if not tracker:
@@ -3801,6 +3976,7 @@ def extract_thread(contents, entity_payloads):
                 'total_reply_comments': 0,
                 'seen_comment_ids': set(),
                 'pinned_comment_ids': set(),
+                'lock': threading.Lock(),
             }
 
         # TODO: Deprecated
@@ -3897,6 +4073,45 @@ def extract_thread(contents, entity_payloads):
             self.report_warning(f'Youtube said: {message}', video_id=video_id, only_once=True)
             raise self.CommentsDisabled
 
+    def _comment_entries_concurrently(self, root_continuation_data, ytcfg, video_id, workers):
+        """
+        Fetch the reply threads with a pool of workers while the top-level comments are being walked.
+        The comments are still yielded in the same order as by _comment_entries
+        """
+        max_replies = traverse_obj(self._configuration_arg('max_comments'), (2, {int_or_none})) or sys.maxsize
+        stop = threading.Event()
+        pool = concurrent.futures.ThreadPoolExecutor(workers)
+
+        def fetch_replies(entries):
+            return pool.submit(
+                contextvars.copy_context().run, lambda: list(itertools.takewhile(lambda _: not stop.is_set(), entries)))
+
+        pending, pending_threads, reply_count = collections.deque(), 0, 0
+
+        def ready_entries(wait):
+            nonlocal pending_threads, reply_count
+            while pending:
+                if not isinstance(pending[0], concurrent.futures.Future):
+                    yield pending.popleft()
+                    continue
+                # Keep enough reply threads queued for the pool to stay busy
+                if not (wait or pending[0].done() or pending_threads > 2 * workers):
+                    return
+                replies = pending.popleft().result()[:max(0, max_replies - reply_count)]
+                pending_threads -= 1
+                reply_count += len(replies)
+                yield from replies
+
+        try:
+            for entry in self._comment_entries(root_continuation_data, ytcfg, video_id, fetch_replies=fetch_replies):
+                pending.append(entry)
+                pending_threads += isinstance(entry, concurrent.futures.Future)
+                yield from ready_entries(wait=False)
+            yield from ready_entries(wait=True)
+        finally:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     def _generate_comment_continuation(video_id):
         """
@@ -3911,7 +4126,11 @@ def _real_comment_extract(contents):
             renderer = next((
                 item for item in traverse_obj(contents, (..., 'itemSectionRenderer'), default={})
                 if item.get('sectionIdentifier') == 'comment-item-section'), None)
-            yield from self._comment_entries(renderer, ytcfg, video_id)
+            workers = int_or_none(self._configuration_arg('comment_workers', [''])[0]) or 1
+            if workers > 1:
+                yield from self._comment_entries_concurrently(renderer, ytcfg, video_id, workers)
+            else:
+                yield from self._comment_entries(renderer, ytcfg, video_id)
 
         max_comments = int_or_none(self._configuration_arg('max_comments', [''])[0])
         return itertools.islice(_real_comment_extract(contents), 0, max_comments)
@@ -4088,24 +4307,15 @@ def _extract_player_responses(self, clients, video_id, webpage, master_ytcfg, sm
             prs.append({**initial_pr, 'streamingData': None})
 
         all_clients = set(clients)
-        clients = clients[::-1]
-
-        def append_client(*client_names):
-            """ Append the first client name that exists but not already used """
-            for client_name in client_names:
-                actual_client = _split_innertube_client(client_name)[0]
-                if actual_client in INNERTUBE_CLIENTS:
-                    if actual_client not in all_clients:
-                        clients.append(client_name)
-                        all_clients.add(actual_client)
-                        return
-
         tried_iframe_fallback = False
         player_url = visitor_data = data_sync_id = None
         skipped_clients = {}
-        while clients:
+
+        def request_player_response(client_name, pool):
+            nonlocal player_url, tried_iframe_fallback, visitor_data, data_sync_id
+
             deprioritize_pr = False
-            client, base_client, variant = _split_innertube_client(clients.pop())
+            client, base_client, variant = _split_innertube_client(client_name)
             player_ytcfg = master_ytcfg if client == 'web' else {}
             if 'configs' not in self._configuration_arg('player_skip') and client != 'web':
                 player_ytcfg = self._download_ytcfg(client, video_id) or player_ytcfg
@@ -4138,10 +4348,12 @@ def append_client(*client_names):
                     only_once=True)
                 deprioritize_pr = True
 
-            pr = initial_pr if client == 'web' else None
-            try:
-                pr = pr or self._extract_player_response(
-                    client, video_id,
+            future = concurrent.futures.Future()
+            if client == 'web' and initial_pr:
+                future.set_result(initial_pr)
+            else:
+                future = pool.submit(
+                    contextvars.copy_context().run, self._extract_player_response, client, video_id,
                     master_ytcfg=player_ytcfg or master_ytcfg,
                     player_ytcfg=player_ytcfg,
                     player_url=player_url,
@@ -4149,35 +4361,61 @@ def append_client(*client_names):
                     visitor_data=visitor_data,
                     data_sync_id=data_sync_id,
                     po_token=po_token)
-            except ExtractorError as e:
-                self.report_warning(e)
-                continue
+            return client, po_token, deprioritize_pr, future
+
+        # The player API requests of all clients are made concurrently,
+        # but the responses are processed in the order of client priority
+        with concurrent.futures.ThreadPoolExecutor(self._PLAYER_RESPONSE_WORKERS) as pool:
+            pending = collections.deque(request_player_response(client, pool) for client in clients)
+
+            def append_client(*client_names):
+                """ Request the first client name that exists but not already used, right after the current one """
+                for client_name in client_names:
+                    actual_client = _split_innertube_client(client_name)[0]
+                    if actual_client in INNERTUBE_CLIENTS:
+                        if actual_client not in all_clients:
+                            pending.appendleft(request_player_response(client_name, pool))
+                            all_clients.add(actual_client)
+                            return
 
-            if pr_id := self._invalid_player_response(pr, video_id):
-                skipped_clients[client] = pr_id
-            elif pr:
-                # Save client name for introspection later
-                sd = traverse_obj(pr, ('streamingData', {dict})) or {}
-                sd[STREAMING_DATA_CLIENT_NAME] = client
-                sd[STREAMING_DATA_PO_TOKEN] = po_token
-                for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
-                    f[STREAMING_DATA_CLIENT_NAME] = client
-                    f[STREAMING_DATA_PO_TOKEN] = po_token
-                if deprioritize_pr:
-                    deprioritized_prs.append(pr)
-                else:
-                    prs.append(pr)
+            try:
+                while pending:
+                    client, po_token, deprioritize_pr, future = pending.popleft()
+                    try:
+                        pr = future.result()
+                    except ExtractorError as e:
+                        self.report_warning(e)
+                        continue
 
-            # EU countries require age-verification for accounts to access age-restricted videos
-            # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
-            if self.is_authenticated and self._is_agegated(pr):
-                self.to_screen(
-                    f'{video_id}: This video is age-restricted and YouTube is requiring '
-                    'account age-verification; some formats may be missing', only_once=True)
-                # web_creator and mediaconnect can work around the age-verification requirement
-                # _testsuite & _vr variants can also work around age-verification
-                # tv_embedded may(?) still work around age-verification if the video is embeddable
-                append_client('web_creator', 'mediaconnect')
+                    if pr_id := self._invalid_player_response(pr, video_id):
+                        skipped_clients[client] = pr_id
+                    elif pr:
+                        # Save client name for introspection later
+                        sd = traverse_obj(pr, ('streamingData', {dict})) or {}
+                        sd[STREAMING_DATA_CLIENT_NAME] = client
+                        sd[STREAMING_DATA_PO_TOKEN] = po_token
+                        for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
+                            f[STREAMING_DATA_CLIENT_NAME] = client
+                            f[STREAMING_DATA_PO_TOKEN] = po_token
+                        if deprioritize_pr:
+                            deprioritized_prs.append(pr)
+                        else:
+                            prs.append(pr)
+
+                    # EU countries require age-verification for accounts to access age-restricted videos
+                    # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
+                    if self.is_authenticated and self._is_agegated(pr):
+                        self.to_screen(
+                            f'{video_id}: This video is age-restricted and YouTube is requiring '
+                            'account age-verification; some formats may be missing', only_once=True)
+                        # web_creator and mediaconnect can work around the age-verification requirement
+                        # _testsuite & _vr variants can also work around age-verification
+                        # tv_embedded may(?) still work around age-verification if the video is embeddable
+                        append_client('web_creator', 'mediaconnect')
+            except BaseException:
+                # Do not wait for the responses that will not be used
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
 
         prs.extend(deprioritized_prs)
 
@@ -4498,7 +4736,6 @@ def _extract_storyboard(self, player_responses, duration):
 
             url = base_url.replace('$L', str(L - i)).replace('$N', N) + f'&sigh={sigh}'
             fragment_count = frame_count / (cols * rows)
-            fragment_duration = duration / fragment_count
             yield {
                 'format_id': f'sb{i}',
                 'format_note': 'storyboard',
@@ -4512,10 +4749,16 @@ def _extract_storyboard(self, player_responses, duration):
                 'fps': frame_count / duration,
                 'rows': rows,
                 'columns': cols,
-                'fragments': [{
-                    'url': url.replace('$M', str(j)),
-                    'duration': min(fragment_duration, duration - (j * fragment_duration)),
-                } for j in range(math.ceil(fragment_count))],
+                'fragments': LazyList(self._storyboard_fragments(url, fragment_count, duration)),
+            }
+
+    @staticmethod
+    def _storyboard_fragments(url, fragment_count, duration):
+        fragment_duration = duration / fragment_count
+        for j in range(math.ceil(fragment_count)):
+            yield {
+                'url': url.replace('$M', str(j)),
+                'duration': min(fragment_duration, duration - (j * fragment_duration)),
             }
 
     def _download_player_responses(self, url, smuggled_data, video_id, webpage_url):
@@ -4528,7 +4771,11 @@ def _download_player_responses(self, url, smuggled_data, video_id, webpage_url):
             webpage = self._download_webpage(
                 webpage_url, video_id, fatal=False, query=query, headers=self._generate_webpage_headers())
 
-        master_ytcfg = self.extract_ytcfg(video_id, webpage) or self._get_default_ytcfg()
+        master_ytcfg = self.extract_ytcfg(video_id, webpage)
+        if master_ytcfg:
+            self._store_ytcfg('web', master_ytcfg)
+        else:
+            master_ytcfg = self._cached_ytcfg('web') or self._get_default_ytcfg()
 
         player_responses, player_url = self._extract_player_responses(
             self._get_requested_clients(url, smuggled_data),
@@ -4781,6 +5028,7 @@ def is_bad_format(fmt):
         }
 
         subtitles = {}
+        automatic_caption_tracks = []
         pctr = traverse_obj(player_responses, (..., 'captions', 'playerCaptionsTracklistRenderer'), expected_type=dict)
         if pctr:
             def get_lang_code(track):
@@ -4839,14 +5087,20 @@ def process_language(container, base_url, lang_code, sub_name, query):
                                 f['language'] = orig_trans_code
                         # Add an "-orig" label to the original language so that it can be distinguished.
                         # The subs are returned without "-orig" as well for compatibility
-                        process_language(
-                            automatic_captions, base_url, f'{trans_code}-orig', f'{trans_name} (Original)', {})
+                        automatic_caption_tracks.append(
+                            (base_url, f'{trans_code}-orig', f'{trans_name} (Original)', {}))
                     # Setting tlang=lang returns damaged subtitles.
-                    process_language(automatic_captions, base_url, trans_code, trans_name,
-                                     {} if orig_lang == orig_trans_code else {'tlang': trans_code})
+                    automatic_caption_tracks.append((
+                        base_url, trans_code, trans_name, {} if orig_lang == orig_trans_code else {'tlang': trans_code}))
+
+        def get_automatic_captions():
+            for track in automatic_caption_tracks:
+                process_language(automatic_captions, *track)
+            return automatic_captions
 
-        info['automatic_captions'] = automatic_captions
         info['subtitles'] = subtitles
+        # Building these tables is costly and most downloads never use them
+        info['__lazy_fields'] = {'automatic_captions': functools.cache(get_automatic_captions)}
 
         parsed_url = urllib.parse.urlparse(url)
         for component in [parsed_url.fragment, parsed_url.query]:
@@ -4929,13 +5183,26 @@ def process_language(container, base_url, lang_code, sub_name, query):
             }]
 
         if initial_data:
-            info['chapters'] = (
-                self._extract_chapters_from_json(initial_data, duration)
-                or self._extract_chapters_from_engagement_panel(initial_data, duration)
-                or self._extract_chapters_from_description(video_description, duration)
-                or None)
-
-            info['heatmap'] = self._extract_heatmap(initial_data)
+            # The lazy fields only keep alive the parts of initial_data that they read
+            chapter_data = traverse_obj(initial_data, {
+                'playerOverlays': {'playerOverlayRenderer': {'decoratedPlayerBarRenderer': (
+                    'playerOverlays', 'playerOverlayRenderer', 'decoratedPlayerBarRenderer')}},
+                'engagementPanels': ('engagementPanels', lambda _, v: (
+                    v['engagementPanelSectionListRenderer']['content']['macroMarkersListRenderer']), all),
+            })
+            heatmap_data = traverse_obj(initial_data, {
+                'frameworkUpdates': {'entityBatchUpdate': {'mutations': (
+                    'frameworkUpdates', 'entityBatchUpdate', 'mutations',
+                    lambda _, v: v['payload']['macroMarkersListEntity'], all)}},
+            })
+            info['__lazy_fields'].update({
+                'chapters': functools.cache(lambda: (
+                    self._extract_chapters_from_json(chapter_data, duration)
+                    or self._extract_chapters_from_engagement_panel(chapter_data, duration)
+                    or self._extract_chapters_from_description(video_description, duration)
+                    or None)),
+                'heatmap': functools.cache(functools.partial(self._extract_heatmap, heatmap_data)),
+            })
 
         contents = traverse_obj(
             initial_data, ('contents', 'twoColumnWatchNextResults', 'results', 'results', 'contents'),
@@ -5110,6 +5377,9 @@ def process_language(container, base_url, lang_code, sub_name, query):
 
 
 class YoutubeTabBaseInfoExtractor(YoutubeBaseInfoExtractor):
+    _PREFETCH_PAGES = 1
+    _WATERMARK_SIZE = 20
+
     @staticmethod
     def passthrough_smuggled_data(func):
         def _smuggle(info, smuggled_data):
@@ -5454,7 +5724,85 @@ def _extract_entries(self, parent_renderer, continuation_list):
         if not continuation_list[0]:
             continuation_list[0] = self._extract_continuation(parent_renderer)
 
-    def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data):
+    def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data, sync_key=None, pending_watermarks=None):
+        pages = self._entry_pages(tab, item_id, ytcfg, account_syncid, visitor_data)
+        prefetch = int_or_none(
+            self._configuration_arg('prefetch_pages', [''], ie_key=YoutubeTabIE)[0], default=self._PREFETCH_PAGES)
+        if prefetch > 0:
+            pages = self._prefetch(pages, prefetch)
+
+        watermark = None
+        if sync_key and pending_watermarks is not None and self._configuration_arg('incremental', ie_key=YoutubeTabIE):
+            if self.cache.enabled:
+                watermark = self.cache.load('youtubetab-watermark', sync_key, default=[])
+            else:
+                self.report_warning('Incremental sync requires the cache to be enabled', only_once=True)
+        if watermark is None:
+            for page in pages:
+                yield from page
+            return
+
+        # Entries are newest first: stop at the first one that was already listed by a previous sync
+        new_ids = []
+        try:
+            for entry in itertools.chain.from_iterable(pages):
+                # Entries without an ID are always listed, but cannot mark the position
+                entry_id = entry.get('id')
+                if entry_id is not None:
+                    if entry_id in watermark:
+                        self.to_screen(f'{item_id}: Reached the entries listed by the previous sync')
+                        break
+                    if len(new_ids) < self._WATERMARK_SIZE:
+                        new_ids.append(entry_id)
+                yield entry
+        finally:
+            pages.close()
+        # Only a walk that reached the watermark or the end of the tab may move it.
+        # It is stored by _store_watermarks once the entries have also been processed
+        if new_ids:
+            pending_watermarks[sync_key] = [
+                *new_ids, *(id_ for id_ in watermark if id_ not in new_ids)][:self._WATERMARK_SIZE]
+
+    def _store_watermarks(self, pending_watermarks):
+        while pending_watermarks:
+            self.cache.store('youtubetab-watermark', *pending_watermarks.popitem())
+
+    @staticmethod
+    def _prefetch(iterable, size):
+        """
+        Iterate over `iterable` in a background thread, keeping at most `size` items
+        that have been fetched (or are being fetched) but not yet consumed
+        """
+        results, slots, stop, end = queue.SimpleQueue(), threading.Semaphore(size), threading.Event(), object()
+
+        def produce():
+            iterator = iter(iterable)
+            try:
+                while True:
+                    while not slots.acquire(timeout=1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    results.put((next(iterator, end), None))
+            except BaseException as e:
+                results.put((None, e))
+
+        threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True).start()
+        try:
+            while True:
+                item, error = results.get()
+                if error:
+                    raise error
+                elif item is end:
+                    return
+                slots.release()
+                yield item
+        finally:
+            stop.set()
+
+    def _entry_pages(self, tab, item_id, ytcfg, account_syncid, visitor_data):
+        """Yields the entries of each page as a list, so that the next continuation is known right away"""
         continuation_list = [None]
         extract_entries = lambda x: self._extract_entries(x, continuation_list)
         tab_content = try_get(tab, lambda x: x['content'], dict)
@@ -5463,7 +5811,7 @@ def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data):
         parent_renderer = (
             try_get(tab_content, lambda x: x['sectionListRenderer'], dict)
             or try_get(tab_content, lambda x: x['richGridRenderer'], dict) or {})
-        yield from extract_entries(parent_renderer)
+        yield list(extract_entries(parent_renderer))
         continuation = continuation_list[0]
         seen_continuations = set()
         for page_num in itertools.count(1):
@@ -5516,7 +5864,7 @@ def _entries(self, tab, item_id, ytcfg, account_syncid, visitor_data):
                 func, parent_key = known_renderers[key]
                 video_items_renderer = {parent_key: continuation_items} if parent_key else continuation_items
                 continuation_list = [None]
-                yield from func(video_items_renderer)
+                yield list(func(video_items_renderer))
                 continuation = continuation_list[0] or self._extract_continuation(video_items_renderer)
 
             if not video_items_renderer:
@@ -5542,12 +5890,18 @@ def _extract_from_tabs(self, item_id, ytcfg, data, tabs):
         metadata['title'] += format_field(selected_tab, 'title', ' - %s')
         metadata['title'] += format_field(selected_tab, 'expandedText', ' - %s')
 
-        return self.playlist_result(
+        pending_watermarks = {}
+        playlist = self.playlist_result(
             self._entries(
                 selected_tab, metadata['id'], ytcfg,
                 self._extract_account_syncid(ytcfg, data),
-                self._extract_visitor_data(data, ytcfg)),
+                self._extract_visitor_data(data, ytcfg),
+                sync_key=join_nonempty(metadata['id'], traverse_obj(selected_tab, (
+                    'endpoint', 'commandMetadata', 'webCommandMetadata', 'url', {url_basename})), delim='_'),
+                pending_watermarks=pending_watermarks),
             **metadata)
+        playlist['__on_playlist_complete'] = functools.partial(self._store_watermarks, pending_watermarks)
+        return playlist
 
     def _extract_metadata_from_tabs(self, item_id, data):
         info = {'id': item_id}
@@ -7382,6 +7736,42 @@ def _real_extract(self, url):
         return self.url_result(f'https://www.youtube.com/user/{user_id}', YoutubeTabIE, user_id)
 
 
+class YoutubeBatchIE(YoutubeTabBaseInfoExtractor):
+    IE_NAME = 'youtube:batch'
+    IE_DESC = 'Basic metadata of many YouTube videos; "ytbatch:" prefix followed by comma separated video IDs'
+    _VALID_URL = r'ytbatch:(?P<id>[\w,-]+)$'
+    _BATCH_SIZE = 50
+    _TESTS = [{
+        'url': 'ytbatch:BaW_jenozKc,a9LDPn-MO4I',
+        'only_matching': True,
+    }]
+
+    def _fetch_batch(self, video_ids, page_num):
+        batch = video_ids[page_num * self._BATCH_SIZE:(page_num + 1) * self._BATCH_SIZE]
+        # Redirects to a temporary playlist of the given videos
+        webpage = self._download_webpage(
+            'https://www.youtube.com/watch_videos', f'batch {page_num + 1}', fatal=False,
+            note=f'Downloading batch {page_num + 1}', query={'video_ids': ','.join(batch)},
+            headers=self._generate_webpage_headers())
+        playlist = traverse_obj(
+            self.extract_yt_initial_data(f'batch {page_num + 1}', webpage or '', fatal=False),
+            ('contents', 'twoColumnWatchNextResults', 'playlist', 'playlist', {dict}))
+        entries = {entry['id']: entry for entry in self._playlist_entries(playlist)} if playlist else {}
+        for video_id in batch:
+            # Unavailable videos are left out of the playlist
+            yield entries.get(video_id) or self.url_result(
+                f'https://www.youtube.com/watch?v={video_id}', YoutubeIE, video_id)
+
+    def _real_extract(self, url):
+        video_ids = list(filter(None, self._match_id(url).split(',')))
+        invalid_ids = [video_id for video_id in video_ids if not re.fullmatch(r'[\w-]{11}', video_id)]
+        if invalid_ids:
+            raise ExtractorError(f'Invalid video IDs: {", ".join(invalid_ids)}', expected=True)
+        return self.playlist_result(InAdvancePagedList(
+            functools.partial(self._fetch_batch, video_ids),
+            math.ceil(len(video_ids) / self._BATCH_SIZE), self._BATCH_SIZE))
+
+
 class YoutubeFavouritesIE(YoutubeBaseInfoExtractor):
     IE_NAME = 'youtube:favorites'
     IE_DESC = 'YouTube liked videos; ":ytfav" keyword (requires cookies)'
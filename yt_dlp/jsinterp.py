@@ -16,6 +16,7 @@
     unified_timestamp,
     write_string,
 )
+from .utils.profiling import profiled
 
 
 def _js_bit_op(op):
@@ -96,7 +97,7 @@ def _js_ternary(cndn, if_true=True, if_false=False):
 
 
 # Ref: https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Operators/Operator_Precedence
-_OPERATORS = {  # None => Defined in JSInterpreter._operator
+_OPERATORS = {  # None => Defined in JSInterpreter._compile_operator
     '?': None,
     '??': None,
     '||': None,
@@ -134,6 +135,35 @@ def _js_ternary(cndn, if_true=True, if_false=False):
 _MATCHING_PARENS = dict(zip(*zip('()', '{}', '[]')))
 _QUOTES = '\'"/'
 
+_STATEMENT_RE = re.compile(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)')
+_CONTROL_FLOW_RE = re.compile(r'''(?x)
+    (?P<try>try)\s*\{|
+    (?P<if>if)\s*\(|
+    (?P<switch>switch)\s*\(|
+    (?P<for>for)\s*\(
+    ''')
+_ELSE_RE = re.compile(r'else\s*{')
+_CATCH_RE = re.compile(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{')
+_FINALLY_RE = re.compile(r'finally\s*\{')
+_SWITCH_RE = re.compile(r'switch\s*\(')
+_INCREMENT_RE = re.compile(fr'''(?x)
+    (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
+    (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''')
+_EXPRESSION_RE = re.compile(fr'''(?x)
+    (?P<assign>
+        (?P<out>{_NAME_RE})(?:\[(?P<index>[^\]]+?)\])?\s*
+        (?P<op>{"|".join(map(re.escape, sorted(set(_OPERATORS) - _COMP_OPERATORS, key=len, reverse=True)))})?
+        =(?!=)(?P<expr>.*)$
+    )|(?P<return>
+        (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
+    )|(?P<indexing>
+        (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
+    )|(?P<attribute>
+        (?P<var>{_NAME_RE})(?:(?P<nullish>\?)?\.(?P<member>[^(]+)|\[(?P<member2>[^\]]+)\])\s*
+    )|(?P<function>
+        (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
+    )''')
+
 
 class JS_Undefined:
     pass
@@ -167,6 +197,44 @@ def __delitem__(self, key):
         raise NotImplementedError('Deleting is not supported')
 
 
+class _TempNameSpace(LocalNameSpace):
+    """Holds the intermediate values of a compiled statement on top of `local_vars`"""
+
+    def __init__(self, local_vars):
+        super().__init__({}, local_vars)
+
+    def __setitem__(self, key, value):
+        self.maps[0 if key in self.maps[0] else 1][key] = value
+
+    def new_child(self, m=None):
+        return LocalNameSpace(m or {}, *self.maps)
+
+
+def _constant(value, should_return):
+    return lambda *_: (value, should_return)
+
+
+def _raiser(exc):
+    def raise_(*_):
+        raise exc
+    return raise_
+
+
+def _with_temps(temps, compiled):
+    if not temps:
+        return compiled
+
+    def with_temps(local_vars, allow_recursion):
+        local_vars = _TempNameSpace(local_vars)
+        for name, compute in temps:
+            value, should_abort = compute(local_vars, allow_recursion)
+            if should_abort:
+                return value, True
+            local_vars.maps[0][name] = value
+        return compiled(local_vars, allow_recursion)
+    return with_temps
+
+
 class Debugger:
     import sys
     ENABLED = False and 'pytest' in sys.modules
@@ -177,12 +245,12 @@ def write(*args, level=100):
                      f'{" ".join(truncate_string(str(x), 50, 50) for x in args)}\n')
 
     @classmethod
-    def wrap_interpreter(cls, f):
-        def interpret_statement(self, stmt, local_vars, allow_recursion, *args, **kwargs):
+    def wrap_interpreter(cls, stmt, f):
+        def interpret_statement(local_vars, allow_recursion):
             if cls.ENABLED and stmt.strip():
                 cls.write(stmt, level=allow_recursion)
             try:
-                ret, should_ret = f(self, stmt, local_vars, allow_recursion, *args, **kwargs)
+                ret, should_ret = f(local_vars, allow_recursion)
             except Exception as e:
                 if cls.ENABLED:
                     if isinstance(e, ExtractorError):
@@ -215,6 +283,7 @@ class JSInterpreter:
     def __init__(self, code, objects=None):
         self.code, self._functions = code, {}
         self._objects = {} if objects is None else objects
+        self._compiled_statements = {}
 
     class Exception(ExtractorError):  # noqa: A001
         def __init__(self, msg, expr=None, *args, **kwargs):
@@ -222,9 +291,12 @@ def __init__(self, msg, expr=None, *args, **kwargs):
                 msg = f'{msg.rstrip()} in: {truncate_string(expr, 50, 50)}'
             super().__init__(msg, *args, **kwargs)
 
-    def _named_object(self, namespace, obj):
+    def _temp_name(self):
         self.__named_object_counter += 1
-        name = f'__yt_dlp_jsinterp_obj{self.__named_object_counter}'
+        return f'__yt_dlp_jsinterp_obj{self.__named_object_counter}'
+
+    def _named_object(self, namespace, obj):
+        name = self._temp_name()
         if callable(obj) and not isinstance(obj, function_with_repr):
             obj = function_with_repr(obj, f'F<{self.__named_object_counter}>')
         namespace[name] = obj
@@ -289,25 +361,6 @@ def _separate_at_paren(cls, expr, delim=None):
             raise cls.Exception(f'No terminating paren {delim}', expr)
         return separated[0][1:].strip(), separated[1].strip()
 
-    def _operator(self, op, left_val, right_expr, expr, local_vars, allow_recursion):
-        if op in ('||', '&&'):
-            if (op == '&&') ^ _js_ternary(left_val):
-                return left_val  # short circuiting
-        elif op == '??':
-            if left_val not in (None, JS_Undefined):
-                return left_val
-        elif op == '?':
-            right_expr = _js_ternary(left_val, *self._separate(right_expr, ':', 1))
-
-        right_val = self.interpret_expression(right_expr, local_vars, allow_recursion)
-        if not _OPERATORS.get(op):
-            return right_val
-
-        try:
-            return _OPERATORS[op](left_val, right_val)
-        except Exception as e:
-            raise self.Exception(f'Failed to evaluate {left_val!r} {op} {right_val!r}', expr, cause=e)
-
     def _index(self, obj, idx, allow_undefined=False):
         if idx == 'length':
             return len(obj)
@@ -318,35 +371,80 @@ def _index(self, obj, idx, allow_undefined=False):
                 return JS_Undefined
             raise self.Exception(f'Cannot get index {idx}', repr(obj), cause=e)
 
-    def _dump(self, obj, namespace):
-        try:
-            return json.dumps(obj)
-        except TypeError:
-            return self._named_object(namespace, obj)
-
-    @Debugger.wrap_interpreter
     def interpret_statement(self, stmt, local_vars, allow_recursion=100):
-        if allow_recursion < 0:
-            raise self.Exception('Recursion limit reached')
-        allow_recursion -= 1
+        return self._compiled(stmt)(local_vars, allow_recursion)
 
-        should_return = False
-        sub_statements = list(self._separate(stmt, ';')) or ['']
-        expr = stmt = sub_statements.pop().strip()
+    # Statements are parsed only once into closures taking (local_vars, allow_recursion)
+    # and returning (ret, should_return). Intermediate values that need further parsing
+    # (e.g. the result of a parenthesized expression) are bound to temporary names
+    # in a _TempNameSpace instead of being spliced back into the source code
 
-        for sub_stmt in sub_statements:
-            ret, should_return = self.interpret_statement(sub_stmt, local_vars, allow_recursion)
+    def _compiled(self, stmt):
+        with contextlib.suppress(KeyError):
+            return self._compiled_statements[stmt]
+        try:
+            compiled = self._compile_statement(stmt)
+        except Exception as e:
+            # Errors are raised when the statement is run, as an interpreter would
+            compiled = _raiser(e)
+        if Debugger.ENABLED:
+            compiled = Debugger.wrap_interpreter(stmt, compiled)
+        self._compiled_statements[stmt] = compiled
+        return compiled
+
+    def _compiled_expression(self, expr):
+        compiled = self._compiled(expr)
+
+        def interpret_expression(local_vars, allow_recursion):
+            ret, should_return = compiled(local_vars, allow_recursion)
             if should_return:
-                return ret, should_return
+                raise self.Exception('Cannot return from an expression', expr)
+            return ret
+        return interpret_expression
+
+    def _compile_statement(self, stmt):
+        sub_statements = list(self._separate(stmt, ';')) or ['']
+        stmt = sub_statements.pop().strip()
+        compiled_subs = [self._compiled(sub_stmt) for sub_stmt in sub_statements]
+        try:
+            compiled_stmt = self._compile_single_statement(stmt)
+        except Exception as e:
+            if not compiled_subs:
+                raise
+            compiled_stmt = _raiser(e)
+
+        def interpret_statement(local_vars, allow_recursion):
+            if allow_recursion < 0:
+                raise self.Exception('Recursion limit reached')
+            allow_recursion -= 1
+            for compiled_sub in compiled_subs:
+                ret, should_return = compiled_sub(local_vars, allow_recursion)
+                if should_return:
+                    return ret, should_return
+            return compiled_stmt(local_vars, allow_recursion)
+        return interpret_statement
 
-        m = re.match(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)', stmt)
+    def _compile_single_statement(self, stmt):
+        expr, should_return = stmt, False
+        m = _STATEMENT_RE.match(stmt)
         if m:
             expr = stmt[len(m.group(0)):].strip()
             if m.group('throw'):
-                raise JS_Throw(self.interpret_expression(expr, local_vars, allow_recursion))
+                throw_expr = self._compiled_expression(expr)
+
+                def throw(local_vars, allow_recursion):
+                    raise JS_Throw(throw_expr(local_vars, allow_recursion))
+                return throw
             should_return = not m.group('var')
         if not expr:
-            return None, should_return
+            return _constant(None, should_return)
+
+        temps = []
+
+        def bind(compute, outer):
+            name = self._temp_name()
+            temps.append((name, compute))
+            return name + outer
 
         if expr[0] in _QUOTES:
             inner, outer = self._separate(expr, expr[0], 1)
@@ -359,250 +457,350 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100):
             else:
                 inner = json.loads(js_to_json(f'{inner}{expr[0]}', strict=True))
             if not outer:
-                return inner, should_return
-            expr = self._named_object(local_vars, inner) + outer
+                return _constant(inner, should_return)
+            expr = bind(_constant(inner, False), outer)
 
         if expr.startswith('new '):
             obj = expr[4:]
             if obj.startswith('Date('):
                 left, right = self._separate_at_paren(obj[4:])
-                date = unified_timestamp(
-                    self.interpret_expression(left, local_vars, allow_recursion), False)
-                if date is None:
-                    raise self.Exception(f'Failed to parse date {left!r}', expr)
-                expr = self._dump(int(date * 1000), local_vars) + right
+                date_expr, date_error = self._compiled_expression(left), (f'Failed to parse date {left!r}', expr)
+
+                def new_date(local_vars, allow_recursion):
+                    date = unified_timestamp(date_expr(local_vars, allow_recursion), False)
+                    if date is None:
+                        raise self.Exception(*date_error)
+                    return int(date * 1000), False
+                expr = bind(new_date, right)
             else:
                 raise self.Exception(f'Unsupported object {obj}', expr)
 
         if expr.startswith('void '):
-            left = self.interpret_expression(expr[5:], local_vars, allow_recursion)
-            return None, should_return
+            void_expr = self._compiled_expression(expr[5:])
+
+            def void(local_vars, allow_recursion):
+                void_expr(local_vars, allow_recursion)
+                return None, should_return
+            return _with_temps(temps, void)
 
         if expr.startswith('{'):
             inner, outer = self._separate_at_paren(expr)
             # try for object expression (Map)
             sub_expressions = [list(self._separate(sub_expr.strip(), ':', 1)) for sub_expr in self._separate(inner)]
             if all(len(sub_expr) == 2 for sub_expr in sub_expressions):
-                def dict_item(key, val):
-                    val = self.interpret_expression(val, local_vars, allow_recursion)
-                    if re.match(_NAME_RE, key):
-                        return key, val
-                    return self.interpret_expression(key, local_vars, allow_recursion), val
-
-                return dict(dict_item(k, v) for k, v in sub_expressions), should_return
-
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
+                items = [
+                    (key if re.match(_NAME_RE, key) else self._compiled_expression(key),
+                     self._compiled_expression(val))
+                    for key, val in sub_expressions]
+
+                def object_literal(local_vars, allow_recursion):
+                    obj = {}
+                    for key, val in items:
+                        val = val(local_vars, allow_recursion)
+                        obj[key if isinstance(key, str) else key(local_vars, allow_recursion)] = val
+                    return obj, should_return
+                return _with_temps(temps, object_literal)
+
+            expr = self._compile_group(inner, outer, should_return, bind)
+            if not isinstance(expr, str):
+                return _with_temps(temps, expr)
 
         if expr.startswith('('):
             inner, outer = self._separate_at_paren(expr)
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
+            expr = self._compile_group(inner, outer, should_return, bind)
+            if not isinstance(expr, str):
+                return _with_temps(temps, expr)
 
         if expr.startswith('['):
             inner, outer = self._separate_at_paren(expr)
-            name = self._named_object(local_vars, [
-                self.interpret_expression(item, local_vars, allow_recursion)
-                for item in self._separate(inner)])
-            expr = name + outer
-
-        m = re.match(r'''(?x)
-                (?P<try>try)\s*\{|
-                (?P<if>if)\s*\(|
-                (?P<switch>switch)\s*\(|
-                (?P<for>for)\s*\(
-                ''', expr)
+            list_items = [self._compiled_expression(item) for item in self._separate(inner)]
+
+            def array_literal(local_vars, allow_recursion):
+                return [item(local_vars, allow_recursion) for item in list_items], False
+            expr = bind(array_literal, outer)
+
+        if not temps:
+            return self._compile_expression_statement(expr, stmt, should_return)
+        try:
+            compiled = self._compile_expression_statement(expr, stmt, should_return)
+        except Exception as e:
+            compiled = _raiser(e)
+        return _with_temps(temps, compiled)
+
+    def _compile_group(self, inner, outer, should_return, bind):
+        compiled_inner = self._compiled(inner)
+        if outer:
+            return bind(compiled_inner, outer)
+
+        def group(local_vars, allow_recursion):
+            ret, should_abort = compiled_inner(local_vars, allow_recursion)
+            return ret, should_abort or should_return
+        return group
+
+    def _compile_expression_statement(self, expr, stmt, should_return):
+        m = _CONTROL_FLOW_RE.match(expr)
         md = m.groupdict() if m else {}
         if md.get('if'):
             cndn, expr = self._separate_at_paren(expr[m.end() - 1:])
             if_expr, expr = self._separate_at_paren(expr.lstrip())
             # TODO: "else if" is not handled
             else_expr = None
-            m = re.match(r'else\s*{', expr)
+            m = _ELSE_RE.match(expr)
             if m:
                 else_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-            cndn = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
-            ret, should_abort = self.interpret_statement(
-                if_expr if cndn else else_expr, local_vars, allow_recursion)
-            if should_abort:
-                return ret, True
+            cndn = self._compiled_expression(cndn)
+            if_stmt, else_stmt = self._compiled(if_expr), self._compiled(else_expr or '')
+            following = self._compile_following(expr, should_return)
 
-        if md.get('try'):
-            try_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-            err = None
-            try:
-                ret, should_abort = self.interpret_statement(try_expr, local_vars, allow_recursion)
+            def if_statement(local_vars, allow_recursion):
+                ret, should_abort = (if_stmt if _js_ternary(cndn(local_vars, allow_recursion)) else else_stmt)(
+                    local_vars, allow_recursion)
                 if should_abort:
                     return ret, True
-            except Exception as e:
-                # XXX: This works for now, but makes debugging future issues very hard
-                err = e
+                return following(local_vars, allow_recursion)
+            return if_statement
 
-            pending = (None, False)
-            m = re.match(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{', expr)
+        if md.get('try'):
+            try_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
+            try_stmt = self._compiled(try_expr)
+            catch_stmt = catch_var = finally_stmt = None
+            m = _CATCH_RE.match(expr)
             if m:
                 sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                if err:
-                    catch_vars = {}
-                    if m.group('err'):
-                        catch_vars[m.group('err')] = err.error if isinstance(err, JS_Throw) else err
-                    catch_vars = local_vars.new_child(catch_vars)
-                    err, pending = None, self.interpret_statement(sub_expr, catch_vars, allow_recursion)
-
-            m = re.match(r'finally\s*\{', expr)
+                catch_stmt, catch_var = self._compiled(sub_expr), m.group('err')
+            m = _FINALLY_RE.match(expr)
             if m:
                 sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
+                finally_stmt = self._compiled(sub_expr)
+            following = self._compile_following(expr, should_return)
+
+            def try_statement(local_vars, allow_recursion):
+                err = None
+                try:
+                    ret, should_abort = try_stmt(local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+                except Exception as e:
+                    # XXX: This works for now, but makes debugging future issues very hard
+                    err = e
+
+                pending = (None, False)
+                if catch_stmt and err:
+                    catch_vars = {}
+                    if catch_var:
+                        catch_vars[catch_var] = err.error if isinstance(err, JS_Throw) else err
+                    err, pending = None, catch_stmt(local_vars.new_child(catch_vars), allow_recursion)
+
+                if finally_stmt:
+                    ret, should_abort = finally_stmt(local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+
+                ret, should_abort = pending
                 if should_abort:
                     return ret, True
 
-            ret, should_abort = pending
-            if should_abort:
-                return ret, True
-
-            if err:
-                raise err
+                if err:
+                    raise err
+                return following(local_vars, allow_recursion)
+            return try_statement
 
         elif md.get('for'):
             constructor, remaining = self._separate_at_paren(expr[m.end() - 1:])
             if remaining.startswith('{'):
                 body, expr = self._separate_at_paren(remaining)
             else:
-                switch_m = re.match(r'switch\s*\(', remaining)  # FIXME: ?
+                switch_m = _SWITCH_RE.match(remaining)  # FIXME: ?
                 if switch_m:
                     switch_val, remaining = self._separate_at_paren(remaining[switch_m.end() - 1:])
                     body, expr = self._separate_at_paren(remaining, '}')
                     body = 'switch(%s){%s}' % (switch_val, body)
                 else:
                     body, expr = remaining, ''
-            start, cndn, increment = self._separate(constructor, ';')
-            self.interpret_expression(start, local_vars, allow_recursion)
-            while True:
-                if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
-                    break
-                try:
-                    ret, should_abort = self.interpret_statement(body, local_vars, allow_recursion)
-                    if should_abort:
-                        return ret, True
-                except JS_Break:
-                    break
-                except JS_Continue:
-                    pass
-                self.interpret_expression(increment, local_vars, allow_recursion)
-
-        elif md.get('switch'):
-            switch_val, remaining = self._separate_at_paren(expr[m.end() - 1:])
-            switch_val = self.interpret_expression(switch_val, local_vars, allow_recursion)
-            body, expr = self._separate_at_paren(remaining, '}')
-            items = body.replace('default:', 'case default:').split('case ')[1:]
-            for default in (False, True):
-                matched = False
-                for item in items:
-                    case, stmt = (i.strip() for i in self._separate(item, ':', 1))
-                    if default:
-                        matched = matched or case == 'default'
-                    elif not matched:
-                        matched = (case != 'default'
-                                   and switch_val == self.interpret_expression(case, local_vars, allow_recursion))
-                    if not matched:
-                        continue
+            start, cndn, increment = map(self._compiled_expression, self._separate(constructor, ';'))
+            body = self._compiled(body)
+            following = self._compile_following(expr, should_return)
+
+            def for_statement(local_vars, allow_recursion):
+                start(local_vars, allow_recursion)
+                while True:
+                    if not _js_ternary(cndn(local_vars, allow_recursion)):
+                        break
                     try:
-                        ret, should_abort = self.interpret_statement(stmt, local_vars, allow_recursion)
+                        ret, should_abort = body(local_vars, allow_recursion)
                         if should_abort:
-                            return ret
+                            return ret, True
                     except JS_Break:
                         break
-                if matched:
-                    break
+                    except JS_Continue:
+                        pass
+                    increment(local_vars, allow_recursion)
+                return following(local_vars, allow_recursion)
+            return for_statement
 
-        if md:
-            ret, should_abort = self.interpret_statement(expr, local_vars, allow_recursion)
-            return ret, should_abort or should_return
+        elif md.get('switch'):
+            switch_val, remaining = self._separate_at_paren(expr[m.end() - 1:])
+            switch_val = self._compiled_expression(switch_val)
+            body, expr = self._separate_at_paren(remaining, '}')
+            cases = []
+            for item in body.replace('default:', 'case default:').split('case ')[1:]:
+                case, case_stmt = (i.strip() for i in self._separate(item, ':', 1))
+                cases.append((
+                    case, None if case == 'default' else self._compiled_expression(case), self._compiled(case_stmt)))
+            following = self._compile_following(expr, should_return)
+
+            def switch_statement(local_vars, allow_recursion):
+                switch_value = switch_val(local_vars, allow_recursion)
+                for default in (False, True):
+                    matched = False
+                    for case, case_expr, case_stmt in cases:
+                        if default:
+                            matched = matched or case == 'default'
+                        elif not matched:
+                            matched = (case_expr is not None
+                                       and switch_value == case_expr(local_vars, allow_recursion))
+                        if not matched:
+                            continue
+                        try:
+                            ret, should_abort = case_stmt(local_vars, allow_recursion)
+                            if should_abort:
+                                return ret, True
+                        except JS_Break:
+                            break
+                    if matched:
+                        break
+                return following(local_vars, allow_recursion)
+            return switch_statement
 
         # Comma separated statements
         sub_expressions = list(self._separate(expr))
         if len(sub_expressions) > 1:
-            for sub_expr in sub_expressions:
-                ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
-                if should_abort:
-                    return ret, True
-            return ret, False
-
-        for m in re.finditer(rf'''(?x)
-                (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
-                (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''', expr):
-            var = m.group('var1') or m.group('var2')
-            start, end = m.span()
-            sign = m.group('pre_sign') or m.group('post_sign')
-            ret = local_vars[var]
-            local_vars[var] += 1 if sign[0] == '+' else -1
-            if m.group('pre_sign'):
+            compiled_subs = [self._compiled(sub_expr) for sub_expr in sub_expressions]
+
+            def comma(local_vars, allow_recursion):
+                for compiled_sub in compiled_subs:
+                    ret, should_abort = compiled_sub(local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+                return ret, False
+            return comma
+
+        increments, parts, last_end = [], [], 0
+        for m in _INCREMENT_RE.finditer(expr):
+            name = self._temp_name()
+            increments.append((
+                name, m.group('var1') or m.group('var2'),
+                1 if (m.group('pre_sign') or m.group('post_sign'))[0] == '+' else -1,
+                bool(m.group('pre_sign'))))
+            parts.extend((expr[last_end:m.start()], name))
+            last_end = m.end()
+        if not increments:
+            return self._compile_expression(expr, stmt, should_return)
+        expr = ''.join(parts) + expr[last_end:]
+        compiled = self._compile_expression(expr, stmt, should_return)
+
+        def increment(local_vars, allow_recursion):
+            local_vars = _TempNameSpace(local_vars)
+            for name, var, step, pre in increments:
                 ret = local_vars[var]
-            expr = expr[:start] + self._dump(ret, local_vars) + expr[end:]
+                local_vars[var] += step
+                local_vars.maps[0][name] = local_vars[var] if pre else ret
+            return compiled(local_vars, allow_recursion)
+        return increment
 
-        if not expr:
-            return None, should_return
-
-        m = re.match(fr'''(?x)
-            (?P<assign>
-                (?P<out>{_NAME_RE})(?:\[(?P<index>[^\]]+?)\])?\s*
-                (?P<op>{"|".join(map(re.escape, set(_OPERATORS) - _COMP_OPERATORS))})?
-                =(?!=)(?P<expr>.*)$
-            )|(?P<return>
-                (?!if|return|true|false|null|undefined|NaN)(?P<name>{_NAME_RE})$
-            )|(?P<indexing>
-                (?P<in>{_NAME_RE})\[(?P<idx>.+)\]$
-            )|(?P<attribute>
-                (?P<var>{_NAME_RE})(?:(?P<nullish>\?)?\.(?P<member>[^(]+)|\[(?P<member2>[^\]]+)\])\s*
-            )|(?P<function>
-                (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
-            )''', expr)
+    def _compile_following(self, expr, should_return):
+        compiled = self._compiled(expr)
+
+        def following(local_vars, allow_recursion):
+            ret, should_abort = compiled(local_vars, allow_recursion)
+            return ret, should_abort or should_return
+        return following
+
+    def _compile_operator(self, op, right_expr, expr):
+        """ @returns function(left_val, local_vars, allow_recursion) """
+        if op == '?':
+            if_true, if_false = map(self._compiled_expression, [*self._separate(right_expr, ':', 1), '', ''][:2])
+            return lambda left_val, *args: _js_ternary(left_val, if_true, if_false)(*args)
+
+        right = self._compiled_expression(right_expr)
+        if op in ('||', '&&'):
+            def short_circuit(left_val, local_vars, allow_recursion):
+                if (op == '&&') ^ _js_ternary(left_val):
+                    return left_val
+                return right(local_vars, allow_recursion)
+            return short_circuit
+        elif op == '??':
+            def nullish(left_val, local_vars, allow_recursion):
+                if left_val not in (None, JS_Undefined):
+                    return left_val
+                return right(local_vars, allow_recursion)
+            return nullish
+        elif not _OPERATORS.get(op):
+            return lambda left_val, *args: right(*args)
+
+        func = _OPERATORS[op]
+
+        def operation(left_val, local_vars, allow_recursion):
+            right_val = right(local_vars, allow_recursion)
+            try:
+                return func(left_val, right_val)
+            except Exception as e:
+                raise self.Exception(f'Failed to evaluate {left_val!r} {op} {right_val!r}', expr, cause=e)
+        return operation
+
+    def _compile_expression(self, expr, stmt, should_return):
+        m = _EXPRESSION_RE.match(expr)
         if m and m.group('assign'):
-            left_val = local_vars.get(m.group('out'))
-
-            if not m.group('index'):
-                local_vars[m.group('out')] = self._operator(
-                    m.group('op'), left_val, m.group('expr'), expr, local_vars, allow_recursion)
-                return local_vars[m.group('out')], should_return
-            elif left_val in (None, JS_Undefined):
-                raise self.Exception(f'Cannot index undefined variable {m.group("out")}', expr)
-
-            idx = self.interpret_expression(m.group('index'), local_vars, allow_recursion)
-            if not isinstance(idx, (int, float)):
-                raise self.Exception(f'List index {idx} must be integer', expr)
-            idx = int(idx)
-            left_val[idx] = self._operator(
-                m.group('op'), self._index(left_val, idx), m.group('expr'), expr, local_vars, allow_recursion)
-            return left_val[idx], should_return
+            out, index = m.group('out', 'index')
+            operation = self._compile_operator(m.group('op'), m.group('expr'), expr)
+
+            if not index:
+                def assign(local_vars, allow_recursion):
+                    local_vars[out] = operation(local_vars.get(out), local_vars, allow_recursion)
+                    return local_vars[out], should_return
+                return assign
+
+            index = self._compiled_expression(index)
+
+            def assign_index(local_vars, allow_recursion):
+                left_val = local_vars.get(out)
+                if left_val in (None, JS_Undefined):
+                    raise self.Exception(f'Cannot index undefined variable {out}', expr)
+                idx = index(local_vars, allow_recursion)
+                if not isinstance(idx, (int, float)):
+                    raise self.Exception(f'List index {idx} must be integer', expr)
+                idx = int(idx)
+                left_val[idx] = operation(self._index(left_val, idx), local_vars, allow_recursion)
+                return left_val[idx], should_return
+            return assign_index
 
         elif expr.isdigit():
-            return int(expr), should_return
+            return _constant(int(expr), should_return)
 
         elif expr == 'break':
-            raise JS_Break
+            return _raiser(JS_Break)
         elif expr == 'continue':
-            raise JS_Continue
+            return _raiser(JS_Continue)
         elif expr == 'undefined':
-            return JS_Undefined, should_return
+            return _constant(JS_Undefined, should_return)
         elif expr == 'NaN':
-            return float('NaN'), should_return
+            return lambda *_: (float('NaN'), should_return)
 
         elif m and m.group('return'):
-            return local_vars.get(m.group('name'), JS_Undefined), should_return
+            name = m.group('name')
+            return lambda local_vars, _: (local_vars.get(name, JS_Undefined), should_return)
 
         with contextlib.suppress(ValueError):
-            return json.loads(js_to_json(expr, strict=True)), should_return
+            json_expr = js_to_json(expr, strict=True)
+            value = json.loads(json_expr)
+            if not isinstance(value, (list, dict)):
+                return _constant(value, should_return)
+            return lambda *_: (json.loads(json_expr), should_return)
 
         if m and m.group('indexing'):
-            val = local_vars[m.group('in')]
-            idx = self.interpret_expression(m.group('idx'), local_vars, allow_recursion)
-            return self._index(val, idx), should_return
+            var, idx = m.group('in'), self._compiled_expression(m.group('idx'))
+            return lambda local_vars, allow_recursion: (
+                self._index(local_vars[var], idx(local_vars, allow_recursion)), should_return)
 
         for op in _OPERATORS:
             separated = list(self._separate(expr, op))
@@ -617,174 +815,185 @@ def dict_item(key, val):
                     right_expr = f'{separated.pop()}{op}{right_expr}'
             if not separated:
                 continue
-            left_val = self.interpret_expression(op.join(separated), local_vars, allow_recursion)
-            return self._operator(op, left_val, right_expr, expr, local_vars, allow_recursion), should_return
+            left, operation = self._compiled_expression(op.join(separated)), self._compile_operator(op, right_expr, expr)
+            return lambda local_vars, allow_recursion: (
+                operation(left(local_vars, allow_recursion), local_vars, allow_recursion), should_return)
 
         if m and m.group('attribute'):
-            variable, member, nullish = m.group('var', 'member', 'nullish')
-            if not member:
-                member = self.interpret_expression(m.group('member2'), local_vars, allow_recursion)
-            arg_str = expr[m.end():]
-            if arg_str.startswith('('):
-                arg_str, remaining = self._separate_at_paren(arg_str)
-            else:
-                arg_str, remaining = None, arg_str
+            return self._compile_attribute(m, expr, should_return)
+
+        elif m and m.group('function'):
+            fname = m.group('fname')
+            args = [self._compiled_expression(v) for v in self._separate(m.group('args'))]
+
+            def call(local_vars, allow_recursion):
+                argvals = [arg(local_vars, allow_recursion) for arg in args]
+                if fname in local_vars:
+                    return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
+                elif fname not in self._functions:
+                    self._functions[fname] = self.extract_function(fname)
+                return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
+            return call
+
+        raise self.Exception(
+            f'Unsupported JS expression {truncate_string(expr, 20, 20) if expr != stmt else ""}', stmt)
+
+    def _compile_attribute(self, m, expr, should_return):
+        variable, member, nullish = m.group('var', 'member', 'nullish')
+        member_expr = None if member else self._compiled_expression(m.group('member2'))
+        arg_str = expr[m.end():]
+        if arg_str.startswith('('):
+            arg_str, remaining = self._separate_at_paren(arg_str)
+        else:
+            arg_str, remaining = None, arg_str
+        args = None if arg_str is None else [self._compiled_expression(v) for v in self._separate(arg_str)]
+
+        def eval_method(local_vars, allow_recursion):
+            member_ = member if member_expr is None else member_expr(local_vars, allow_recursion)
 
             def assertion(cndn, msg):
                 """ assert, but without risk of getting optimized out """
                 if not cndn:
-                    raise self.Exception(f'{member} {msg}', expr)
+                    raise self.Exception(f'{member_} {msg}', expr)
 
-            def eval_method():
-                nonlocal member
-
-                if (variable, member) == ('console', 'debug'):
-                    if Debugger.ENABLED:
-                        Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
-                    return
+            if (variable, member_) == ('console', 'debug'):
+                if Debugger.ENABLED:
+                    Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
+                return
 
-                types = {
-                    'String': str,
-                    'Math': float,
-                    'Array': list,
-                }
-                obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
-                if obj is NO_DEFAULT:
-                    if variable not in self._objects:
-                        try:
-                            self._objects[variable] = self.extract_object(variable)
-                        except self.Exception:
-                            if not nullish:
-                                raise
-                    obj = self._objects.get(variable, JS_Undefined)
-
-                if nullish and obj is JS_Undefined:
-                    return JS_Undefined
-
-                # Member access
-                if arg_str is None:
-                    return self._index(obj, member, nullish)
-
-                # Function call
-                argvals = [
-                    self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in self._separate(arg_str)]
-
-                # Fixup prototype call
-                if isinstance(obj, type) and member.startswith('prototype.'):
-                    new_member, _, func_prototype = member.partition('.')[2].partition('.')
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
-                    if func_prototype == 'call':
-                        obj, *argvals = argvals
-                    elif func_prototype == 'apply':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        obj, argvals = argvals
-                        assertion(isinstance(argvals, list), 'second argument needs to be a list')
-                    else:
-                        raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
-                    member = new_member
-
-                if obj is str:
-                    if member == 'fromCharCode':
-                        assertion(argvals, 'takes one or more arguments')
-                        return ''.join(map(chr, argvals))
-                    raise self.Exception(f'Unsupported String method {member}', expr)
-                elif obj is float:
-                    if member == 'pow':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        return argvals[0] ** argvals[1]
-                    raise self.Exception(f'Unsupported Math method {member}', expr)
-
-                if member == 'split':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) == 1, 'with limit argument is not implemented')
-                    return obj.split(argvals[0]) if argvals[0] else list(obj)
-                elif member == 'join':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    return argvals[0].join(obj)
-                elif member == 'reverse':
-                    assertion(not argvals, 'does not take any arguments')
-                    obj.reverse()
-                    return obj
-                elif member == 'slice':
-                    assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
-                    assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
-                    return obj[slice(*argvals, None)]
-                elif member == 'splice':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    index, how_many = map(int, ([*argvals, len(obj)])[:2])
-                    if index < 0:
-                        index += len(obj)
-                    add_items = argvals[2:]
-                    res = []
-                    for _ in range(index, min(index + how_many, len(obj))):
-                        res.append(obj.pop(index))
-                    for i, item in enumerate(add_items):
-                        obj.insert(index + i, item)
-                    return res
-                elif member == 'unshift':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    for item in reversed(argvals):
-                        obj.insert(0, item)
-                    return obj
-                elif member == 'pop':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(not argvals, 'does not take any arguments')
-                    if not obj:
-                        return
-                    return obj.pop()
-                elif member == 'push':
-                    assertion(argvals, 'takes one or more arguments')
-                    obj.extend(argvals)
-                    return obj
-                elif member == 'forEach':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    f, this = ([*argvals, ''])[:2]
-                    return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
-                elif member == 'indexOf':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    idx, start = ([*argvals, 0])[:2]
+            types = {
+                'String': str,
+                'Math': float,
+                'Array': list,
+            }
+            obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
+            if obj is NO_DEFAULT:
+                if variable not in self._objects:
                     try:
-                        return obj.index(idx, start)
-                    except ValueError:
-                        return -1
-                elif member == 'charCodeAt':
-                    assertion(isinstance(obj, str), 'must be applied on a string')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    idx = argvals[0] if isinstance(argvals[0], int) else 0
-                    if idx >= len(obj):
-                        return None
-                    return ord(obj[idx])
-
-                idx = int(member) if isinstance(obj, list) else member
-                return obj[idx](argvals, allow_recursion=allow_recursion)
-
-            if remaining:
-                ret, should_abort = self.interpret_statement(
-                    self._named_object(local_vars, eval_method()) + remaining,
-                    local_vars, allow_recursion)
-                return ret, should_return or should_abort
-            else:
-                return eval_method(), should_return
+                        self._objects[variable] = self.extract_object(variable)
+                    except self.Exception:
+                        if not nullish:
+                            raise
+                obj = self._objects.get(variable, JS_Undefined)
 
-        elif m and m.group('function'):
-            fname = m.group('fname')
-            argvals = [self.interpret_expression(v, local_vars, allow_recursion)
-                       for v in self._separate(m.group('args'))]
-            if fname in local_vars:
-                return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
-            elif fname not in self._functions:
-                self._functions[fname] = self.extract_function(fname)
-            return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
+            if nullish and obj is JS_Undefined:
+                return JS_Undefined
 
-        raise self.Exception(
-            f'Unsupported JS expression {truncate_string(expr, 20, 20) if expr != stmt else ""}', stmt)
+            # Member access
+            if args is None:
+                return self._index(obj, member_, nullish)
+
+            # Function call
+            argvals = [arg(local_vars, allow_recursion) for arg in args]
+
+            # Fixup prototype call
+            if isinstance(obj, type) and member_.startswith('prototype.'):
+                new_member, _, func_prototype = member_.partition('.')[2].partition('.')
+                assertion(argvals, 'takes one or more arguments')
+                assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
+                if func_prototype == 'call':
+                    obj, *argvals = argvals
+                elif func_prototype == 'apply':
+                    assertion(len(argvals) == 2, 'takes two arguments')
+                    obj, argvals = argvals
+                    assertion(isinstance(argvals, list), 'second argument needs to be a list')
+                else:
+                    raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
+                member_ = new_member
+
+            if obj is str:
+                if member_ == 'fromCharCode':
+                    assertion(argvals, 'takes one or more arguments')
+                    return ''.join(map(chr, argvals))
+                raise self.Exception(f'Unsupported String method {member_}', expr)
+            elif obj is float:
+                if member_ == 'pow':
+                    assertion(len(argvals) == 2, 'takes two arguments')
+                    return argvals[0] ** argvals[1]
+                raise self.Exception(f'Unsupported Math method {member_}', expr)
+
+            if member_ == 'split':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) == 1, 'with limit argument is not implemented')
+                return obj.split(argvals[0]) if argvals[0] else list(obj)
+            elif member_ == 'join':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(len(argvals) == 1, 'takes exactly one argument')
+                return argvals[0].join(obj)
+            elif member_ == 'reverse':
+                assertion(not argvals, 'does not take any arguments')
+                obj.reverse()
+                return obj
+            elif member_ == 'slice':
+                assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
+                assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
+                return obj[slice(*argvals, None)]
+            elif member_ == 'splice':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(argvals, 'takes one or more arguments')
+                index, how_many = map(int, ([*argvals, len(obj)])[:2])
+                if index < 0:
+                    index += len(obj)
+                add_items = argvals[2:]
+                res = []
+                for _ in range(index, min(index + how_many, len(obj))):
+                    res.append(obj.pop(index))
+                for i, item in enumerate(add_items):
+                    obj.insert(index + i, item)
+                return res
+            elif member_ == 'unshift':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(argvals, 'takes one or more arguments')
+                for item in reversed(argvals):
+                    obj.insert(0, item)
+                return obj
+            elif member_ == 'pop':
+                assertion(isinstance(obj, list), 'must be applied on a list')
+                assertion(not argvals, 'does not take any arguments')
+                if not obj:
+                    return
+                return obj.pop()
+            elif member_ == 'push':
+                assertion(argvals, 'takes one or more arguments')
+                obj.extend(argvals)
+                return obj
+            elif member_ == 'forEach':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+                f, this = ([*argvals, ''])[:2]
+                return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
+            elif member_ == 'indexOf':
+                assertion(argvals, 'takes one or more arguments')
+                assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+                idx, start = ([*argvals, 0])[:2]
+                try:
+                    return obj.index(idx, start)
+                except ValueError:
+                    return -1
+            elif member_ == 'charCodeAt':
+                assertion(isinstance(obj, str), 'must be applied on a string')
+                assertion(len(argvals) == 1, 'takes exactly one argument')
+                idx = argvals[0] if isinstance(argvals[0], int) else 0
+                if idx >= len(obj):
+                    return None
+                return ord(obj[idx])
+
+            idx = int(member_) if isinstance(obj, list) else member_
+            return obj[idx](argvals, allow_recursion=allow_recursion)
+
+        if not remaining:
+            return lambda local_vars, allow_recursion: (eval_method(local_vars, allow_recursion), should_return)
+
+        name = self._temp_name()
+        compiled_remaining = self._compiled(name + remaining)
+
+        def attribute(local_vars, allow_recursion):
+            value = eval_method(local_vars, allow_recursion)
+            local_vars = _TempNameSpace(local_vars)
+            local_vars.maps[0][name] = value
+            ret, should_abort = compiled_remaining(local_vars, allow_recursion)
+            return ret, should_return or should_abort
+        return attribute
 
     def interpret_expression(self, expr, local_vars, allow_recursion):
         ret, should_return = self.interpret_statement(expr, local_vars, allow_recursion)
@@ -792,6 +1001,7 @@ def interpret_expression(self, expr, local_vars, allow_recursion):
             raise self.Exception('Cannot return from an expression', expr)
         return ret
 
+    @profiled('jsinterp')
     def extract_object(self, objname):
         _FUNC_NAME_RE = r'''(?:[a-zA-Z$0-9]+|"[a-zA-Z$0-9]+"|'[a-zA-Z$0-9]+')'''
         obj = {}
@@ -818,6 +1028,7 @@ def extract_object(self, objname):
 
         return obj
 
+    @profiled('jsinterp')
     def extract_function_code(self, funcname):
         """ @returns argnames, code """
         func_m = re.search(
@@ -840,6 +1051,7 @@ def extract_function(self, funcname):
             self.extract_function_from_code(*self.extract_function_code(funcname)),
             f'F<{funcname}>')
 
+    @profiled('jsinterp')
     def extract_function_from_code(self, argnames, code, *global_stack):
         local_vars = {}
         while True:
@@ -860,12 +1072,14 @@ def call_function(self, funcname, *args):
     def build_function(self, argnames, code, *global_stack):
         global_stack = list(global_stack) or [{}]
         argnames = tuple(argnames)
+        code = code.replace('\n', ' ')
 
+        @profiled('jsinterp')
         def resf(args, kwargs={}, allow_recursion=100):
             global_stack[0].update(itertools.zip_longest(argnames, args, fillvalue=None))
             global_stack[0].update(kwargs)
             var_stack = LocalNameSpace(*global_stack)
-            ret, should_abort = self.interpret_statement(code.replace('\n', ' '), var_stack, allow_recursion - 1)
+            ret, should_abort = self._compiled(code)(var_stack, allow_recursion - 1)
             if should_abort:
                 return ret
         return resf
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import contextlib
+import contextvars
 import functools
 import os
 import socket
 import ssl
 import sys
+import time
 import typing
 import urllib.parse
 import urllib.request
@@ -21,6 +23,32 @@
     from ..utils.networking import HTTPHeaderDict
 
 
+# Timings of the request currently being sent. See networking/metrics.py
+_current_timings: contextvars.ContextVar[dict | None] = contextvars.ContextVar('_current_timings', default=None)
+
+
+def add_timing(name, start):
+    """Add the time elapsed since `start` (from time.perf_counter) to the timings of the current request"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0) + time.perf_counter() - start
+
+
+def timed_tls_connect(connect):
+    """Call `connect`, counting the time not spent on DNS and TCP connect as TLS handshake time"""
+    timings = _current_timings.get()
+    if timings is None:
+        return connect()
+    socket_time = timings.get('dns', 0) + timings.get('connect', 0)
+    start = time.perf_counter()
+    try:
+        return connect()
+    finally:
+        elapsed = time.perf_counter() - start
+        socket_time = timings.get('dns', 0) + timings.get('connect', 0) - socket_time
+        timings['tls'] = timings.get('tls', 0) + max(elapsed - socket_time, 0)
+
+
 def ssl_load_certs(context: ssl.SSLContext, use_certifi=True):
     if certifi and use_certifi:
         context.load_verify_locations(cafile=certifi.where())
@@ -257,7 +285,9 @@ def create_connection(
     # This filters the addresses based on the given source_address.
     # Based on: https://github.com/python/cpython/blob/main/Lib/socket.py#L810
     host, port = address
+    start = time.perf_counter()
     ip_addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    add_timing('dns', start)
     if not ip_addrs:
         raise OSError('getaddrinfo returns an empty list')
     if source_address is not None:
@@ -269,6 +299,7 @@ def create_connection(
                 f'Can\'t use "{source_address[0]}" as source address')
 
     err = None
+    start = time.perf_counter()
     for ip_addr in ip_addrs:
         try:
             sock = _create_socket_func(ip_addr, timeout, source_address)
@@ -278,6 +309,9 @@ def create_connection(
             return sock
         except OSError as e:
             err = e
+        finally:
+            add_timing('connect', start)
+            start = time.perf_counter()
 
     try:
         raise err
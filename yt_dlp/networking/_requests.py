@@ -380,12 +380,20 @@ def __init__(self, _socks_options, *args, **kwargs):  # must use _socks_options
 
     def _new_conn(self):
         try:
-            return create_connection(
+            sock = create_connection(
                 address=(self._proxy_args['addr'], self._proxy_args['port']),
                 timeout=self.timeout,
                 source_address=self.source_address,
                 _create_socket_func=functools.partial(
                     create_socks_proxy_socket, (self.host, self.port), self._proxy_args))
+            # Tunnels are kept alive in the SocksProxyManager pools like direct connections,
+            # so they need the same socket options (e.g. TCP_NODELAY) urllib3 sets on those
+            try:
+                for opt in self.socket_options or ():
+                    sock.setsockopt(*opt)
+            except OSError:
+                sock.close()
+                raise
         except (socket.timeout, TimeoutError) as e:
             raise urllib3.exceptions.ConnectTimeoutError(
                 self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})') from e
@@ -394,6 +402,7 @@ def _new_conn(self):
         except OSError as e:
             raise urllib3.exceptions.NewConnectionError(
                 self, f'Failed to establish a new connection: {e}') from e
+        return sock
 
 
 class SocksHTTPSConnection(SocksHTTPConnection, urllib3.connection.HTTPSConnection):
@@ -27,6 +27,7 @@
     get_redirect_method,
     make_socks_proxy_opts,
     select_proxy,
+    timed_tls_connect,
 )
 from .common import Features, RequestHandler, Response, register_rh
 from .exceptions import (
@@ -38,7 +39,7 @@
     SSLError,
     TransportError,
 )
-from ..dependencies import brotli
+from ..dependencies import brotli, zstandard
 from ..socks import ProxyError as SocksProxyError
 from ..utils import update_url_query
 from ..utils.networking import normalize_url
@@ -50,6 +51,145 @@
     SUPPORTED_ENCODINGS.append('br')
     CONTENT_DECODE_ERRORS.append(brotli.error)
 
+if zstandard:
+    SUPPORTED_ENCODINGS.append('zstd')
+    CONTENT_DECODE_ERRORS.append(zstandard.ZstdError)
+
+DECODE_CHUNK_SIZE = 64 * 1024
+
+
+def _check_complete(complete, error=zlib.error):
+    # A truncated body must not be mistaken for a complete one
+    if not complete:
+        raise error('incomplete or truncated stream')
+
+
+class _DeflateDecoder:
+    # Some servers send zlib-wrapped data instead of raw deflate
+    def __init__(self):
+        self._decompressor = None
+
+    def decompress(self, data):
+        if self._decompressor is None:
+            if not data:
+                return data
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            try:
+                return self._decompressor.decompress(data)
+            except zlib.error:
+                self._decompressor = zlib.decompressobj()
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        if not self._decompressor:
+            return b''
+        data = self._decompressor.flush()
+        _check_complete(self._decompressor.eof)
+        return data
+
+
+class _GzipDecoder:
+    # There may be junk added the end of the file
+    # We ignore it by only ever decoding a single gzip payload
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        self._started = False
+
+    def decompress(self, data):
+        if self._decompressor.eof:
+            return b''
+        self._started = self._started or bool(data)
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        if not self._started:
+            return b''
+        data = self._decompressor.flush()
+        _check_complete(self._decompressor.eof)
+        return data
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._decompressor = brotli.Decompressor()
+        # brotli has `process`, brotlicffi has `decompress`
+        self._process = getattr(self._decompressor, 'process', None) or self._decompressor.decompress
+        self._started = False
+
+    def decompress(self, data):
+        if not data:
+            return b''
+        self._started = True
+        return self._process(data)
+
+    def flush(self):
+        if self._started:
+            _check_complete(self._decompressor.is_finished(), brotli.error)
+        return b''
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self._started = False
+
+    def decompress(self, data):
+        if not data:
+            return b''
+        self._started = True
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        if self._started:
+            _check_complete(self._decompressor.eof, zstandard.ZstdError)
+        return b''
+
+
+class ContentDecodingReader(io.RawIOBase):
+    """
+    Incrementally decodes a response body with the given content decoders
+
+    Data is pulled from the underlying response only as it is requested,
+    so the compressed body is never held in memory as a whole.
+    """
+
+    def __init__(self, fp, decoders):
+        self._fp = fp
+        self._decoders = decoders
+        self._buffer = bytearray()
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _decode(self, data):
+        for decoder in self._decoders:
+            data = decoder.decompress(data)
+        return data
+
+    def _flush(self):
+        data = b''
+        for decoder in self._decoders:
+            data = decoder.decompress(data) + decoder.flush()
+        return data
+
+    def readinto(self, b):
+        while not self._buffer and not self._eof:
+            chunk = self._fp.read(DECODE_CHUNK_SIZE)
+            if chunk:
+                self._buffer += self._decode(chunk)
+            else:
+                self._buffer += self._flush()
+                self._eof = True
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+    def close(self):
+        self._fp.close()
+        super().close()
+
 
 def _create_http_connection(http_class, source_address, *args, **kwargs):
     hc = http_class(*args, **kwargs)
@@ -57,6 +197,9 @@ def _create_http_connection(http_class, source_address, *args, **kwargs):
     if hasattr(hc, '_create_connection'):
         hc._create_connection = create_connection
 
+    if isinstance(hc, http.client.HTTPSConnection):
+        hc.connect = functools.partial(timed_tls_connect, hc.connect)
+
     if source_address is not None:
         hc.source_address = (source_address, 0)
 
@@ -103,6 +246,15 @@ def https_open(self, req):
                 _create_http_connection, conn_class, self._source_address),
             req, context=self._context)
 
+    CONTENT_DECODERS = {
+        'gzip': _GzipDecoder,
+        'deflate': _DeflateDecoder,
+        'br': brotli and _BrotliDecoder,
+        'zstd': zstandard and _ZstdDecoder,
+    }
+
+    # The following decode a whole body at once and are only kept for compatibility.
+    # Responses are decoded incrementally by ContentDecodingReader
     @staticmethod
     def deflate(data):
         if not data:
@@ -150,17 +302,16 @@ def http_response(self, req, resp):
         # Content-Encoding header lists the encodings in order that they were applied [1].
         # To decompress, we simply do the reverse.
         # [1]: https://datatracker.ietf.org/doc/html/rfc9110#name-content-encoding
-        decoded_response = None
+        decoders = []
         for encoding in (e.strip() for e in reversed(resp.headers.get('Content-encoding', '').split(','))):
-            if encoding == 'gzip':
-                decoded_response = self.gz(decoded_response or resp.read())
-            elif encoding == 'deflate':
-                decoded_response = self.deflate(decoded_response or resp.read())
-            elif encoding == 'br' and brotli:
-                decoded_response = self.brotli(decoded_response or resp.read())
-
-        if decoded_response is not None:
-            resp = urllib.request.addinfourl(io.BytesIO(decoded_response), old_resp.headers, old_resp.url, old_resp.code)
+            decoder = self.CONTENT_DECODERS.get(encoding)
+            if decoder:
+                decoders.append(decoder())
+
+        if decoders:
+            resp = urllib.request.addinfourl(
+                io.BufferedReader(ContentDecodingReader(resp, decoders), DECODE_CHUNK_SIZE),
+                old_resp.headers, old_resp.url, old_resp.code)
             resp.msg = old_resp.msg
         # Percent-encode redirect URL of Location HTTP header to satisfy RFC 3986 (see
         # https://github.com/ytdl-org/youtube-dl/issues/6457).
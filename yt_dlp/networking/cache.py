@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+from .common import Request, Response
+from .exceptions import HTTPError
+from ..utils import int_or_none
+
+# Headers describing the transfer rather than the stored representation
+_UNCACHED_HEADERS = {'set-cookie', 'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives = {}
+    for directive in (value or '').split(','):
+        name, sep, arg = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if sep else None
+    return directives
+
+
+def _parse_http_date(value):
+    with contextlib.suppress(TypeError, ValueError, IndexError):
+        return email.utils.parsedate_to_datetime(value).timestamp()
+
+
+class HTTPCache:
+    """
+    On-disk HTTP response cache for requests marked with the `cacheable` extension.
+
+    Only GET requests are cached. Responses are stored following private cache semantics
+    of RFC 9111 and served without touching the network while fresh.
+    Stale entries with an ETag or Last-Modified validator are revalidated with a
+    conditional request (If-None-Match/If-Modified-Since) and reused on a 304.
+    Least recently used entries are evicted once the total size exceeds `max_size`.
+
+    The cache status is reported in the `cache_status` response extension:
+    one of "hit", "revalidated" or "miss".
+
+    @param path: Directory to store the cache entries in.
+    @param max_size: Maximum total size of the cache in bytes.
+    @param max_entry_size: Responses larger than this are not stored. Defaults to a tenth of max_size.
+    """
+
+    CACHEABLE_STATUSES = (200, 203)
+    VERSION = 1
+
+    def __init__(self, path: str, max_size: int = 100 * 1024 * 1024, max_entry_size: int | None = None, *, clock=time.time):
+        self.path = path
+        self.max_size = max_size
+        self.max_entry_size = max_entry_size or max_size // 10
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index: dict[str, list[float]] | None = None  # key: [size, last access]
+
+    def _key(self, request: Request):
+        return hashlib.sha256(f'{request.method} {request.url}'.encode()).hexdigest()
+
+    def _filename(self, key):
+        return os.path.join(self.path, f'{key}.cache')
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        with contextlib.suppress(OSError), os.scandir(self.path) as it:
+            for entry in it:
+                key, ext = os.path.splitext(entry.name)
+                if ext != '.cache':
+                    continue
+                with contextlib.suppress(OSError):
+                    stat = entry.stat()
+                    self._index[key] = [stat.st_size, stat.st_mtime]
+        return self._index
+
+    def _read(self, key):
+        try:
+            with open(self._filename(key), 'rb') as f:
+                meta = json.loads(f.readline())
+                if meta.get('version') != self.VERSION:
+                    return None, None
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _write(self, key, meta, body):
+        fn = self._filename(key)
+        tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.part'
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps({**meta, 'version': self.VERSION}).encode())
+                f.write(b'\n')
+                f.write(body)
+            os.replace(tmp, fn)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            return
+        with self._lock:
+            self._load_index()[key] = [os.path.getsize(fn), self._clock()]
+            self._evict()
+
+    def _touch(self, key):
+        now = self._clock()
+        with contextlib.suppress(OSError):
+            os.utime(self._filename(key), (now, now))
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry:
+                entry[1] = now
+
+    def _evict(self):
+        index = self._load_index()
+        total = sum(size for size, _ in index.values())
+        for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(self._filename(key))
+            del index[key]
+            total -= size
+
+    def remove(self, request: Request):
+        self._remove(self._key(request))
+
+    def _remove(self, key):
+        with contextlib.suppress(OSError):
+            os.remove(self._filename(key))
+        with self._lock:
+            self._load_index().pop(key, None)
+
+    def _freshness_lifetime(self, headers, now):
+        cache_control = parse_cache_control(headers.get('cache-control'))
+        if 'no-cache' in cache_control:
+            return 0
+        max_age = int_or_none(cache_control.get('max-age'))
+        if max_age is not None:
+            return max_age
+        date = _parse_http_date(headers.get('date')) or now
+        expires = headers.get('expires')
+        if expires is not None:
+            return (_parse_http_date(expires) or 0) - date
+        last_modified = _parse_http_date(headers.get('last-modified'))
+        if last_modified:
+            # https://www.rfc-editor.org/rfc/rfc9111#section-4.2.2
+            return max(date - last_modified, 0) / 10
+        return 0
+
+    def _is_fresh(self, meta, now):
+        age = now - meta['stored_at'] + (int_or_none(meta['headers'].get('age')) or 0)
+        return age < self._freshness_lifetime(meta['headers'], meta['stored_at'])
+
+    def _is_storable(self, response, headers, body):
+        if response.status not in self.CACHEABLE_STATUSES or len(body) > self.max_entry_size:
+            return False
+        if 'no-store' in parse_cache_control(headers.get('cache-control')):
+            return False
+        return bool(
+            self._freshness_lifetime(headers, self._clock()) > 0
+            or headers.get('etag') or headers.get('last-modified'))
+
+    @staticmethod
+    def _stored_headers(response):
+        headers = {}
+        for name, value in response.headers.items():
+            name = name.lower()
+            if name not in _UNCACHED_HEADERS:
+                headers[name] = f'{headers[name]}, {value}' if name in headers else value
+        return headers
+
+    def _make_response(self, meta, body, cache_status):
+        response = Response(
+            fp=io.BytesIO(body), url=meta['url'], status=meta['status'], reason=meta.get('reason'),
+            headers={**meta['headers'], 'content-length': str(len(body))})
+        response.extensions['cache_status'] = cache_status
+        return response
+
+    def _store(self, key, response, body):
+        headers = self._stored_headers(response)
+        if not self._is_storable(response, headers, body):
+            self._remove(key)
+            return
+        self._write(key, {
+            'url': response.url,
+            'status': response.status,
+            'reason': response.reason,
+            'headers': headers,
+            'stored_at': self._clock(),
+        }, body)
+
+    def send(self, request: Request, send_func) -> Response:
+        """Serve `request` from the cache, using `send_func` to reach the network if needed"""
+        request_cache_control = parse_cache_control(request.headers.get('Cache-Control'))
+        if request.method != 'GET' or 'no-store' in request_cache_control:
+            return send_func(request)
+
+        key = self._key(request)
+        meta, body = self._read(key)
+        if meta and 'no-cache' not in request_cache_control and self._is_fresh(meta, self._clock()):
+            self._touch(key)
+            return self._make_response(meta, body, 'hit')
+
+        conditional_request = request
+        if meta:
+            conditional_request = request.copy()
+            etag, last_modified = meta['headers'].get('etag'), meta['headers'].get('last-modified')
+            if etag and 'If-None-Match' not in request.headers:
+                conditional_request.headers['If-None-Match'] = etag
+            if last_modified and 'If-Modified-Since' not in request.headers:
+                conditional_request.headers['If-Modified-Since'] = last_modified
+
+        try:
+            response = send_func(conditional_request)
+        except HTTPError as e:
+            if not meta or e.status != 304:
+                raise
+            e.close()
+            meta['headers'].update(
+                (name, value) for name, value in self._stored_headers(e.response).items()
+                if name not in ('content-type', 'content-length'))
+            meta['stored_at'] = self._clock()
+            self._write(key, meta, body)
+            return self._make_response(meta, body, 'revalidated')
+
+        try:
+            new_body = response.read()
+        finally:
+            response.fp.close()
+        self._store(key, response, new_body)
+        response.fp = io.BytesIO(new_body)
+        response.extensions['cache_status'] = 'miss'
+        return response
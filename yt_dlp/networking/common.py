@@ -15,11 +15,13 @@
 
 from ._helper import make_ssl_context, wrap_request_errors
 from .exceptions import (
+    HTTPError,
     NoSupportingHandlers,
     RequestError,
     TransportError,
     UnsupportedRequest,
 )
+from .metrics import RequestMetrics
 from ..compat.types import NoneType
 from ..cookies import YoutubeDLCookieJar
 from ..utils import (
@@ -57,6 +59,20 @@ class RequestDirector:
     can be registered into the `preferences` set. These are used to sort handlers
     in order of preference.
 
+    A RateLimiter (see networking/ratelimit.py) may be assigned to `rate_limiter`
+    to throttle requests and response bodies before they reach the handlers.
+    The time a request spent waiting for it is reported in the `queue_time` response extension.
+
+    An HTTPCache (see networking/cache.py) may be assigned to `http_cache`
+    to serve requests with the `cacheable` extension set from disk.
+
+    Every response carries the time spent in each phase of the request in the `timings`
+    response extension (see networking/metrics.py). If a NetworkMetrics instance is assigned
+    to `metrics`, these are also aggregated there. The `extractor` request extension
+    may be used to attribute a request to an extractor.
+
+    The `cacheable` and `extractor` extensions are handled here and never passed on to the handlers.
+
     @param logger: Logger instance.
     @param verbose: Print debug request information to stdout.
     """
@@ -64,6 +80,9 @@ class RequestDirector:
     def __init__(self, logger, verbose=False):
         self.handlers: dict[str, RequestHandler] = {}
         self.preferences: set[Preference] = set()
+        self.rate_limiter: RateLimiter | None = None
+        self.http_cache: HTTPCache | None = None
+        self.metrics: NetworkMetrics | None = None
         self.logger = logger  # TODO(Grub4k): default logger
         self.verbose = verbose
 
@@ -91,6 +110,8 @@ def _print_verbose(self, msg):
         if self.verbose:
             self.logger.stdout(f'director: {msg}')
 
+    _DIRECTOR_EXTENSIONS = ('cacheable', 'extractor')
+
     def send(self, request: Request) -> Response:
         """
         Passes a request onto a suitable RequestHandler
@@ -100,6 +121,25 @@ def send(self, request: Request) -> Response:
 
         assert isinstance(request, Request)
 
+        director_extensions = {}
+        if any(extension in request.extensions for extension in self._DIRECTOR_EXTENSIONS):
+            request = request.copy()
+            for extension in self._DIRECTOR_EXTENSIONS:
+                director_extensions[extension] = request.extensions.pop(extension, None)
+        send = functools.partial(self._send, extractor=director_extensions.get('extractor'))
+
+        if director_extensions.get('cacheable') and self.http_cache:
+            response = self.http_cache.send(request, send)
+            self._print_verbose(f'HTTP cache status: {response.extensions.get("cache_status", "bypass")}')
+            return response
+
+        return send(request)
+
+    def _send(self, request: Request, extractor=None) -> Response:
+        queue_time = self.rate_limiter.acquire(request) if self.rate_limiter else 0
+        if queue_time:
+            self._print_verbose(f'Request was held back {queue_time:.2f}s by the rate limiter')
+
         unexpected_errors = []
         unsupported_errors = []
         for handler in self._get_handlers(request):
@@ -113,9 +153,17 @@ def send(self, request: Request) -> Response:
                 continue
 
             self._print_verbose(f'Sending request via "{handler.RH_NAME}"')
+            request_metrics = RequestMetrics(request, handler.RH_NAME, extractor, self.metrics)
             try:
-                response = handler.send(request)
-            except RequestError:
+                with request_metrics:
+                    response = handler.send(request)
+            except HTTPError as e:
+                request_metrics.attach(e.response)
+                if self.rate_limiter:
+                    self._handle_rate_limited(request, e.response)
+                raise
+            except RequestError as e:
+                request_metrics.finish(error=e)
                 raise
             except Exception as e:
                 self.logger.error(
@@ -125,10 +173,20 @@ def send(self, request: Request) -> Response:
                 continue
 
             assert isinstance(response, Response)
+            request_metrics.attach(response)
+            if self.rate_limiter:
+                self._handle_rate_limited(request, response)
+                response.extensions['queue_time'] = queue_time
+                self.rate_limiter.wrap_response(request, response)
             return response
 
         raise NoSupportingHandlers(unsupported_errors, unexpected_errors)
 
+    def _handle_rate_limited(self, request, response):
+        delay = self.rate_limiter.handle_response(request, response)
+        if delay:
+            self._print_verbose(f'Received HTTP {response.status}; holding back requests for {delay:.2f}s')
+
 
 _REQUEST_HANDLERS = {}
 
@@ -578,6 +636,10 @@ def getheader(self, name, default=None):
 
 
 if typing.TYPE_CHECKING:
+    from .cache import HTTPCache
+    from .metrics import NetworkMetrics
+    from .ratelimit import RateLimiter
+
     RequestData = bytes | Iterable[bytes] | typing.IO | None
     Preference = typing.Callable[[RequestHandler, Request], int]
 
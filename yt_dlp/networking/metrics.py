@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing
+import urllib.parse
+
+from ._helper import _current_timings
+
+if typing.TYPE_CHECKING:
+    from .common import Request, Response
+
+TIMINGS = ('dns', 'connect', 'tls', 'ttfb', 'total')
+
+
+class NetworkMetrics:
+    """
+    Aggregates request timings and byte counts per host, request handler and extractor.
+
+    A record is made once a response body has been fully read or the response is closed,
+    or when a request fails without a response. Each record is a dict with the following keys:
+    - `url`, `host`, `handler`, `extractor` (None if not made by an extractor)
+    - `status`: HTTP status code, or None if the request failed
+    - `error`: error message if the request failed
+    - `bytes`: number of (decoded) response body bytes read
+    - `dns`, `connect`, `tls`, `ttfb`, `total`: durations in seconds.
+      Connection phases are None if a reused connection was used or the handler does not report them
+
+    @param hooks: Functions that are called with each record as it is made.
+    """
+
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self._lock = threading.Lock()
+        self._groups = {'hosts': {}, 'handlers': {}, 'extractors': {}}
+
+    def record(self, record: dict):
+        with self._lock:
+            for group, key in (
+                ('hosts', record['host']),
+                ('handlers', record['handler']),
+                ('extractors', record['extractor']),
+            ):
+                if key is None:
+                    continue
+                stats = self._groups[group].setdefault(key, {
+                    'requests': 0, 'errors': 0, 'bytes': 0,
+                    **{f'{name}_time': 0.0 for name in TIMINGS},
+                    'max_ttfb': 0.0,
+                })
+                stats['requests'] += 1
+                stats['errors'] += bool(record['error'] or (record['status'] or 0) >= 400)
+                stats['bytes'] += record['bytes']
+                for name in TIMINGS:
+                    stats[f'{name}_time'] += record[name] or 0
+                stats['max_ttfb'] = max(stats['max_ttfb'], record['ttfb'] or 0)
+        for hook in self.hooks:
+            hook(record)
+
+    def summary(self) -> dict:
+        """JSON serializable summary of all recorded requests"""
+        with self._lock:
+            return {
+                group: {
+                    key: {
+                        **stats,
+                        'avg_ttfb': stats['ttfb_time'] / stats['requests'],
+                        'avg_total': stats['total_time'] / stats['requests'],
+                    } for key, stats in groups.items()
+                } for group, groups in self._groups.items()
+            }
+
+
+class RequestMetrics:
+    """Measures a single request. Used by RequestDirector"""
+
+    def __init__(self, request: Request, handler_name: str, extractor: str | None = None,
+                 metrics: NetworkMetrics | None = None):
+        self._metrics = metrics
+        self._start = time.perf_counter()
+        self._finished = False
+        self.timings = {}
+        self.bytes = 0
+        self.record = {
+            'url': request.url,
+            'host': urllib.parse.urlparse(request.url).hostname,
+            'handler': handler_name,
+            'extractor': extractor,
+            'status': None,
+            'error': None,
+        }
+
+    def __enter__(self):
+        self._token = _current_timings.set(self.timings)
+        return self
+
+    def __exit__(self, *args):
+        _current_timings.reset(self._token)
+        self.timings['ttfb'] = time.perf_counter() - self._start
+
+    def attach(self, response: Response):
+        """Report the timings in the response and record them once its body is consumed"""
+        self.record['status'] = response.status
+        response.extensions['timings'] = self.timings
+        response.fp = _MeteredReader(response.fp, self)
+
+    def finish(self, error=None):
+        if self._finished:
+            return
+        self._finished = True
+        self.timings['total'] = time.perf_counter() - self._start
+        if self._metrics:
+            self._metrics.record({
+                **self.record,
+                'error': error and str(error),
+                'bytes': self.bytes,
+                **{name: self.timings.get(name) for name in TIMINGS},
+            })
+
+
+class _MeteredReader:
+    def __init__(self, fp, request_metrics: RequestMetrics):
+        self._fp = fp
+        self._request_metrics = request_metrics
+
+    def read(self, amt=None, *args, **kwargs):
+        data = self._fp.read(amt, *args, **kwargs)
+        self._request_metrics.bytes += len(data or b'')
+        if amt is None or amt < 0 or (amt and not data):
+            self._request_metrics.finish()
+        return data
+
+    def close(self):
+        self._request_metrics.finish()
+        return self._fp.close()
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
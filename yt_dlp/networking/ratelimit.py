@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import email.utils
+import threading
+import time
+import urllib.parse
+
+from .common import Request, Response
+from ..utils import float_or_none
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are reserved up-front and may go negative; the caller is then told how long to wait.
+    This keeps concurrent callers in FIFO order without holding the lock while sleeping.
+
+    @param rate: Number of tokens added per second.
+    @param burst: Maximum number of tokens that can be accumulated. Defaults to one second's worth.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None, *, clock=time.monotonic):
+        if not rate or rate <= 0:
+            raise ValueError('rate must be a positive number')
+        self.rate = float(rate)
+        self.capacity = float(burst or max(self.rate, 1))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """Reserve `amount` tokens and return the number of seconds to wait before using them"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+
+class RateLimiter:
+    """
+    Per-host request and bandwidth limiter used by RequestDirector.
+
+    Two independent budgets are kept for each key:
+    - a request budget, consumed once for every request sent
+    - a byte budget, consumed by reading response bodies
+
+    A 429 (or 503) response with a Retry-After header blocks both budgets of that key
+    for the requested duration, even if no rate was configured.
+
+    Subclasses may redefine `key()` to group requests differently (e.g. per extractor).
+
+    @param request_rate: Maximum number of requests per second per key. None for no limit.
+    @param byte_rate: Maximum number of response bytes per second per key. None for no limit.
+    @param request_burst: Number of requests that may be sent at once before limiting kicks in.
+    @param byte_burst: Number of bytes that may be read at once before limiting kicks in.
+    @param max_retry_after: Upper bound (in seconds) for honoured Retry-After values.
+    """
+
+    RETRY_AFTER_STATUSES = (429, 503)
+
+    def __init__(
+        self,
+        request_rate: float | None = None,
+        byte_rate: float | None = None, *,
+        request_burst: float | None = None,
+        byte_burst: float | None = None,
+        max_retry_after: float = 300,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.request_rate = request_rate
+        self.byte_rate = byte_rate
+        self.request_burst = request_burst
+        self.byte_burst = byte_burst
+        self.max_retry_after = max_retry_after
+        self._clock = clock
+        self._sleep = sleep
+        self._request_buckets: dict[str, TokenBucket] = {}
+        self._byte_buckets: dict[str, TokenBucket] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats: dict[str, dict[str, float]] = {}
+
+    def key(self, request: Request) -> str:
+        return urllib.parse.urlparse(request.url).hostname or ''
+
+    def _bucket(self, buckets, key, rate, burst):
+        if not rate:
+            return None
+        with self._lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = TokenBucket(rate, burst, clock=self._clock)
+            return bucket
+
+    def _record(self, key, **counters):
+        with self._lock:
+            stats = self.stats.setdefault(key, {'requests': 0, 'bytes': 0, 'queue_time': 0.0})
+            for name, value in counters.items():
+                stats[name] += value
+
+    def _wait(self, key, bucket, amount):
+        wait = bucket.reserve(amount) if bucket else 0
+        with self._lock:
+            wait = max(wait, self._blocked_until.get(key, 0) - self._clock())
+        if wait > 0:
+            self._sleep(wait)
+            return wait
+        return 0
+
+    def acquire(self, request: Request) -> float:
+        """Wait until `request` may be sent. Returns the time spent queued, in seconds"""
+        key = self.key(request)
+        waited = self._wait(key, self._bucket(
+            self._request_buckets, key, self.request_rate, self.request_burst), 1)
+        self._record(key, requests=1, queue_time=waited)
+        return waited
+
+    def consume_bytes(self, key: str, amount: int) -> float:
+        """Account for `amount` bytes read from `key`, waiting if over budget"""
+        if not amount:
+            return 0
+        waited = self._wait(key, self._bucket(
+            self._byte_buckets, key, self.byte_rate, self.byte_burst), amount)
+        self._record(key, bytes=amount, queue_time=waited)
+        return waited
+
+    def block(self, key: str, seconds: float):
+        """Hold back all requests to `key` for the given number of seconds"""
+        with self._lock:
+            self._blocked_until[key] = max(self._blocked_until.get(key, 0), self._clock() + seconds)
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        seconds = float_or_none(value.strip())
+        if seconds is not None:
+            return max(seconds, 0)
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(date.timestamp() - time.time(), 0)
+
+    def handle_response(self, request: Request, response: Response) -> float | None:
+        """Honour Retry-After of a rate limited response. Returns the delay applied, if any"""
+        if response.status not in self.RETRY_AFTER_STATUSES:
+            return None
+        delay = self.parse_retry_after(response.get_header('Retry-After'))
+        if delay is None:
+            return None
+        delay = min(delay, self.max_retry_after)
+        self.block(self.key(request), delay)
+        return delay
+
+    def wrap_response(self, request: Request, response: Response):
+        """Make reading the body of `response` consume the byte budget"""
+        if self.byte_rate:
+            response.fp = _ThrottledReader(response.fp, self, self.key(request))
+        return response
+
+
+class _ThrottledReader:
+    def __init__(self, fp, limiter: RateLimiter, key: str):
+        self._fp = fp
+        self._limiter = limiter
+        self._key = key
+
+    def read(self, *args, **kwargs):
+        data = self._fp.read(*args, **kwargs)
+        self._limiter.consume_bytes(self._key, len(data or b''))
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
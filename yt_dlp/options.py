@@ -851,6 +851,12 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--no-check-formats',
         action='store_false', dest='check_formats',
         help='Do not check that the formats are actually downloadable')
+    video_format.add_option(
+        '--concurrent-format-checks',
+        dest='concurrent_format_checks', metavar='N', default=1, type=int,
+        help=(
+            'Number of formats that are checked concurrently with --check-formats or --check-all-formats (default is %default). '
+            'When more than 1, direct HTTP formats are checked with a single ranged request instead of a test download'))
     video_format.add_option(
         '-F', '--list-formats',
         action='store_true', dest='listformats',
@@ -931,6 +937,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--throttled-rate',
         dest='throttledratelimit', metavar='RATE',
         help='Minimum download rate in bytes per second below which throttling is assumed and the video data is re-extracted, e.g. 100K')
+    downloader.add_option(
+        '--limit-request-rate',
+        dest='request_ratelimit', metavar='RATE', type=float,
+        help='Maximum number of HTTP requests per second sent to each host, e.g. 0.5')
+    downloader.add_option(
+        '--limit-host-rate',
+        dest='host_ratelimit', metavar='RATE',
+        help=(
+            'Maximum rate in bytes per second at which responses are read from each host, e.g. 50K or 4.2M. '
+            'Unlike --limit-rate, this also applies to extraction requests and is shared by concurrent downloads'))
     downloader.add_option(
         '-R', '--retries',
         dest='retries', metavar='RETRIES', default=10,
@@ -1297,6 +1313,16 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--print-traffic', '--dump-headers',
         dest='debug_printtraffic', action='store_true', default=False,
         help='Display sent and read HTTP traffic')
+    verbosity.add_option(
+        '--dump-network-metrics', metavar='FILE',
+        dest='dump_network_metrics', default=None,
+        help='Write timings and byte counts of HTTP requests, aggregated per host, request handler and extractor, to FILE as JSON on exit')
+    verbosity.add_option(
+        '--dump-profile', metavar='FILE',
+        dest='dump_profile', default=None,
+        help=(
+            'Write the time spent by extractors, their requests, downloaded bytes and time spent parsing JSON/XML '
+            'and interpreting JavaScript, aggregated per extractor, to FILE as JSON on exit'))
     verbosity.add_option(
         '-C', '--call-home',
         dest='call_home', action='store_true', default=False,
@@ -1508,6 +1534,31 @@ def _alias_callback(option, opt_str, value, parser, opts, nargs):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--http-cache',
+        action='store_true', dest='http_cache', default=False,
+        help=(
+            'Store responses to cacheable extractor requests in the cache directory '
+            'and revalidate them using HTTP caching headers instead of downloading them again'))
+    filesystem.add_option(
+        '--no-http-cache',
+        action='store_false', dest='http_cache',
+        help='Do not cache HTTP responses (default)')
+    filesystem.add_option(
+        '--http-cache-size', metavar='SIZE',
+        dest='http_cache_size', default=None,
+        help='Maximum size of the HTTP cache, e.g. 500M. Least recently used responses are evicted first (default is 100M)')
+    filesystem.add_option(
+        '--extraction-cache', metavar='SECONDS',
+        dest='extraction_cache', default=None, type=float,
+        help=(
+            'Reuse the results of extracting a video for up to SECONDS, storing them in the cache directory. '
+            'Media URLs expire sooner, according to the extractor. '
+            'Cached results are extracted again if their download is forbidden'))
+    filesystem.add_option(
+        '--no-extraction-cache',
+        action='store_const', const=None, dest='extraction_cache',
+        help='Do not cache extraction results (default)')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail Options')
     thumbnail.add_option(
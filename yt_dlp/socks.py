@@ -6,12 +6,11 @@
 # SOCKS5 protocol https://tools.ietf.org/html/rfc1928
 # SOCKS5 username/password authentication https://tools.ietf.org/html/rfc1929
 
+import asyncio
 import collections
 import socket
 import struct
 
-from .compat import compat_ord
-
 __author__ = 'Timo Schmid <coding@timoschmid.de>'
 
 SOCKS4_VERSION = 4
@@ -102,155 +101,192 @@ class ProxyType:
     'type', 'host', 'port', 'username', 'password', 'remote_dns'))
 
 
-class sockssocket(socket.socket):
-    def __init__(self, *args, **kwargs):
-        self._proxy = None
-        super().__init__(*args, **kwargs)
+def _len_and_data(data):
+    return struct.pack('!B', len(data)) + data
 
-    def setproxy(self, proxytype, addr, port, rdns=True, username=None, password=None):
-        assert proxytype in (ProxyType.SOCKS4, ProxyType.SOCKS4A, ProxyType.SOCKS5)
 
-        self._proxy = Proxy(proxytype, addr, port, username, password, rdns)
+def _check_response_version(expected_version, got_version):
+    if got_version != expected_version:
+        raise InvalidVersionError(expected_version, got_version)
 
-    def recvall(self, cnt):
-        data = b''
-        while len(data) < cnt:
-            cur = self.recv(cnt - len(data))
-            if not cur:
-                raise EOFError(f'{cnt - len(data)} bytes missing')
-            data += cur
-        return data
 
-    def _recv_bytes(self, cnt):
-        data = self.recvall(cnt)
-        return struct.unpack(f'!{cnt}B', data)
+def _packed_address(addrinfo):
+    f, _, _, _, ipaddr = addrinfo[0]
+    return f, socket.inet_pton(f, ipaddr[0])
 
-    @staticmethod
-    def _len_and_data(data):
-        return struct.pack('!B', len(data)) + data
 
-    def _check_response_version(self, expected_version, got_version):
-        if got_version != expected_version:
-            self.close()
-            raise InvalidVersionError(expected_version, got_version)
-
-    def _resolve_address(self, destaddr, default, use_remote_dns, family=None):
-        for f in (family,) if family else (socket.AF_INET, socket.AF_INET6):
-            try:
-                return f, socket.inet_pton(f, destaddr)
-            except OSError:
-                continue
-
-        if use_remote_dns and self._proxy.remote_dns:
-            return 0, default
-        else:
-            res = socket.getaddrinfo(destaddr, None, family=family or 0)
-            f, _, _, _, ipaddr = res[0]
-            return f, socket.inet_pton(f, ipaddr[0])
+# The handshakes below do no I/O themselves so that the blocking and asyncio
+# implementations can share them. They yield one of these operations
+# and expect its result to be sent back:
+# - ('send', data): send `data` to the proxy
+# - ('recv', cnt): receive exactly `cnt` bytes from the proxy
+# - ('resolve', host, family): resolve `host` locally to a (family, packed address) tuple
 
-    def _setup_socks4(self, address, is_4a=False):
-        destaddr, port = address
+def _resolve_address(proxy, destaddr, default, use_remote_dns, family=None):
+    for f in (family,) if family else (socket.AF_INET, socket.AF_INET6):
+        try:
+            return f, socket.inet_pton(f, destaddr)
+        except OSError:
+            continue
 
-        _, ipaddr = self._resolve_address(destaddr, SOCKS4_DEFAULT_DSTIP, use_remote_dns=is_4a, family=socket.AF_INET)
+    if use_remote_dns and proxy.remote_dns:
+        return 0, default
+    return (yield 'resolve', destaddr, family)
 
-        packet = struct.pack('!BBH', SOCKS4_VERSION, Socks4Command.CMD_CONNECT, port) + ipaddr
 
-        username = (self._proxy.username or '').encode()
-        packet += username + b'\x00'
+def _socks4_handshake(proxy, address, is_4a=False):
+    destaddr, port = address
 
-        if is_4a and self._proxy.remote_dns and ipaddr == SOCKS4_DEFAULT_DSTIP:
-            packet += destaddr.encode() + b'\x00'
+    _, ipaddr = yield from _resolve_address(
+        proxy, destaddr, SOCKS4_DEFAULT_DSTIP, use_remote_dns=is_4a, family=socket.AF_INET)
 
-        self.sendall(packet)
+    packet = struct.pack('!BBH', SOCKS4_VERSION, Socks4Command.CMD_CONNECT, port) + ipaddr
 
-        version, resp_code, dstport, dsthost = struct.unpack('!BBHI', self.recvall(8))
+    username = (proxy.username or '').encode()
+    packet += username + b'\x00'
 
-        self._check_response_version(SOCKS4_REPLY_VERSION, version)
+    if is_4a and proxy.remote_dns and ipaddr == SOCKS4_DEFAULT_DSTIP:
+        packet += destaddr.encode() + b'\x00'
 
-        if resp_code != Socks4Error.ERR_SUCCESS:
-            self.close()
-            raise Socks4Error(resp_code)
+    yield 'send', packet
 
-        return (dsthost, dstport)
+    version, resp_code, dstport, dsthost = struct.unpack('!BBHI', (yield 'recv', 8))
 
-    def _setup_socks4a(self, address):
-        self._setup_socks4(address, is_4a=True)
+    _check_response_version(SOCKS4_REPLY_VERSION, version)
 
-    def _socks5_auth(self):
-        packet = struct.pack('!B', SOCKS5_VERSION)
+    if resp_code != Socks4Error.ERR_SUCCESS:
+        raise Socks4Error(resp_code)
 
-        auth_methods = [Socks5Auth.AUTH_NONE]
-        if self._proxy.username and self._proxy.password:
-            auth_methods.append(Socks5Auth.AUTH_USER_PASS)
+    return (dsthost, dstport)
 
-        packet += struct.pack('!B', len(auth_methods))
-        packet += struct.pack(f'!{len(auth_methods)}B', *auth_methods)
 
-        self.sendall(packet)
+def _socks5_auth(proxy):
+    packet = struct.pack('!B', SOCKS5_VERSION)
 
-        version, method = self._recv_bytes(2)
+    auth_methods = [Socks5Auth.AUTH_NONE]
+    if proxy.username and proxy.password:
+        auth_methods.append(Socks5Auth.AUTH_USER_PASS)
 
-        self._check_response_version(SOCKS5_VERSION, version)
+    packet += struct.pack('!B', len(auth_methods))
+    packet += struct.pack(f'!{len(auth_methods)}B', *auth_methods)
 
-        if method == Socks5Auth.AUTH_NO_ACCEPTABLE or (
-                method == Socks5Auth.AUTH_USER_PASS and (not self._proxy.username or not self._proxy.password)):
-            self.close()
-            raise Socks5Error(Socks5Auth.AUTH_NO_ACCEPTABLE)
+    yield 'send', packet
 
-        if method == Socks5Auth.AUTH_USER_PASS:
-            username = self._proxy.username.encode()
-            password = self._proxy.password.encode()
-            packet = struct.pack('!B', SOCKS5_USER_AUTH_VERSION)
-            packet += self._len_and_data(username) + self._len_and_data(password)
-            self.sendall(packet)
+    version, method = struct.unpack('!BB', (yield 'recv', 2))
 
-            version, status = self._recv_bytes(2)
+    _check_response_version(SOCKS5_VERSION, version)
 
-            self._check_response_version(SOCKS5_USER_AUTH_VERSION, version)
+    if method == Socks5Auth.AUTH_NO_ACCEPTABLE or (
+            method == Socks5Auth.AUTH_USER_PASS and (not proxy.username or not proxy.password)):
+        raise Socks5Error(Socks5Auth.AUTH_NO_ACCEPTABLE)
 
-            if status != SOCKS5_USER_AUTH_SUCCESS:
-                self.close()
-                raise Socks5Error(Socks5Error.ERR_GENERAL_FAILURE)
+    if method == Socks5Auth.AUTH_USER_PASS:
+        username = proxy.username.encode()
+        password = proxy.password.encode()
+        packet = struct.pack('!B', SOCKS5_USER_AUTH_VERSION)
+        packet += _len_and_data(username) + _len_and_data(password)
+        yield 'send', packet
 
-    def _setup_socks5(self, address):
-        destaddr, port = address
+        version, status = struct.unpack('!BB', (yield 'recv', 2))
+
+        _check_response_version(SOCKS5_USER_AUTH_VERSION, version)
+
+        if status != SOCKS5_USER_AUTH_SUCCESS:
+            raise Socks5Error(Socks5Error.ERR_GENERAL_FAILURE)
+
+
+def _socks5_handshake(proxy, address):
+    destaddr, port = address
+
+    family, ipaddr = yield from _resolve_address(proxy, destaddr, None, use_remote_dns=True)
+
+    yield from _socks5_auth(proxy)
+
+    reserved = 0
+    packet = struct.pack('!BBB', SOCKS5_VERSION, Socks5Command.CMD_CONNECT, reserved)
+    if ipaddr is None:
+        destaddr = destaddr.encode()
+        packet += struct.pack('!B', Socks5AddressType.ATYP_DOMAINNAME)
+        packet += _len_and_data(destaddr)
+    elif family == socket.AF_INET:
+        packet += struct.pack('!B', Socks5AddressType.ATYP_IPV4) + ipaddr
+    elif family == socket.AF_INET6:
+        packet += struct.pack('!B', Socks5AddressType.ATYP_IPV6) + ipaddr
+    packet += struct.pack('!H', port)
 
-        family, ipaddr = self._resolve_address(destaddr, None, use_remote_dns=True)
+    yield 'send', packet
 
-        self._socks5_auth()
+    version, status, reserved, atype = struct.unpack('!BBBB', (yield 'recv', 4))
 
-        reserved = 0
-        packet = struct.pack('!BBB', SOCKS5_VERSION, Socks5Command.CMD_CONNECT, reserved)
-        if ipaddr is None:
-            destaddr = destaddr.encode()
-            packet += struct.pack('!B', Socks5AddressType.ATYP_DOMAINNAME)
-            packet += self._len_and_data(destaddr)
-        elif family == socket.AF_INET:
-            packet += struct.pack('!B', Socks5AddressType.ATYP_IPV4) + ipaddr
-        elif family == socket.AF_INET6:
-            packet += struct.pack('!B', Socks5AddressType.ATYP_IPV6) + ipaddr
-        packet += struct.pack('!H', port)
+    _check_response_version(SOCKS5_VERSION, version)
 
-        self.sendall(packet)
+    if status != Socks5Error.ERR_SUCCESS:
+        raise Socks5Error(status)
 
-        version, status, reserved, atype = self._recv_bytes(4)
+    if atype == Socks5AddressType.ATYP_IPV4:
+        destaddr = yield 'recv', 4
+    elif atype == Socks5AddressType.ATYP_DOMAINNAME:
+        alen = (yield 'recv', 1)[0]
+        destaddr = yield 'recv', alen
+    elif atype == Socks5AddressType.ATYP_IPV6:
+        destaddr = yield 'recv', 16
+    destport = struct.unpack('!H', (yield 'recv', 2))[0]
 
-        self._check_response_version(SOCKS5_VERSION, version)
+    return (destaddr, destport)
 
-        if status != Socks5Error.ERR_SUCCESS:
+
+def _socks_handshake(proxy, address):
+    if proxy.type == ProxyType.SOCKS5:
+        return _socks5_handshake(proxy, address)
+    return _socks4_handshake(proxy, address, is_4a=proxy.type == ProxyType.SOCKS4A)
+
+
+class sockssocket(socket.socket):
+    def __init__(self, *args, **kwargs):
+        self._proxy = None
+        super().__init__(*args, **kwargs)
+
+    def setproxy(self, proxytype, addr, port, rdns=True, username=None, password=None):
+        assert proxytype in (ProxyType.SOCKS4, ProxyType.SOCKS4A, ProxyType.SOCKS5)
+
+        self._proxy = Proxy(proxytype, addr, port, username, password, rdns)
+
+    def recvall(self, cnt):
+        data = b''
+        while len(data) < cnt:
+            cur = self.recv(cnt - len(data))
+            if not cur:
+                raise EOFError(f'{cnt - len(data)} bytes missing')
+            data += cur
+        return data
+
+    def _run_handshake(self, handshake):
+        result = None
+        try:
+            while True:
+                op, *args = handshake.send(result)
+                result = None
+                if op == 'send':
+                    self.sendall(*args)
+                elif op == 'recv':
+                    result = self.recvall(*args)
+                else:
+                    host, family = args
+                    result = _packed_address(socket.getaddrinfo(host, None, family=family or 0))
+        except StopIteration as e:
+            return e.value
+        except ProxyError:
             self.close()
-            raise Socks5Error(status)
+            raise
 
-        if atype == Socks5AddressType.ATYP_IPV4:
-            destaddr = self.recvall(4)
-        elif atype == Socks5AddressType.ATYP_DOMAINNAME:
-            alen = compat_ord(self.recv(1))
-            destaddr = self.recvall(alen)
-        elif atype == Socks5AddressType.ATYP_IPV6:
-            destaddr = self.recvall(16)
-        destport = struct.unpack('!H', self.recvall(2))[0]
+    def _setup_socks4(self, address, is_4a=False):
+        return self._run_handshake(_socks4_handshake(self._proxy, address, is_4a))
 
-        return (destaddr, destport)
+    def _setup_socks4a(self, address):
+        self._setup_socks4(address, is_4a=True)
+
+    def _setup_socks5(self, address):
+        return self._run_handshake(_socks5_handshake(self._proxy, address))
 
     def _make_proxy(self, connect_func, address):
         if not self._proxy:
@@ -272,3 +308,47 @@ def connect(self, address):
 
     def connect_ex(self, address):
         return self._make_proxy(socket.socket.connect_ex, address)
+
+
+async def async_socks_handshake(reader, writer, proxy, address):
+    """
+    Asyncio counterpart of sockssocket: perform the SOCKS handshake for `address`
+    over `reader`/`writer`, which must already be connected to the proxy.
+    Returns the bound address reported by the proxy.
+    """
+    loop = asyncio.get_running_loop()
+    handshake = _socks_handshake(proxy, address)
+    result = None
+    try:
+        while True:
+            op, *args = handshake.send(result)
+            result = None
+            if op == 'send':
+                writer.write(*args)
+                await writer.drain()
+            elif op == 'recv':
+                try:
+                    result = await reader.readexactly(*args)
+                except asyncio.IncompleteReadError as e:
+                    raise EOFError(f'{e.expected - len(e.partial)} bytes missing') from e
+            else:
+                host, family = args
+                result = _packed_address(await loop.getaddrinfo(host, None, family=family or 0))
+    except StopIteration as e:
+        return e.value
+
+
+async def open_socks_connection(proxy, address, **kwargs):
+    """
+    Open an asyncio stream connection to `address` tunneled through `proxy` (a Proxy tuple).
+    kwargs are passed to asyncio.open_connection for the connection to the proxy;
+    use StreamWriter.start_tls() on the result to speak TLS with the destination.
+    Returns a (reader, writer) pair.
+    """
+    reader, writer = await asyncio.open_connection(proxy.host, proxy.port, **kwargs)
+    try:
+        await async_socks_handshake(reader, writer, proxy, address)
+    except BaseException:
+        writer.close()
+        raise
+    return reader, writer
@@ -1,5 +1,6 @@
 import base64
 import binascii
+import bisect
 import calendar
 import codecs
 import collections
@@ -34,6 +35,7 @@
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 import types
@@ -43,7 +45,7 @@
 import urllib.request
 import xml.etree.ElementTree
 
-from . import traversal
+from . import profiling, traversal
 
 from ..compat import (
     compat_etree_fromstring,
@@ -370,14 +372,23 @@ def get_elements_text_and_html_by_attribute(attribute, value, html, *, tag=r'[\w
 
     value = re.escape(value) if escape_value else value
 
-    partial_element_re = rf'''(?x)
+    partial_element_re = re.compile(rf'''(?x)
         <(?P<tag>{tag})
          (?:\s(?:[^>"']|"[^"]*"|'[^']*')*)?
          \s{re.escape(attribute)}\s*=\s*(?P<_q>['"]{quote})(?-x:{value})(?P=_q)
-        '''
+        ''')
+
+    index = HTMLIndex.lookup(html)
+    if index and index.can_search(tag, attribute):
+        matches = index.search(partial_element_re, attribute)
+    else:
+        index, matches = None, partial_element_re.finditer(html)
 
-    for m in re.finditer(partial_element_re, html):
-        content, whole = get_element_text_and_html_by_tag(m.group('tag'), html[m.start():])
+    for m in matches:
+        if index:
+            content, whole = index.element(m.group('tag'), m.start())
+        else:
+            content, whole = _get_element_text_and_html_by_tag(m.group('tag'), html, m.start())
 
         yield (
             unescapeHTML(re.sub(r'^(?P<q>["\'])(?P<content>.*)(?P=q)$', r'\g<content>', content, flags=re.DOTALL)),
@@ -433,17 +444,26 @@ def get_element_text_and_html_by_tag(tag, html):
     For the first element with the specified tag in the passed HTML document
     return its' content (text) and the whole element (html)
     """
-    def find_or_raise(haystack, needle, exc):
+    index = HTMLIndex.lookup(html)
+    if index:
+        whole_start = html.find(f'<{tag}')
+        if whole_start != -1:
+            return index.element(tag, whole_start)
+    return _get_element_text_and_html_by_tag(tag, html)
+
+
+def _get_element_text_and_html_by_tag(tag, html, start=0):
+    """Same as get_element_text_and_html_by_tag, for the part of html from start"""
+    def find_or_raise(needle, start, exc):
         try:
-            return haystack.index(needle)
+            return html.index(needle, start)
         except ValueError:
             raise exc
     closing_tag = f'</{tag}>'
     whole_start = find_or_raise(
-        html, f'<{tag}', compat_HTMLParseError(f'opening {tag} tag not found'))
+        f'<{tag}', start, compat_HTMLParseError(f'opening {tag} tag not found'))
     content_start = find_or_raise(
-        html[whole_start:], '>', compat_HTMLParseError(f'malformed opening {tag} tag'))
-    content_start += whole_start + 1
+        '>', whole_start, compat_HTMLParseError(f'malformed opening {tag} tag')) + 1
     with HTMLBreakOnClosingTagParser() as parser:
         parser.feed(html[whole_start:content_start])
         if not parser.tagstack or parser.tagstack[0] != tag:
@@ -451,18 +471,100 @@ def find_or_raise(haystack, needle, exc):
         offset = content_start
         while offset < len(html):
             next_closing_tag_start = find_or_raise(
-                html[offset:], closing_tag,
-                compat_HTMLParseError(f'closing {tag} tag not found'))
+                closing_tag, offset, compat_HTMLParseError(f'closing {tag} tag not found'))
             next_closing_tag_end = next_closing_tag_start + len(closing_tag)
             try:
-                parser.feed(html[offset:offset + next_closing_tag_end])
-                offset += next_closing_tag_end
+                parser.feed(html[offset:next_closing_tag_end])
+                offset = next_closing_tag_end
             except HTMLBreakOnClosingTagParser.HTMLBreakOnClosingTagException:
-                return html[content_start:offset + next_closing_tag_start], \
-                    html[whole_start:offset + next_closing_tag_end]
+                return html[content_start:next_closing_tag_start], html[whole_start:next_closing_tag_end]
         raise compat_HTMLParseError('unexpected end of html')
 
 
+class HTMLIndex:
+    """
+    Index of the start tags and their attribute names in an HTML document, built in a single pass
+
+    Once an index has been made for a document with HTMLIndex.of(html),
+    the get_element(s)_* functions (and so find_element(s)) use it for the same document.
+    Queries then only try the tags having the attribute instead of scanning the whole
+    document, and each element is parsed at most once. Results are unchanged.
+    The indexes of the last _MAX_DOCUMENTS documents, and so the documents, are kept alive.
+    """
+
+    _MAX_DOCUMENTS = 4
+    _INDEXES = {}  # id(html): index of the most recently indexed documents
+    _INDEXES_LOCK = threading.Lock()
+
+    _TAG_RE = re.compile(r'<([\w:.-]+)')
+    _ATTRIBUTES_RE = re.compile(r'''(?:[^>"']|"[^"]*"|'[^']*')*''')
+    _ATTRIBUTE_NAME_RE = re.compile(r'''\s([^\s"'>=]+)\s*=''')
+
+    def __init__(self, html):
+        self.html = html
+        self._tags_by_attribute = collections.defaultdict(list)
+        self._elements = {}
+        for mobj in self._TAG_RE.finditer(html):
+            # Not using the end of the previous tag, since tags may appear inside quoted attribute values
+            end = self._ATTRIBUTES_RE.match(html, mobj.end()).end()
+            for name in dict.fromkeys(self._ATTRIBUTE_NAME_RE.findall(html, mobj.end(), end)):
+                self._tags_by_attribute[name].append(mobj.start())
+
+    @classmethod
+    def of(cls, html):
+        """Get the index of html, making it if necessary"""
+        index = cls.lookup(html)
+        if index:
+            return index
+        # Indexing is done outside of the lock; should another thread index the same document, its index is kept
+        new_index = cls(html)
+        with cls._INDEXES_LOCK:
+            index = cls._lookup(html)
+            if not index:
+                index = cls._INDEXES[id(html)] = new_index
+                while len(cls._INDEXES) > cls._MAX_DOCUMENTS:
+                    cls._INDEXES.pop(next(iter(cls._INDEXES)))
+        return index
+
+    @classmethod
+    def lookup(cls, html):
+        """Get the index of html if one has been made"""
+        with cls._INDEXES_LOCK:
+            return cls._lookup(html)
+
+    @classmethod
+    def _lookup(cls, html):
+        index = cls._INDEXES.get(id(html))
+        return index if index and index.html is html else None
+
+    @staticmethod
+    def can_search(tag, attribute):
+        return (re.fullmatch(r'[\w:.-]+', tag) or tag == r'[\w:.-]+') and not re.search(r'''[\s"'>=]''', attribute)
+
+    def search(self, regex, attribute):
+        """Same as regex.finditer(html) for a regex matching from a start tag having the attribute"""
+        end = 0
+        for start in self._tags_by_attribute.get(attribute, ()):
+            if start < end:
+                continue
+            mobj = regex.match(self.html, start)
+            if mobj:
+                end = mobj.end()
+                yield mobj
+
+    def element(self, tag, start):
+        """Same as get_element_text_and_html_by_tag(tag, html[start:])"""
+        key = tag, start
+        if key not in self._elements:
+            try:
+                self._elements[key] = _get_element_text_and_html_by_tag(tag, self.html, start)
+            except compat_HTMLParseError as e:
+                self._elements[key] = e
+        if isinstance(self._elements[key], compat_HTMLParseError):
+            raise self._elements[key]
+        return self._elements[key]
+
+
 class HTMLAttributeParser(html.parser.HTMLParser):
     """Trivial HTML parser to gather the attributes for a single element"""
 
@@ -2299,6 +2401,65 @@ def __str__(self):
         return repr(self.exhaust())
 
 
+class FragmentList(collections.abc.Sequence):
+    """Sequence of fragments that are only built when they are accessed
+
+    Each part is either an iterable of fragment dicts, another FragmentList,
+    or a tuple (count, func) where func(index) returns the index-th fragment of that part.
+    A fragment is only built once, so changes made to it are kept.
+    Note that slices of a FragmentList are lists and not FragmentList"""
+
+    __hash__ = None
+
+    def __init__(self, *parts):
+        self._parts, self._ends, self._fragments = [], [], {}
+        for part in parts:
+            self.extend(part)
+
+    def extend(self, part):
+        if isinstance(part, FragmentList):
+            parts = part._parts
+        elif isinstance(part, tuple):
+            parts = [part]
+        else:
+            part = list(part)
+            parts = [(len(part), part.__getitem__)]
+        for count, func in parts:
+            if count:
+                self._parts.append((count, func))
+                self._ends.append(len(self) + count)
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        elif not isinstance(idx, int):
+            raise TypeError('indices must be integers or slices')
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('FragmentList index out of range')
+        fragment = self._fragments.get(idx)
+        if fragment is None:
+            part_idx = bisect.bisect_right(self._ends, idx)
+            count, func = self._parts[part_idx]
+            fragment = self._fragments[idx] = func(idx - self._ends[part_idx] + count)
+        return fragment
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, FragmentList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class PagedList:
 
     class IndexError(IndexError):  # noqa: A001
@@ -2759,85 +2920,241 @@ def strip_jsonp(code):
         r'\g<callback_data>', code)
 
 
+@profiling.profiled('js_to_json')
 def js_to_json(code, vars={}, *, strict=False):
-    # vars is a dict of var, val pairs to substitute
-    STRING_QUOTES = '\'"`'
-    STRING_RE = '|'.join(rf'{q}(?:\\.|[^\\{q}])*{q}' for q in STRING_QUOTES)
-    COMMENT_RE = r'/\*(?:(?!\*/).)*?\*/|//[^\n]*\n'
-    SKIP_RE = fr'\s*(?:{COMMENT_RE})?\s*'
-    INTEGER_TABLE = (
-        (fr'(?s)^(0[xX][0-9a-fA-F]+){SKIP_RE}:?$', 16),
-        (fr'(?s)^(0+[0-7]+){SKIP_RE}:?$', 8),
-    )
+    """
+    Convert a JavaScript object literal to JSON
 
-    def process_escape(match):
-        JSON_PASSTHROUGH_ESCAPES = R'"\bfnrtu'
-        escape = match.group(1) or match.group(2)
+    @param code     The JavaScript code. It may also be a file-like object or
+                    an iterable of str chunks, which are converted as they are read
+    @param vars     A dict of variable names and the JSON to substitute them with
+    @param strict   Raise ValueError for unknown identifiers instead of making them strings
+    """
+    return ''.join(_JSToJSON(vars, strict).convert(code))
+
+
+def parse_js_object(code, vars={}, *, strict=False, **kwargs):
+    """Parse a JavaScript object literal (see js_to_json) to a Python object"""
+    return json.loads(js_to_json(code, vars, strict=strict), **kwargs)
+
+
+class _JSToJSON:
+    """Single pass, tokenizer based implementation of js_to_json"""
+
+    _CHUNK_SIZE = 1 << 20
+    # Number of characters at the end of a partially read input whose tokens may still change
+    _MARGIN = 64
+
+    _STRING_RE = '|'.join(rf'{q}(?:\\[\s\S]|[^\\{q}])*{q}' for q in '\'"`')
+    _COMMENT_RE = r'/\*(?:[^*]|\*(?!/))*\*/|//[^\n]*\n'
+    _SKIP_RE = rf'\s*(?:{_COMMENT_RE})?\s*'
+    _NUMBER_END_RE = r'(?![.a-zA-Z_$0-9])'
+    _CONSTRUCTORS_RE = rf'''
+        new\ Date\((?P<date>{_STRING_RE})\)|
+        (?P<constructor>new\ \w+\(.*?\))|
+        parseInt\([^\d]+(?P<parse_int>\d+)[^\d]+\)|
+        \(function\([^)]*\)\s*\{{[^}}]*\}}\s*\)\s*\(\s*(?P<iife>["'][^)]*["'])\s*\)|'''
+    _TOKEN_RE = rf'''(?x)
+        # Runs of tokens that are already valid JSON and are kept as is
+        (?P<json>(?:
+            "[^"\\]*(?:\\["\\bfnrtu][^"\\]*)*"|
+            [\s\[\]{{}}:]+|
+            ,(?!{_SKIP_RE}[\]}}])|
+            (?:true|false|null){_NUMBER_END_RE}|
+            -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?{_NUMBER_END_RE}(?!{_SKIP_RE}:)
+        ){{1,1000}})|
+        (?P<array>(?:new\s+)?Array\((?P<array_items>.*?)\))|
+        (?P<map>new\ Map\((?P<map_items>\[.*?\])?\))|
+        {{constructors}}
+        (?P<string>{_STRING_RE})|
+        (?P<comment>{_COMMENT_RE})|
+        (?P<comma>,(?={_SKIP_RE}[\]}}]))|
+        (?P<void>void\s0)|
+        (?P<identifier>(?:(?<![0-9])[eE]|[a-df-zA-DF-Z_$])[.a-zA-Z_$0-9]*)|
+        (?P<number>
+            (?:0[xX](?P<hex>[0-9a-fA-F]+)|(?P<octal>0+[0-7]+)(?![.eE0-9])|
+               [0-9]+(?:\.[0-9]*)?(?:[eE][+-]?[0-9]+)?|\.[0-9]+(?:[eE][+-]?[0-9]+)?)
+            (?P<key>{_SKIP_RE}:)?)|
+        (?P<negation>!+)
+        '''
+    # Characters left between tokens that may start a token once more of the input is read
+    _INCOMPLETE_RE = re.compile(r'["\'`]|/[*/]|(?P<paren>\()')
+    _ESCAPE_RE = re.compile(r'(")|\\([\s\S])')
+    _TEMPLATE_RE = re.compile(r'\${([^}]+)}')
+    _COMMENTS_RE = re.compile(_COMMENT_RE)
 
-        return (Rf'\{escape}' if escape in JSON_PASSTHROUGH_ESCAPES
-                else R'\u00' if escape == 'x'
-                else '' if escape == '\n'
-                else escape)
+    def __init__(self, vars, strict):
+        self.vars, self.strict = vars, strict
+        self._token_re = self._compile(strict)
 
-    def template_substitute(match):
-        evaluated = js_to_json(match.group(1), vars, strict=strict)
-        if evaluated[0] == '"':
-            return json.loads(evaluated)
-        return evaluated
+    @classmethod
+    @functools.cache
+    def _compile(cls, strict):
+        return re.compile(cls._TOKEN_RE.replace('{constructors}', '' if strict else cls._CONSTRUCTORS_RE))
+
+    def convert(self, code):
+        """Generate the JSON for code"""
+        if isinstance(code, str):
+            yield self._convert(code, 0, True)[0]
+            return
+        elif hasattr(code, 'read'):
+            code = iter(functools.partial(code.read, self._CHUNK_SIZE), '')
+
+        buffer, pos = '', 0
+        for chunk in code:
+            buffer += chunk
+            json_code, end = self._convert(buffer, pos, False)
+            if end > pos:
+                yield json_code
+                # Keep the preceding character for the lookbehinds of the next token
+                buffer, pos = buffer[end - 1:], 1
+        yield self._convert(buffer, pos, True)[0]
+
+    def _convert(self, code, pos, final):
+        """
+        Convert code from pos until as far as its tokens are complete.
+        Returns the JSON and the position where the conversion stopped
+        """
+        parts, last, gap_start = [], pos, pos
+        limit = len(code) if final else max(len(code) - self._MARGIN, pos)
+        for mobj in self._token_re.finditer(code, pos):
+            start, end = mobj.span()
+            kind = mobj.lastgroup
+            if not final:
+                incomplete = self._find_incomplete(code, gap_start, start)
+                if incomplete is not None:
+                    end = incomplete
+                    break
+                elif end > limit or (
+                        kind == 'identifier' and mobj.group() in ('new', 'Array', 'parseInt')
+                        and code.find('\n', end) == -1):
+                    end = self._split_json(code, start, min(end, limit)) if kind == 'json' else start
+                    break
+            gap_start = end
+            if kind == 'json':
+                continue
+            json_code = getattr(self, f'_{kind}')(mobj)
+            if json_code is not None:
+                parts.extend((code[last:start], json_code))
+                last = end
+        else:
+            end = len(code)
+            if not final:
+                incomplete = self._find_incomplete(code, gap_start, end)
+                end = max(gap_start, limit) if incomplete is None else incomplete
+        parts.append(code[last:end])
+        return ''.join(parts), end
+
+    def _find_incomplete(self, code, start, end):
+        if start == end:
+            return None
+        for mobj in self._INCOMPLETE_RE.finditer(code, start, end):
+            # Constructors and IIFEs are only matched until the end of the line
+            if not mobj.group('paren') or code.find('\n', mobj.end()) == -1:
+                return mobj.start()
+        return None
 
-    def fix_kv(m):
-        v = m.group(0)
-        if v in ('true', 'false', 'null'):
-            return v
-        elif v in ('undefined', 'void 0'):
-            return 'null'
-        elif v.startswith(('/*', '//', '!')) or v == ',':
-            return ''
+    def _split_json(self, code, start, end):
+        """Position after the last comma of the JSON run from start to end that is not in a string"""
+        pos = code.rfind(',', start, end)
+        while pos != -1:
+            mobj = self._token_re.match(code, start, pos + 1)
+            if mobj and mobj.lastgroup == 'json' and mobj.end() == pos + 1:
+                return pos + 1
+            pos = code.rfind(',', start, pos)
+        return start
+
+    def _array(self, mobj):
+        return f'[{js_to_json(mobj.group("array_items") + "]", self.vars, strict=self.strict)}'
+
+    def _map(self, mobj):
+        return json.dumps(dict(json.loads(js_to_json(mobj.group('map_items') or '[]', vars=self.vars))))
 
-        if v[0] in STRING_QUOTES:
-            v = re.sub(r'(?s)\${([^}]+)}', template_substitute, v[1:-1]) if v[0] == '`' else v[1:-1]
-            escaped = re.sub(r'(?s)(")|\\(.)', process_escape, v)
-            return f'"{escaped}"'
+    def _date(self, mobj):
+        return self._string_value(mobj.group('date'))
 
-        for regex, base in INTEGER_TABLE:
-            im = re.match(regex, v)
-            if im:
-                i = int(im.group(1), base)
-                return f'"{i}":' if v.endswith(':') else str(i)
+    def _constructor(self, mobj):
+        return json.dumps(mobj.group('constructor'))
 
-        if v in vars:
+    def _parse_int(self, mobj):
+        return mobj.group('parse_int')
+
+    def _iife(self, mobj):
+        return js_to_json(mobj.group('iife'), self.vars, strict=self.strict)
+
+    def _string(self, mobj):
+        return self._string_value(mobj.group('string'))
+
+    def _comment(self, mobj):
+        return ''
+
+    _comma = _negation = _comment
+
+    def _void(self, mobj):
+        return 'null'
+
+    def _identifier(self, mobj):
+        value = mobj.group('identifier')
+        if value in ('true', 'false', 'null'):
+            return None
+        elif value == 'undefined':
+            return 'null'
+        return self._variable(value)
+
+    def _number(self, mobj):
+        value = mobj.group('number')
+        key = mobj.group('key')
+        if mobj.group('hex') or mobj.group('octal'):
+            value = str(int(value[:len(value) - len(key or '')], 16 if mobj.group('hex') else 8))
+            return f'"{value}":' if key else value
+        elif not key:
+            return None
+        value = value[:len(value) - len(key)]
+        if self.strict and value not in self.vars:
+            raise ValueError(f'Unknown value: {value}')
+        return f'"{value}"{self._COMMENTS_RE.sub("", key)}'
+
+    def _variable(self, name):
+        if name in self.vars:
             try:
-                if not strict:
-                    json.loads(vars[v])
+                if not self.strict:
+                    json.loads(self.vars[name])
             except json.JSONDecodeError:
-                return json.dumps(vars[v])
+                return json.dumps(self.vars[name])
             else:
-                return vars[v]
-
-        if not strict:
-            return f'"{v}"'
-
-        raise ValueError(f'Unknown value: {v}')
-
-    def create_map(mobj):
-        return json.dumps(dict(json.loads(js_to_json(mobj.group(1) or '[]', vars=vars))))
-
-    code = re.sub(r'(?:new\s+)?Array\((.*?)\)', r'[\g<1>]', code)
-    code = re.sub(r'new Map\((\[.*?\])?\)', create_map, code)
-    if not strict:
-        code = re.sub(rf'new Date\(({STRING_RE})\)', r'\g<1>', code)
-        code = re.sub(r'new \w+\((.*?)\)', lambda m: json.dumps(m.group(0)), code)
-        code = re.sub(r'parseInt\([^\d]+(\d+)[^\d]+\)', r'\1', code)
-        code = re.sub(r'\(function\([^)]*\)\s*\{[^}]*\}\s*\)\s*\(\s*(["\'][^)]*["\'])\s*\)', r'\1', code)
-
-    return re.sub(rf'''(?sx)
-        {STRING_RE}|
-        {COMMENT_RE}|,(?={SKIP_RE}[\]}}])|
-        void\s0|(?:(?<![0-9])[eE]|[a-df-zA-DF-Z_$])[.a-zA-Z_$0-9]*|
-        \b(?:0[xX][0-9a-fA-F]+|0+[0-7]+)(?:{SKIP_RE}:)?|
-        [0-9]+(?={SKIP_RE}:)|
-        !+
-        ''', fix_kv, code)
+                return self.vars[name]
+
+        if not self.strict:
+            return f'"{name}"'
+
+        raise ValueError(f'Unknown value: {name}')
+
+    def _string_value(self, string):
+        quote, value = string[0], string[1:-1]
+        if quote == '`':
+            value = self._TEMPLATE_RE.sub(self._template_substitute, value)
+        elif quote == '"' and '\\' not in value:
+            return string
+        if '\\' not in value and '"' not in value:
+            return f'"{value}"'
+        escaped = self._ESCAPE_RE.sub(self._process_escape, value)
+        return f'"{escaped}"'
+
+    def _template_substitute(self, mobj):
+        evaluated = js_to_json(mobj.group(1), self.vars, strict=self.strict)
+        if evaluated[0] == '"':
+            return json.loads(evaluated)
+        return evaluated
+
+    @staticmethod
+    def _process_escape(mobj):
+        JSON_PASSTHROUGH_ESCAPES = R'"\bfnrtu'
+        escape = mobj.group(1) or mobj.group(2)
+
+        return (Rf'\{escape}' if escape in JSON_PASSTHROUGH_ESCAPES
+                else R'\u00' if escape == 'x'
+                else '' if escape == '\n'
+                else escape)
 
 
 def qualities(quality_ids):
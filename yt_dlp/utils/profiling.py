@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import re
+import threading
+import time
+
+# Profile of the extraction running in the current context. See ExtractionProfiler
+_current_profile: contextvars.ContextVar[ExtractionProfile | None] = contextvars.ContextVar(
+    '_current_profile', default=None)
+
+
+class ExtractionProfiler:
+    """
+    Aggregates the profiles of extractions per extractor.
+
+    An extraction is profiled from the start to the end of `InfoExtractor.extract`,
+    so playlist entries that are evaluated lazily afterwards are not included.
+    `summary` returns a dict of extractors with the following keys each:
+    - `extractions`, `errors`: number of extractions and of those that raised an error
+    - `wall_time`, `cpu_time`: total durations in seconds. CPU time is that of the extracting thread
+    - `bytes`: number of response body bytes read during the extractions
+    - `requests`: dict of request notes (with numbers replaced by `#`) with the keys
+      `requests`, `errors`, `bytes`, `time` and `max_time`.
+      Times are measured until the response headers have been received
+    - `sections`: dict of `json_parse`, `xml_parse`, `js_to_json` and `jsinterp` with the keys
+      `calls` and `time`. Time spent in a nested section is only counted for the innermost one
+
+    Work that the extractor submits to other threads is included if it runs in a copy
+    of the extracting context (see contextvars.copy_context)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._extractors = {}
+
+    @contextlib.contextmanager
+    def profile(self, extractor: str):
+        """Profile the extraction running in the current context"""
+        profile = ExtractionProfile(extractor)
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        except BaseException:
+            profile.error = True
+            raise
+        finally:
+            _current_profile.reset(token)
+            profile.finish()
+            self.record(profile)
+
+    def record(self, profile: ExtractionProfile):
+        # Work submitted by the extraction to other threads may still be updating the profile
+        with self._lock, profile._lock:
+            stats = self._extractors.setdefault(profile.extractor, {
+                'extractions': 0, 'errors': 0, 'wall_time': 0.0, 'cpu_time': 0.0,
+                'bytes': 0, 'requests': {}, 'sections': {},
+            })
+            stats['extractions'] += 1
+            stats['errors'] += profile.error
+            stats['wall_time'] += profile.wall_time
+            stats['cpu_time'] += profile.cpu_time
+            stats['bytes'] += profile.bytes
+            for note, request_stats in profile.requests.items():
+                total = stats['requests'].setdefault(note, {
+                    'requests': 0, 'errors': 0, 'bytes': 0, 'time': 0.0, 'max_time': 0.0})
+                for key, value in request_stats.items():
+                    total[key] = max(total[key], value) if key == 'max_time' else total[key] + value
+            for name, section_stats in profile.sections.items():
+                total = stats['sections'].setdefault(name, {'calls': 0, 'time': 0.0})
+                total['calls'] += section_stats['calls']
+                total['time'] += section_stats['time']
+
+    def record_request(self, record: dict):
+        """Network metrics hook that adds the bytes of each request to the current extraction"""
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add_bytes(record['url'], record['bytes'])
+
+    def summary(self) -> dict:
+        """JSON serializable summary of all profiled extractions"""
+        with self._lock:
+            return {
+                extractor: {
+                    **stats,
+                    'avg_wall_time': stats['wall_time'] / stats['extractions'],
+                    'requests': {
+                        note: {**request_stats, 'avg_time': request_stats['time'] / request_stats['requests']}
+                        for note, request_stats in stats['requests'].items()
+                    },
+                    'sections': {name: dict(section_stats) for name, section_stats in stats['sections'].items()},
+                } for extractor, stats in self._extractors.items()
+            }
+
+
+class ExtractionProfile:
+    """Measures a single extraction. Used by ExtractionProfiler"""
+
+    def __init__(self, extractor: str):
+        self.extractor = extractor
+        self.error = False
+        self.bytes = 0
+        self.requests = {}
+        self.sections = {}
+        self._lock = threading.Lock()
+        self._request_notes = {}
+        self._local = threading.local()  # Sections are nested per thread
+        self._start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def finish(self):
+        self.wall_time = time.perf_counter() - self._start
+        self.cpu_time = time.thread_time() - self._cpu_start
+
+    @contextlib.contextmanager
+    def request(self, url: str, note):
+        if note is None:
+            note = 'Downloading webpage'
+        elif note is False:
+            note = '(no note)'
+        else:
+            note = re.sub(r'\d+', '#', str(note))
+        with self._lock:
+            stats = self.requests.setdefault(note, {
+                'requests': 0, 'errors': 0, 'bytes': 0, 'time': 0.0, 'max_time': 0.0})
+            self._request_notes[url] = note
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats['errors'] += error
+                stats['requests'] += 1
+                stats['time'] += elapsed
+                stats['max_time'] = max(stats['max_time'], elapsed)
+
+    def add_bytes(self, url: str, num_bytes: int):
+        with self._lock:
+            self.bytes += num_bytes
+            note = self._request_notes.get(url)
+            if note is not None:
+                self.requests[note]['bytes'] += num_bytes
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        nested_times = getattr(self._local, 'nested_times', None)
+        if nested_times is None:
+            nested_times = self._local.nested_times = []
+        nested_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested_time = nested_times.pop()
+            if nested_times:
+                nested_times[-1] += elapsed
+            with self._lock:
+                stats = self.sections.setdefault(name, {'calls': 0, 'time': 0.0})
+                stats['calls'] += 1
+                stats['time'] += elapsed - nested_time
+
+
+def current_profile() -> ExtractionProfile | None:
+    """Profile of the extraction running in the current context, if it is being profiled"""
+    return _current_profile.get()
+
+
+def profile_section(name: str):
+    """Context manager that adds its duration to section `name` of the current extraction profile"""
+    profile = _current_profile.get()
+    return profile.section(name) if profile is not None else contextlib.nullcontext()
+
+
+def profiled(name: str):
+    """Decorator that adds the time spent in the function to section `name` of the current extraction profile"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -8,6 +8,7 @@
 import inspect
 import itertools
 import re
+import threading
 import typing
 import xml.etree.ElementTree
 
@@ -51,6 +52,7 @@ def traverse_obj(
     Unhelpful values (`{}`, `None`) are treated as the absence of a value and discarded.
 
     The paths will be wrapped in `variadic`, so that `'key'` is conveniently the same as `('key', )`.
+    Paths are compiled before they are applied, see `compile_path`.
 
     The keys in the path can be one of:
         - `None`:           Return the current object.
@@ -111,33 +113,31 @@ def traverse_obj(
     else:
         type_test = lambda val: try_call(expected_type or IDENTITY, args=(val,))
 
-    def apply_key(key, obj, is_last):
+    def apply_key(kind, key, is_last, obj):
         branching = False
         result = None
 
         if obj is None and traverse_string:
-            if key is ... or callable(key) or isinstance(key, slice):
+            if kind in (_STEP_ELLIPSIS, _STEP_FUNCTION) or isinstance(key, slice):
                 branching = True
                 result = ()
 
-        elif key is None:
+        elif kind == _STEP_NONE:
             result = obj
 
-        elif isinstance(key, set):
-            item = next(iter(key))
-            if len(key) > 1 or isinstance(item, type):
-                assert all(isinstance(item, type) for item in key)
-                if isinstance(obj, tuple(key)):
-                    result = obj
-            else:
-                result = try_call(item, args=(obj,))
+        elif kind == _STEP_TYPES:
+            if isinstance(obj, key):
+                result = obj
+
+        elif kind == _STEP_TRANSFORM:
+            result = try_call(key, args=(obj,))
 
-        elif isinstance(key, (list, tuple)):
+        elif kind == _STEP_BRANCH:
             branching = True
             result = itertools.chain.from_iterable(
                 apply_path(obj, branch, is_last)[0] for branch in key)
 
-        elif key is ...:
+        elif kind == _STEP_ELLIPSIS:
             branching = True
             if isinstance(obj, http.cookies.Morsel):
                 obj = dict(obj, key=obj.key, value=obj.value)
@@ -153,7 +153,7 @@ def apply_key(key, obj, is_last):
             else:
                 result = ()
 
-        elif callable(key):
+        elif kind == _STEP_FUNCTION:
             branching = True
             if isinstance(obj, http.cookies.Morsel):
                 obj = dict(obj, key=obj.key, value=obj.value)
@@ -175,8 +175,8 @@ def apply_key(key, obj, is_last):
             if not branching:  # string traversal
                 result = ''.join(result)
 
-        elif isinstance(key, dict):
-            iter_obj = ((k, _traverse_obj(obj, v, False, is_last)) for k, v in key.items())
+        elif kind == _STEP_DICT:
+            iter_obj = ((k, _traverse_obj(obj, v, False, is_last)) for k, v in key)
             result = {
                 k: v if v is not None else default for k, v in iter_obj
                 if v is not None or default is not NO_DEFAULT
@@ -235,59 +235,73 @@ def apply_specials(element):
 
         return branching, result if branching else (result,)
 
-    def lazy_last(iterable):
-        iterator = iter(iterable)
-        prev = next(iterator, NO_DEFAULT)
-        if prev is NO_DEFAULT:
-            return
-
-        for item in iterator:
-            yield False, prev
-            prev = item
-
-        yield True, prev
-
     def apply_path(start_obj, path, test_type):
         objs = (start_obj,)
         has_branched = False
 
-        key = None
-        for last, key in lazy_last(variadic(path, (str, bytes, dict, set))):
-            if not casesense and isinstance(key, str):
-                key = key.casefold()
-
-            if key in (any, all):
+        for kind, key, folded, is_last in path._steps:
+            if kind in (_STEP_ANY, _STEP_ALL):
                 has_branched = False
                 filtered_objs = (obj for obj in objs if obj not in (None, {}))
-                if key is any:
+                if kind == _STEP_ANY:
                     objs = (next(filtered_objs, None),)
                 else:
                     objs = (list(filtered_objs),)
                 continue
 
-            if key is filter:
+            if kind == _STEP_FILTER:
                 objs = filter(None, objs)
                 continue
 
-            if __debug__ and callable(key):
-                # Verify function signature
-                inspect.signature(key).bind(None, None)
+            if not casesense:
+                key = folded
+            plain_key = kind == _STEP_PLAIN_KEY and casesense
 
             new_objs = []
             for obj in objs:
-                branching, results = apply_key(key, obj, last)
+                if plain_key and type(obj) is dict:
+                    new_objs.append((obj.get(key),))
+                    continue
+                branching, results = apply_key(kind, key, is_last, obj)
                 has_branched |= branching
                 new_objs.append(results)
 
             objs = itertools.chain.from_iterable(new_objs)
 
-        if test_type and not isinstance(key, (dict, list, tuple)):
+        if test_type and path._test_type:
             objs = map(type_test, objs)
 
-        return objs, has_branched, isinstance(key, dict)
+        return objs, has_branched
+
+    def apply_unbranched_path(obj, path):
+        # Paths that can not branch only ever hold a single object, or none after `filter`
+        for kind, key, folded, is_last in path._steps:
+            if kind == _STEP_ANY:
+                obj = None if obj is NO_DEFAULT or obj in (None, {}) else obj
+            elif kind == _STEP_ALL:
+                obj = [] if obj is NO_DEFAULT or obj in (None, {}) else [obj]
+            elif kind == _STEP_FILTER:
+                if not obj:
+                    obj = NO_DEFAULT
+            elif obj is NO_DEFAULT:
+                continue
+            elif kind == _STEP_PLAIN_KEY and casesense and type(obj) is dict:
+                obj = obj.get(key)
+            else:
+                obj = apply_key(kind, key if casesense else folded, is_last, obj)[1][0]
+
+        return obj
 
     def _traverse_obj(obj, path, allow_empty, test_type):
-        results, has_branched, is_dict = apply_path(obj, path, test_type)
+        if not path._branches:
+            result = apply_unbranched_path(obj, path)
+            if result is not NO_DEFAULT and test_type and path._test_type:
+                result = type_test(result)
+            if result is NO_DEFAULT or result in (None, {}):
+                return {} if allow_empty and path._is_dict else None
+            return result
+
+        results, has_branched = apply_path(obj, path, test_type)
         results = LazyList(item for item in results if item not in (None, {}))
         if get_all and has_branched:
             if results:
@@ -296,12 +310,12 @@ def _traverse_obj(obj, path, allow_empty, test_type):
                 return [] if default is NO_DEFAULT else default
             return None
 
-        return results[0] if results else {} if allow_empty and is_dict else None
+        return results[0] if results else {} if allow_empty and path._is_dict else None
 
     for index, path in enumerate(paths, 1):
         is_last = index == len(paths)
         try:
-            result = _traverse_obj(obj, path, is_last, True)
+            result = _traverse_obj(obj, compile_path(path), is_last, True)
             if result is not None:
                 return result
         except _RequiredError as e:
@@ -312,6 +326,140 @@ def _traverse_obj(obj, path, allow_empty, test_type):
     return None if default is NO_DEFAULT else default
 
 
+(_STEP_NONE, _STEP_TYPES, _STEP_TRANSFORM, _STEP_BRANCH, _STEP_ELLIPSIS, _STEP_FUNCTION,
+ _STEP_DICT, _STEP_ANY, _STEP_ALL, _STEP_FILTER, _STEP_KEY, _STEP_PLAIN_KEY) = range(12)
+
+_LITERAL_KEY_TYPES = (str, int, type(None), type(...))
+_COMPILED_PATHS = {}
+_COMPILED_PATHS_MAX_SIZE = 1024
+# Literal paths that have been compiled once, but are not known to be constants yet
+_RECENT_PATHS = {}
+_RECENT_PATHS_MAX_SIZE = 64
+_COMPILED_PATHS_LOCK = threading.Lock()
+
+
+def _is_literal_path(path):
+    if type(path) is tuple:
+        return all(map(_is_literal_path, path))
+    return type(path) in _LITERAL_KEY_TYPES
+
+
+class CompiledPath:
+    """
+    A `traverse_obj` path that has been preprocessed by `compile_path`
+
+    Calling it is the same as calling `traverse_obj` with it as the only path.
+    """
+    __slots__ = ('_branches', '_is_dict', '_steps', '_test_type', 'path')
+
+    def __init__(self, path):
+        self.path = path
+        steps = []
+        last_key = None
+        for key in variadic(path, (str, bytes, dict, set)):
+            last_key = key
+            if key is None:
+                kind = _STEP_NONE
+
+            elif key in (any, all):
+                kind = _STEP_ANY if key is any else _STEP_ALL
+
+            elif key is filter:
+                kind = _STEP_FILTER
+
+            elif isinstance(key, set):
+                item = next(iter(key))
+                if len(key) > 1 or isinstance(item, type):
+                    assert all(isinstance(item, type) for item in key)
+                    kind, key = _STEP_TYPES, tuple(key)
+                else:
+                    kind, key = _STEP_TRANSFORM, item
+
+            elif isinstance(key, (list, tuple)):
+                kind, key = _STEP_BRANCH, [_compile_nested_path(branch) for branch in key]
+
+            elif key is ...:
+                kind = _STEP_ELLIPSIS
+
+            elif callable(key):
+                if __debug__:
+                    # Verify function signature
+                    inspect.signature(key).bind(None, None)
+                kind = _STEP_FUNCTION
+
+            elif isinstance(key, dict):
+                kind, key = _STEP_DICT, [(k, _compile_nested_path(v)) for k, v in key.items()]
+
+            else:
+                # Plain keys can be looked up in a `dict` directly
+                kind = _STEP_PLAIN_KEY if type(key) in (str, int) else _STEP_KEY
+
+            folded = key.casefold() if isinstance(key, str) else key
+            steps.append([kind, key, folded, False])
+
+        if steps:
+            steps[-1][-1] = True
+        self._steps = tuple(map(tuple, steps))
+        self._branches = any(
+            kind in (_STEP_BRANCH, _STEP_ELLIPSIS, _STEP_FUNCTION) or isinstance(key, slice)
+            for kind, key, _, _ in self._steps)
+        self._test_type = not isinstance(last_key, (dict, list, tuple))
+        self._is_dict = isinstance(last_key, dict)
+
+    def __call__(self, obj, **kwargs):
+        return traverse_obj(obj, self, **kwargs)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.path!r})'
+
+
+def _compile_nested_path(path):
+    # Nested paths are kept alive by their parent, so they are not cached separately
+    return path if isinstance(path, CompiledPath) else CompiledPath(path)
+
+
+def compile_path(path, /):
+    """
+    Preprocess a `traverse_obj` path, so that it can be applied repeatedly
+
+    >>> get_title = compile_path(('title', 'runs', 0, 'text', {str}))
+    >>> get_title({'title': {'runs': [{'text': 'value'}]}})
+    'value'
+
+    The result can be used in place of the path anywhere `traverse_obj` accepts one,
+    including as a branch or as a value of a `dict` key.
+
+    Paths made up only of `str`, `int`, `None` and `...` keys are cached by their identity
+    once the same object is compiled again. This is the case for the constants of the code,
+    while paths that are built at runtime are new objects every time and are never cached.
+    Any other path is compiled anew on every call to `traverse_obj`,
+    so paths that are used in hot loops should be compiled once in advance.
+    """
+    if isinstance(path, CompiledPath):
+        return path
+
+    key = id(path)
+    with _COMPILED_PATHS_LOCK:
+        cached = _COMPILED_PATHS.get(key)
+        if cached and cached[0] is path:
+            return cached[1]
+        # The stored reference keeps the path alive, so its `id` can not be reused
+        recent = _RECENT_PATHS.pop(key, None)
+        if recent and recent[0] is path:
+            if len(_COMPILED_PATHS) >= _COMPILED_PATHS_MAX_SIZE:
+                del _COMPILED_PATHS[next(iter(_COMPILED_PATHS))]
+            _COMPILED_PATHS[key] = recent
+            return recent[1]
+
+    compiled = CompiledPath(path)
+    if _is_literal_path(path):
+        with _COMPILED_PATHS_LOCK:
+            if len(_RECENT_PATHS) >= _RECENT_PATHS_MAX_SIZE:
+                del _RECENT_PATHS[next(iter(_RECENT_PATHS))]
+            _RECENT_PATHS[key] = path, compiled
+    return compiled
+
+
 def value(value, /):
     return lambda _: value
 